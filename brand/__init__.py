@@ -32,10 +32,22 @@ import brand._generators  # noqa: F401
 from brand.registry import scorers, generators, filters, pipelines
 
 # -- Stage types (for building custom pipelines) ------------------------------
-from brand.stages import Generate, Score, Filter
+from brand.stages import Generate, Score, Filter, Node
 
 # -- Pipeline engine ----------------------------------------------------------
-from brand.pipeline import run_pipeline, evaluate_name, load_template, list_templates
+from brand.pipeline import (
+    run_pipeline,
+    iter_pipeline,
+    evaluate_name,
+    load_template,
+    list_templates,
+)
+from brand.aio import arun_pipeline
+from brand.dag import run_dag
+from brand.distributed import run_distributed
+from brand.table import CandidateTable
+from brand.budget import Budget
+from brand.planning import plan_pipeline
 
 # -- Backward-compatible API from brand.base ----------------------------------
 from brand.base import (
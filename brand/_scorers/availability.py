@@ -1,16 +1,19 @@
 """Availability scorers: DNS, WHOIS, domain, platform handles.
 
 These scorers check whether a candidate name is available on various
-platforms.  They return ``True`` (available) or ``False`` (taken).
+platforms.  They return ``True`` (available) or ``False`` (taken), and raise
+``brand.resilience.Indeterminate`` when a lookup keeps failing or its answer
+is ambiguous, rather than guessing.
 
 All network scorers are tagged with ``requires_network=True`` and appropriate
 cost/latency metadata so the pipeline engine can schedule them efficiently.
+Each of them also has an async variant (``scorers.register_async``) used by
+the asyncio engine in ``brand.aio``.
 """
 
 import socket
 
-import requests
-
+from brand import aio, concurrency, endpoints, net, ratelimit, resilience, tracing
 from brand.registry import scorers
 
 
@@ -21,45 +24,148 @@ from brand.registry import scorers
 
 def _dns_is_available(domain: str, *, timeout: int = 3) -> bool:
     """Fast DNS-only check.  Returns True if domain does NOT resolve."""
-    old_timeout = socket.getdefaulttimeout()
-    try:
-        socket.setdefaulttimeout(timeout)
-        socket.gethostbyname(domain)
-        return False
-    except (socket.gaierror, socket.timeout, OSError):
-        return True
-    finally:
-        socket.setdefaulttimeout(old_timeout)
+
+    def attempt():
+        ratelimit.acquire("dns")
+        try:
+            with tracing.span("dns", host=domain):
+                endpoints.gethostbyname(domain, timeout=timeout)
+            return False
+        except OSError as e:
+            _raise_if_dns_failed(e)
+            return True
+
+    return resilience.call("dns", attempt)
+
+
+def _raise_if_dns_failed(error: OSError):
+    """Raise ``Retryable`` if a lookup failed, rather than found no domain."""
+    if _dns_failed(error):
+        concurrency.note_overload()
+        raise resilience.Retryable(f"{type(error).__name__}: {error}") from error
+
+
+def _dns_failed(error: OSError) -> bool:
+    """Whether a lookup failed (timeout, temporary failure, unreachable server)
+    rather than found that the domain doesn't resolve."""
+    if isinstance(error, socket.gaierror):
+        return error.errno == socket.EAI_AGAIN
+    return True
 
 
 def _whois_is_available(domain: str) -> bool:
     """WHOIS-based check.  Returns True if domain appears unregistered."""
-    try:
-        import whois
 
-        w = whois.whois(domain)
-        if w.domain_name:
+    def attempt():
+        ratelimit.acquire("whois")
+        return _whois_lookup(domain)
+
+    return resilience.call("whois", attempt)
+
+
+_WHOIS_REGISTERED = "Domain Name:"
+
+
+def _whois_lookup(domain: str) -> bool:
+    """One WHOIS lookup (no rate limit or retries); ``Retryable`` on failure."""
+    if endpoints.whois_endpoint() is not None:
+        try:
+            with tracing.span("whois", host=domain):
+                reply = endpoints.whois_query(domain)
+        except OSError as e:
+            concurrency.note_overload()
+            raise resilience.Retryable(f"{type(e).__name__}: {e}") from e
+        if endpoints.WHOIS_NO_MATCH in reply:
+            return True
+        if _WHOIS_REGISTERED in reply:
             return False
+        # neither answer: a quota notice or similar
+        concurrency.note_overload()
+        raise resilience.Retryable(reply.strip()[:100], throttled=True)
+
+    import whois
+
+    try:
+        with tracing.span("whois", host=domain):
+            w = whois.whois(domain)
+    except Exception as e:
+        if _whois_says_unregistered(e):
+            return True
+        concurrency.note_overload()
+        throttled = "Quota" in type(e).__name__
+        raise resilience.Retryable(
+            f"{type(e).__name__}: {e}", throttled=throttled
+        ) from e
+    return not w.domain_name
+
+
+def _whois_says_unregistered(error: Exception) -> bool:
+    """Whether a python-whois exception means "no such domain" (the newer
+    ``WhoisDomainNotFoundError``, or older versions' "No match" errors)."""
+    name = type(error).__name__
+    if name == "WhoisDomainNotFoundError":
         return True
-    except Exception:
-        return True
+    return name == "PywhoisError" and "no match" in str(error).lower()
 
 
 def _url_is_available(
     url: str, *, available_codes=(404, 410), taken_codes=(200, 301)
 ) -> bool:
     """Check URL status code.  Returns True if the resource doesn't exist."""
-    try:
-        r = requests.get(url, timeout=10, allow_redirects=True)
-        if r.status_code in available_codes:
-            return True
-        if r.status_code in taken_codes:
-            return False
-        # Ambiguous — default to "taken" to be conservative
-        return False
-    except requests.RequestException:
-        # Network error — can't determine, assume taken
+    r = net.http_get(url, timeout=10)
+    return _status_says_available(r.status_code, available_codes, taken_codes)
+
+
+def _status_says_available(status_code: int, available_codes, taken_codes) -> bool:
+    """Interpret an HTTP status code as availability.
+
+    >>> _status_says_available(404, (404, 410), (200, 301))
+    True
+    >>> _status_says_available(403, (404, 410), (200, 301))
+    Traceback (most recent call last):
+      ...
+    brand.resilience.Indeterminate: ambiguous HTTP status 403
+    """
+    if status_code in available_codes:
+        return True
+    if status_code in taken_codes:
         return False
+    raise resilience.Indeterminate(f"ambiguous HTTP status {status_code}")
+
+
+# Async twins of the helpers above (see ``brand.aio``)
+
+
+async def _adns_is_available(domain: str, *, timeout: int = 3) -> bool:
+    """Async ``_dns_is_available``."""
+
+    async def attempt():
+        try:
+            await aio.resolve(domain, timeout=timeout)
+            return False
+        except OSError as e:
+            _raise_if_dns_failed(e)
+            return True
+
+    return await resilience.acall("dns", attempt)
+
+
+async def _awhois_is_available(domain: str) -> bool:
+    """Async ``_whois_is_available`` (python-whois is blocking)."""
+
+    async def attempt():
+        await ratelimit.aacquire("whois")
+        return await aio.run_blocking(_whois_lookup, domain, host="whois")
+
+    return await resilience.acall("whois", attempt)
+
+
+async def _aurl_is_available(
+    url: str, *, available_codes=(404, 410), taken_codes=(200, 301)
+) -> bool:
+    """Async ``_url_is_available``."""
+    r = await aio.http_get(url, timeout=10)
+    return _status_says_available(r.status_code, available_codes, taken_codes)
 
 
 # ---------------------------------------------------------------------------
@@ -81,6 +187,19 @@ def _make_domain_scorer(tld: str, scorer_name: str):
     return domain_scorer
 
 
+def _make_async_domain_scorer(tld: str, scorer_name: str):
+    """Factory for the async variants of ``_make_domain_scorer`` scorers."""
+
+    async def adomain_scorer(name: str) -> bool:
+        domain = f"{name}{tld}"
+        if not await _adns_is_available(domain):
+            return False
+        return await _awhois_is_available(domain)
+
+    adomain_scorer.__name__ = f"a{scorer_name}"
+    return adomain_scorer
+
+
 # Register domain scorers for common TLDs
 _TLDS = {
     "dns_com": ".com",
@@ -103,7 +222,9 @@ for _name, _tld in _TLDS.items():
         latency="fast",
         parallelizable=True,
         description=f"Domain availability for {_tld} (DNS + WHOIS)",
+        concurrency=(16, 256),
     )(_func)
+    scorers.register_async(_name)(_make_async_domain_scorer(_tld, _name))
 
 
 # WHOIS-only scorer (slower but more reliable)
@@ -114,12 +235,19 @@ for _name, _tld in _TLDS.items():
     latency="slow",
     parallelizable=True,
     description="WHOIS verification for .com domain",
+    concurrency=(2, 32),
 )
 def whois_com(name: str) -> bool:
     """Verify .com availability via WHOIS (slower, more reliable than DNS)."""
     return _whois_is_available(f"{name}.com")
 
 
+@scorers.register_async("whois_com")
+async def awhois_com(name: str) -> bool:
+    """Async ``whois_com``."""
+    return await _awhois_is_available(f"{name}.com")
+
+
 # ---------------------------------------------------------------------------
 # Platform availability scorers
 # ---------------------------------------------------------------------------
@@ -136,6 +264,16 @@ def _make_url_scorer(template: str, scorer_name: str, description: str):
     return url_scorer
 
 
+def _make_async_url_scorer(template: str, scorer_name: str):
+    """Factory for the async variants of ``_make_url_scorer`` scorers."""
+
+    async def aurl_scorer(name: str) -> bool:
+        return await _aurl_is_available(template.format(name))
+
+    aurl_scorer.__name__ = f"a{scorer_name}"
+    return aurl_scorer
+
+
 _PLATFORM_CHECKS = {
     "github_org": (
         "https://github.com/{}",
@@ -164,4 +302,6 @@ for _name, (_template, _desc) in _PLATFORM_CHECKS.items():
         latency="medium",
         parallelizable=True,
         description=_desc,
+        concurrency=(4, 64),
     )(_func)
+    scorers.register_async(_name)(_make_async_url_scorer(_template, _name))
@@ -1,13 +1,18 @@
 """Company name availability scorers.
 
 Checks whether a candidate name is available for US company registration
-by querying OpenCorporates and the USPTO trademark database.
+by querying OpenCorporates and the USPTO trademark database.  Lookups that
+keep failing, or get a response that can't be interpreted, raise
+``brand.resilience.Indeterminate``.
 """
 
-import requests
-
+from brand import aio, net
+from brand.resilience import json_body
 from brand.registry import scorers
 
+_OPENCORPORATES_SEARCH_URL = "https://api.opencorporates.com/v0.4/companies/search"
+_USPTO_TSDR_URL = "https://tsdr.uspto.gov/documentexternal/statuskeynew"
+
 
 # ---------------------------------------------------------------------------
 # OpenCorporates (company registry)
@@ -20,22 +25,32 @@ def _opencorporates_search(name: str, *, jurisdiction="us") -> list[dict]:
     Returns a list of matching company dicts (empty = no matches found).
     Uses the free API tier (no key required, rate-limited).
     """
-    try:
-        r = requests.get(
-            "https://api.opencorporates.com/v0.4/companies/search",
-            params={
-                "q": name,
-                "jurisdiction_code": jurisdiction,
-                "per_page": 10,
-            },
-            timeout=15,
-        )
-        r.raise_for_status()
-        data = r.json()
-        companies = data.get("results", {}).get("companies", [])
-        return [c.get("company", {}) for c in companies]
-    except requests.RequestException:
-        return []
+    r = net.http_get(
+        _OPENCORPORATES_SEARCH_URL,
+        params=_opencorporates_params(name, jurisdiction),
+        timeout=15,
+    )
+    return _companies_from_response(json_body(r, "api.opencorporates.com"))
+
+
+async def _aopencorporates_search(name: str, *, jurisdiction="us") -> list[dict]:
+    """Async ``_opencorporates_search``."""
+    r = await aio.http_get(
+        _OPENCORPORATES_SEARCH_URL,
+        params=_opencorporates_params(name, jurisdiction),
+        timeout=15,
+    )
+    return _companies_from_response(json_body(r, "api.opencorporates.com"))
+
+
+def _opencorporates_params(name: str, jurisdiction: str) -> dict:
+    return {"q": name, "jurisdiction_code": jurisdiction, "per_page": 10}
+
+
+def _companies_from_response(data: dict) -> list[dict]:
+    """Extract the company dicts from an OpenCorporates search response."""
+    companies = data.get("results", {}).get("companies", [])
+    return [c.get("company", {}) for c in companies]
 
 
 def _is_exact_or_close_match(name: str, companies: list[dict]) -> bool:
@@ -77,6 +92,7 @@ def _is_exact_or_close_match(name: str, companies: list[dict]) -> bool:
     requires_network=True,
     latency="medium",
     parallelizable=True,
+    concurrency=(1, 8),
 )
 def company_name_available_us(name: str) -> bool:
     """Check if *name* is available as a US company name.
@@ -92,6 +108,13 @@ def company_name_available_us(name: str) -> bool:
     return not _is_exact_or_close_match(name, companies)
 
 
+@scorers.register_async("company_name_us")
+async def acompany_name_available_us(name: str) -> bool:
+    """Async ``company_name_available_us``."""
+    companies = await _aopencorporates_search(name, jurisdiction="us")
+    return not _is_exact_or_close_match(name, companies)
+
+
 # ---------------------------------------------------------------------------
 # USPTO Trademark (TESS-like search via public API)
 # ---------------------------------------------------------------------------
@@ -104,6 +127,7 @@ def company_name_available_us(name: str) -> bool:
     requires_network=True,
     latency="medium",
     parallelizable=True,
+    concurrency=(1, 8),
 )
 def trademark_check_us(name: str) -> bool:
     """Check if *name* conflicts with a registered US trademark.
@@ -117,24 +141,38 @@ def trademark_check_us(name: str) -> bool:
     >>> isinstance(trademark_check_us('xyzqwk'), bool)
     True
     """
-    try:
-        r = requests.get(
-            "https://tsdr.uspto.gov/documentexternal/statuskeynew",
-            params={"sn": "", "rn": "", "td": name},
-            timeout=15,
-            headers={"Accept": "application/json"},
-        )
-        # If we get a 404 or empty result, no trademark found
-        if r.status_code == 404:
-            return True
-        if r.status_code != 200:
-            return True  # Can't determine, optimistically assume available
-
-        data = r.json()
-        # If no trademark document found, name is clear
-        if not data or data.get("error"):
-            return True
-        return False
-    except (requests.RequestException, ValueError):
-        # Network error or JSON parse error — can't determine
-        return True  # Optimistic default; pipeline should re-check later
+    r = net.http_get(
+        _USPTO_TSDR_URL,
+        params=_trademark_params(name),
+        timeout=15,
+        headers={"Accept": "application/json"},
+    )
+    return _trademark_is_clear(r)
+
+
+@scorers.register_async("trademark_us")
+async def atrademark_check_us(name: str) -> bool:
+    """Async ``trademark_check_us``."""
+    r = await aio.http_get(
+        _USPTO_TSDR_URL,
+        params=_trademark_params(name),
+        timeout=15,
+        headers={"Accept": "application/json"},
+    )
+    return _trademark_is_clear(r)
+
+
+def _trademark_params(name: str) -> dict:
+    return {"sn": "", "rn": "", "td": name}
+
+
+def _trademark_is_clear(r) -> bool:
+    """Interpret a TSDR response: True if no live trademark was found."""
+    # If we get a 404 or empty result, no trademark found
+    if r.status_code == 404:
+        return True
+    data = json_body(r, "tsdr.uspto.gov")
+    # If no trademark document found, name is clear
+    if not data or data.get("error"):
+        return True
+    return False
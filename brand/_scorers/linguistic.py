@@ -8,6 +8,7 @@ import math
 import re
 from typing import NamedTuple
 
+from brand.executors import on_worker_start
 from brand.registry import scorers
 
 
@@ -16,6 +17,14 @@ from brand.registry import scorers
 # ---------------------------------------------------------------------------
 
 
+@on_worker_start
+def _load_wordfreq_tables():
+    """Load the English wordfreq table up front (once per worker process)."""
+    from wordfreq import zipf_frequency
+
+    zipf_frequency("warmup", "en")
+
+
 @scorers.register(
     "novelty",
     description="Novelty score via wordfreq (0=common word, 1=completely novel)",
@@ -107,6 +116,16 @@ def cross_linguistic_check(
     return flags
 
 
+@scorers.register_async("cross_linguistic")
+async def across_linguistic_check(name: str, **kwargs) -> dict:
+    """Async ``cross_linguistic_check`` (wordfreq lookups are local, blocking)."""
+    from brand import aio
+
+    return await aio.run_blocking(
+        cross_linguistic_check, name, host="wordfreq", **kwargs
+    )
+
+
 # ---------------------------------------------------------------------------
 # Substring hazards (profanity check)
 # ---------------------------------------------------------------------------
@@ -170,12 +189,16 @@ def substring_hazards(name: str, *, bad_words: set | None = None) -> list[str]:
 # ---------------------------------------------------------------------------
 
 
+_DATAMUSE_URL = "https://api.datamuse.com/words"
+
+
 @scorers.register(
     "phonetic_neighbors",
     description="Find words that sound like the name (Datamuse API)",
     requires_network=True,
     latency="medium",
     cost="moderate",
+    concurrency=(2, 32),
 )
 def phonetic_neighbors(name: str, *, max_results: int = 10) -> list[str]:
     """Query Datamuse for words that sound like *name*.
@@ -183,18 +206,25 @@ def phonetic_neighbors(name: str, *, max_results: int = 10) -> list[str]:
     >>> isinstance(phonetic_neighbors('brand'), list)
     True
     """
-    import requests
+    from brand import net
+    from brand.resilience import json_body
 
-    try:
-        r = requests.get(
-            "https://api.datamuse.com/words",
-            params={"sl": name, "max": max_results},
-            timeout=10,
-        )
-        r.raise_for_status()
-        return [item["word"] for item in r.json()]
-    except requests.RequestException:
-        return []
+    r = net.http_get(_DATAMUSE_URL, params={"sl": name, "max": max_results}, timeout=10)
+    return [item["word"] for item in json_body(r, "api.datamuse.com")]
+
+
+@scorers.register_async("phonetic_neighbors")
+async def aphonetic_neighbors(name: str, *, max_results: int = 10) -> list[str]:
+    """Async ``phonetic_neighbors``."""
+    from brand import aio
+    from brand.resilience import json_body
+
+    r = await aio.http_get(
+        _DATAMUSE_URL,
+        params={"sl": name, "max": max_results},
+        timeout=10,
+    )
+    return [item["word"] for item in json_body(r, "api.datamuse.com")]
 
 
 # ---------------------------------------------------------------------------
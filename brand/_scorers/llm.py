@@ -54,12 +54,64 @@ def _call_claude(prompt: str, *, model: str = "claude-sonnet-4-20250514") -> str
             "Install with: pip install anthropic"
         )
 
-    client = anthropic.Anthropic()
-    message = client.messages.create(
-        model=model,
-        max_tokens=8192,
-        messages=[{"role": "user", "content": prompt}],
-    )
+    from brand import endpoints, ratelimit, tracing
+
+    client = anthropic.Anthropic(**endpoints.anthropic_client_kwargs())
+    ratelimit.acquire("api.anthropic.com")
+    with tracing.span("llm", host="api.anthropic.com", model=model) as span:
+        message = client.messages.create(
+            model=model,
+            max_tokens=8192,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        _set_usage(span, message)
+    return _log_and_extract(message)
+
+
+async def _acall_claude(
+    prompt: str, *, model: str = "claude-sonnet-4-20250514"
+) -> str:
+    """Async ``_call_claude``, within the asyncio engine's Anthropic host limit."""
+    try:
+        import anthropic
+    except ImportError:
+        raise ImportError(
+            "LLM scorers require the 'anthropic' package. "
+            "Install with: pip install anthropic"
+        )
+    from brand import aio, endpoints, ratelimit, tracing
+
+    engine = aio.current_engine()
+    if engine is None:
+        return await aio.run_blocking(_call_claude, prompt, model=model)
+
+    client = anthropic.AsyncAnthropic(**endpoints.anthropic_client_kwargs())
+    await ratelimit.aacquire("api.anthropic.com")
+    async with engine.slot("api.anthropic.com"):
+        with tracing.span("llm", host="api.anthropic.com", model=model) as span:
+            message = await client.messages.create(
+                model=model,
+                max_tokens=8192,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            _set_usage(span, message)
+    return _log_and_extract(message)
+
+
+def _set_usage(span, message):
+    """Record a response's token usage on a tracing *span*."""
+    if span:
+        span.set(
+            input_tokens=message.usage.input_tokens,
+            output_tokens=message.usage.output_tokens,
+        )
+
+
+def _log_and_extract(message) -> str:
+    """Record a response's token usage (and cost, against the run's budget)
+    and return its text."""
+    from brand import budget
+
     _usage_log.append(
         {
             "model": message.model,
@@ -67,9 +119,29 @@ def _call_claude(prompt: str, *, model: str = "claude-sonnet-4-20250514") -> str
             "output_tokens": message.usage.output_tokens,
         }
     )
+    budget.settle(
+        "api.anthropic.com",
+        _token_cost(message.usage.input_tokens, message.usage.output_tokens),
+    )
     return message.content[0].text
 
 
+# Sonnet pricing (as of 2025), dollars per million tokens
+_INPUT_USD_PER_MTOK = 3.0
+_OUTPUT_USD_PER_MTOK = 15.0
+
+
+def _token_cost(input_tokens: int, output_tokens: int) -> float:
+    """Estimated dollars for *input_tokens* and *output_tokens*.
+
+    >>> _token_cost(1_000_000, 100_000)
+    4.5
+    """
+    return (
+        input_tokens * _INPUT_USD_PER_MTOK + output_tokens * _OUTPUT_USD_PER_MTOK
+    ) / 1_000_000
+
+
 def get_usage_summary() -> dict:
     """Return cumulative token usage and estimated cost.
 
@@ -77,9 +149,8 @@ def get_usage_summary() -> dict:
     """
     total_input = sum(u["input_tokens"] for u in _usage_log)
     total_output = sum(u["output_tokens"] for u in _usage_log)
-    # Sonnet pricing
-    cost_input = total_input * 3.0 / 1_000_000
-    cost_output = total_output * 15.0 / 1_000_000
+    cost_input = _token_cost(total_input, 0)
+    cost_output = _token_cost(0, total_output)
     return {
         "api_calls": len(_usage_log),
         "total_input_tokens": total_input,
@@ -128,7 +199,8 @@ def _parse_ratings(text: str) -> list[dict]:
     cost="expensive",
     requires_network=True,
     latency="slow",
-    parallelizable=False,  # Batch scorer — handles multiple names at once
+    parallelizable=True,  # one call per name (llm_brand_rating_batch batches them)
+    concurrency=(1, 8),
 )
 def llm_brand_rating(name: str, *, context: str = _DEFAULT_CONTEXT) -> dict:
     """Rate a single name using Claude.
@@ -144,6 +216,22 @@ def llm_brand_rating(name: str, *, context: str = _DEFAULT_CONTEXT) -> dict:
         names_list=name,
     )
     text = _call_claude(prompt)
+    return _first_rating(text)
+
+
+@scorers.register_async("llm_brand_rating")
+async def allm_brand_rating(name: str, *, context: str = _DEFAULT_CONTEXT) -> dict:
+    """Async ``llm_brand_rating``."""
+    prompt = _RATING_PROMPT.format(
+        context=context,
+        names_list=name,
+    )
+    text = await _acall_claude(prompt)
+    return _first_rating(text)
+
+
+def _first_rating(text: str) -> dict:
+    """The single rating in a one-name response, or an error dict."""
     ratings = _parse_ratings(text)
     if ratings:
         return ratings[0]
@@ -156,6 +244,7 @@ def llm_brand_rating_batch(
     context: str = _DEFAULT_CONTEXT,
     batch_size: int = 50,
     model: str = "claude-sonnet-4-20250514",
+    journal: str | None = None,
 ) -> dict[str, dict]:
     """Rate multiple names in batches using Claude.
 
@@ -172,17 +261,55 @@ def llm_brand_rating_batch(
         Names per API call (default 50).
     model : str
         Claude model to use.
+    journal : str | None
+        Path of an append-only journal file (see ``brand.journal``).  Each
+        batch's ratings are journaled as soon as the batch returns, and names
+        already journaled (for the same context and model) are not re-rated,
+        so an interrupted run picks up where it left off.
 
     Returns
     -------
     dict[str, dict]
         Mapping of name → {memorability, appeal, ..., overall, rationale}.
     """
+    from brand.journal import ScoreJournal
+
+    results = {}
+    log = None
+    if journal is not None:
+        log = ScoreJournal(journal, header={"context": context, "model": model})
+        pending = []
+        for n in names:
+            if (n.lower(), "llm_brand_rating_batch") in log:
+                results[n.lower()] = log[n.lower(), "llm_brand_rating_batch"]
+            else:
+                pending.append(n)
+        names = pending
+
+    try:
+        _rate_batches(
+            names, results, log, context=context, batch_size=batch_size, model=model
+        )
+    finally:
+        if log is not None:
+            log.close()
+    return results
+
+
+def _rate_batches(
+    names: list[str],
+    results: dict,
+    log,
+    *,
+    context: str,
+    batch_size: int,
+    model: str,
+):
+    """Rate *names* batch by batch into *results*, journaling each batch to *log*."""
     import math
     import sys
 
     total_batches = math.ceil(len(names) / batch_size)
-    results = {}
     for batch_idx, i in enumerate(range(0, len(names), batch_size), 1):
         batch = names[i : i + batch_size]
         names_list = "\n".join(f"- {n}" for n in batch)
@@ -203,6 +330,9 @@ def llm_brand_rating_batch(
         for n in batch:
             if n.lower() not in results:
                 results[n.lower()] = {"error": "not rated in batch", "overall": 0}
+        if log is not None:
+            for n in batch:
+                log.record(n.lower(), "llm_brand_rating_batch", results[n.lower()])
         usage = _usage_log[-1] if _usage_log else {}
         print(
             f"  Batch {batch_idx}/{total_batches}: "
@@ -211,4 +341,3 @@ def llm_brand_rating_batch(
             file=sys.stderr,
             flush=True,
         )
-    return results
@@ -11,6 +11,7 @@ Optional dependencies
 - ``epitran`` + ``panphon`` — IPA transcription and articulatory features
 """
 
+from brand.executors import on_worker_start
 from brand.registry import scorers
 
 # ---------------------------------------------------------------------------
@@ -42,6 +43,12 @@ def _get_arpabet(name: str) -> list[str] | None:
     return None
 
 
+@on_worker_start
+def _load_cmu_dict():
+    """Load the CMU dictionary up front (once per worker process)."""
+    _require("pronouncing").init_cmu()
+
+
 def _get_ipa(name: str, lang="eng-Latn") -> str:
     """Transliterate *name* to IPA using epitran."""
     epitran = _require("epitran")
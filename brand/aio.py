@@ -0,0 +1,583 @@
+"""asyncio-native scoring engine for network-bound scorers.
+
+The thread-pool path of ``run_pipeline`` keeps at most a handful of lookups in
+flight.  This module provides an event-loop engine that can keep hundreds or
+thousands of DNS/WHOIS/HTTP/LLM lookups in flight, with a global cap and
+per-host caps so no single service gets flooded.
+
+Network scorers expose an async variant (``ComponentMeta.afunc``, attached with
+``scorers.register_async``) built on the primitives of this module:
+
+* ``http_get`` — HTTP GET (``aiohttp`` when installed, else ``requests`` on the
+  engine's threads),
+* ``resolve`` — DNS resolution through the event loop,
+* ``run_blocking`` — run a blocking call (e.g. ``python-whois``) on the
+  engine's threads.
+
+Each primitive waits for a token of the host's rate limit (``brand.ratelimit``)
+and takes a slot from the active ``AsyncEngine`` (if any), keyed by host,
+before going out.
+
+Use ``arun_pipeline`` to drive a whole pipeline from an existing event loop
+(e.g. a notebook):
+
+>>> import asyncio
+>>> from brand.stages import Score
+>>> results = asyncio.run(arun_pipeline([Score(['name_length'])], names=['abc']))
+>>> results['candidates'][0]['scores']
+{'name_length': 3}
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import requests
+
+from brand import concurrency, endpoints, ratelimit, resilience, tracing
+from brand.budget import use_budget
+from brand.journal import open_stage_journal
+from brand.metrics import RunMetrics, StageMetrics
+from brand.registry import scorers as scorer_registry
+
+DFLT_MAX_IN_FLIGHT = 256
+DFLT_PER_HOST = 32
+DFLT_HOST_LIMITS = {
+    "api.opencorporates.com": 4,
+    "tsdr.uspto.gov": 4,
+    "api.anthropic.com": 8,
+    "whois": 16,
+}
+
+_current_engine: contextvars.ContextVar = contextvars.ContextVar(
+    "brand_aio_engine", default=None
+)
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class HttpResponse:
+    """Minimal, backend-independent HTTP response."""
+
+    status_code: int
+    text: str
+    url: str = ""
+    headers: dict = field(default_factory=dict)
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for url: {self.url}")
+
+
+class AsyncEngine:
+    """Bounded-concurrency context for async scorers.
+
+    Parameters
+    ----------
+    max_in_flight : int
+        Maximum number of lookups in flight overall.
+    per_host : int
+        Default maximum number of lookups in flight per host.
+    host_limits : dict | None
+        Per-host overrides of ``per_host`` (merged over ``DFLT_HOST_LIMITS``).
+        Hosts are network locations (``'github.com'``) or pseudo-hosts
+        (``'dns'``, ``'whois'``) for non-HTTP lookups.
+
+    Examples
+    --------
+    >>> async def demo():
+    ...     async with AsyncEngine(max_in_flight=2) as engine:
+    ...         return await engine.run_blocking(len, 'abc', host='local')
+    >>> asyncio.run(demo())
+    3
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int = DFLT_MAX_IN_FLIGHT,
+        per_host: int = DFLT_PER_HOST,
+        host_limits: dict | None = None,
+    ):
+        self.max_in_flight = max_in_flight
+        self.per_host = per_host
+        self.host_limits = {**DFLT_HOST_LIMITS, **(host_limits or {})}
+        self._global = None
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._executor = None
+        self._session = None
+        self._token = None
+
+    async def __aenter__(self):
+        self._global = asyncio.Semaphore(self.max_in_flight)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="brand-aio"
+        )
+        self._token = _current_engine.set(self)
+        return self
+
+    async def __aexit__(self, *exc):
+        _current_engine.reset(self._token)
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._executor.shutdown(wait=False)
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._hosts:
+            limit = self.host_limits.get(host, self.per_host)
+            self._hosts[host] = asyncio.Semaphore(limit)
+        return self._hosts[host]
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str):
+        """Hold one global and one per-host slot for the duration of a lookup."""
+        async with self._global, self._host_semaphore(host):
+            yield
+
+    async def run_blocking(self, func, *args, host: str, **kwargs):
+        """Run a blocking call on the engine's threads, within *host*'s limit."""
+        loop = asyncio.get_running_loop()
+        call = contextvars.copy_context().run
+        async with self.slot(host):
+            return await loop.run_in_executor(
+                self._executor, lambda: call(func, *args, **kwargs)
+            )
+
+    async def http_get(
+        self,
+        url: str,
+        *,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float = 10,
+    ) -> HttpResponse:
+        """GET *url* within its host's limit (see module-level ``http_get``)."""
+        host = urlsplit(url).netloc
+        session = self._aiohttp_session()
+        if session is None:
+            return await self.run_blocking(
+                _requests_get, url, params, headers, timeout, host=host
+            )
+        import aiohttp
+
+        async with self.slot(host):
+            try:
+                async with session.get(
+                    endpoints.http_url(url),
+                    params=params,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout),
+                    allow_redirects=True,
+                ) as r:
+                    return HttpResponse(
+                        r.status, await r.text(), str(r.url), dict(r.headers)
+                    )
+            except asyncio.TimeoutError as e:
+                raise requests.Timeout(str(e)) from e
+            except aiohttp.ClientError as e:
+                raise requests.ConnectionError(str(e)) from e
+
+    def _aiohttp_session(self):
+        """Shared ``aiohttp`` session, or None if aiohttp isn't installed."""
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError:
+                return None
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight)
+            )
+        return self._session
+
+
+def _requests_get(url, params, headers, timeout) -> HttpResponse:
+    r = requests.get(
+        endpoints.http_url(url),
+        params=params,
+        headers=headers,
+        timeout=timeout,
+        allow_redirects=True,
+    )
+    return HttpResponse(r.status_code, r.text, r.url, dict(r.headers))
+
+
+def current_engine() -> AsyncEngine | None:
+    """The ``AsyncEngine`` active in the current context, if any."""
+    return _current_engine.get()
+
+
+# ---------------------------------------------------------------------------
+# Primitives for async scorers
+# ---------------------------------------------------------------------------
+
+
+async def run_blocking(func, *args, host: str = "local", **kwargs):
+    """Run a blocking call without blocking the event loop."""
+    engine = current_engine()
+    with tracing.span("blocking", host=host):
+        if engine is None:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        return await engine.run_blocking(func, *args, host=host, **kwargs)
+
+
+async def http_get(
+    url: str,
+    *,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float = 10,
+) -> HttpResponse:
+    """Asynchronously GET *url*, following redirects.
+
+    Like ``brand.net.http_get``, network failures, 429 and 5xx responses are
+    retried, and raise ``brand.resilience.Indeterminate`` if they persist,
+    whichever backend is used.
+    """
+    engine = current_engine()
+    host = urlsplit(url).netloc
+
+    async def attempt():
+        await ratelimit.aacquire(host)
+        with tracing.span("http", host=host, url=url) as span:
+            try:
+                if engine is None:
+                    r = await asyncio.to_thread(
+                        _requests_get, url, params, headers, timeout
+                    )
+                else:
+                    r = await engine.http_get(
+                        url, params=params, headers=headers, timeout=timeout
+                    )
+            except requests.RequestException as e:
+                concurrency.note_overload()
+                raise resilience.Retryable(f"{type(e).__name__}: {e}") from e
+            tracing.set_response(span, r)
+        concurrency.note_status(r.status_code)
+        resilience.check_status(r.status_code, r.headers)
+        return r
+
+    return await resilience.acall(host, attempt)
+
+
+async def resolve(hostname: str, *, timeout: float = 3):
+    """Resolve *hostname* (raises ``OSError`` if it doesn't resolve).
+
+    Within an engine, resolution runs on the engine's threads under the
+    ``'dns'`` limit, rather than on the loop's small default executor.
+    """
+    await ratelimit.aacquire("dns")
+    engine = current_engine()
+    if engine is not None:
+        lookup = engine.run_blocking(endpoints.getaddrinfo, hostname, host="dns")
+    elif endpoints.has_dns_endpoint():
+        lookup = asyncio.to_thread(endpoints.getaddrinfo, hostname)
+    else:
+        lookup = asyncio.get_running_loop().getaddrinfo(hostname, None)
+    with tracing.span("dns", host=hostname):
+        try:
+            return await asyncio.wait_for(lookup, timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(f"DNS lookup timed out for {hostname}") from e
+
+
+# ---------------------------------------------------------------------------
+# Async scoring
+# ---------------------------------------------------------------------------
+
+
+async def _bounded_map(afunc, items, limit: int):
+    """Await ``afunc(item)`` for every item with at most *limit* in flight.
+
+    Uses *limit* worker coroutines pulling from a shared iterator, so memory
+    stays proportional to *limit* rather than to the number of items.
+    """
+    it = iter(items)
+
+    async def worker():
+        for item in it:
+            await afunc(item)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, limit))))
+
+
+async def ascore_candidates(
+    candidates: list[dict],
+    scorer_name: str,
+    scorer_params: dict,
+    *,
+    on_result=None,
+    observe=None,
+) -> list[dict]:
+    """Score *candidates* with one scorer, concurrently where possible.
+
+    Uses the scorer's async variant if it has one; other network scorers run
+    on the engine's threads; local scorers run inline.  Scorers declaring a
+    ``concurrency`` range have their calls in flight adapted within it (see
+    ``brand.concurrency``).  ``on_result(cand)`` is called as each candidate's
+    result arrives, and ``observe(seconds, result)`` with each call's latency.
+    """
+    meta = scorer_registry[scorer_name]
+    engine = current_engine()
+    limit = engine.max_in_flight if engine is not None else DFLT_MAX_IN_FLIGHT
+    limiter = None
+
+    if meta.afunc is not None:
+
+        async def call(name):
+            return await meta.afunc(name, **scorer_params)
+
+    elif meta.requires_network and meta.parallelizable:
+
+        async def call(name):
+            return await run_blocking(meta.func, name, host=scorer_name, **scorer_params)
+
+    else:
+        limit = 1
+
+        async def call(name):
+            return meta.func(name, **scorer_params)
+
+    if limit > 1 and meta.concurrency:
+        limiter = concurrency.get_limiter(scorer_name, meta.concurrency)
+
+    async def score_one(cand):
+        started = time.perf_counter()
+        with concurrency.call_feedback() as feedback:
+            try:
+                with tracing.span("call", scorer=scorer_name, candidate=cand["name"]):
+                    result = await call(cand["name"])
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+        seconds = time.perf_counter() - started
+        if limiter is not None:
+            limiter.record(seconds, result, overloaded=feedback.overloaded)
+        if observe:
+            observe(seconds, result)
+        cand["scores"][scorer_name] = result
+        if on_result:
+            on_result(cand)
+
+    if limiter is None:
+        await _bounded_map(score_one, candidates, limit)
+    else:
+        await concurrency.adaptive_map(score_one, candidates, limiter)
+    return candidates
+
+
+async def ascore_stage(
+    stage,
+    candidates: list[dict],
+    *,
+    rules: dict | None = None,
+    journal=None,
+    metrics: StageMetrics | None = None,
+) -> list[dict]:
+    """Execute a Score stage on the event loop.
+
+    Like ``run_pipeline``'s ``_run_score``, scorers run cheapest first, the
+    following Filter's *rules* prune candidates before expensive scorers,
+    network results go through the stage's *journal*, if any, and calls are
+    timed into *metrics*.
+    """
+    from brand.pipeline import _ordered_scorer_specs, _prune, _within_budget
+
+    if metrics is None:
+        metrics = StageMetrics(None, "score")
+    specs = _ordered_scorer_specs(stage)
+    alive = candidates
+    for k, (scorer_name, scorer_params) in enumerate(specs):
+        if not alive:
+            break
+        meta = scorer_registry[scorer_name]
+        todo, on_result = alive, None
+        if journal is not None and meta.requires_network:
+            todo = journal.replay(alive, scorer_name)
+            on_result = journal.recorder(scorer_name)
+        todo = _within_budget(todo, scorer_name, meta)
+        scorer_metrics = metrics.scorer(scorer_name)
+        with tracing.span(
+            "scorer", scorer=scorer_name, candidates=len(todo)
+        ), scorer_metrics.timed():
+            await ascore_candidates(
+                todo,
+                scorer_name,
+                scorer_params,
+                on_result=on_result,
+                observe=scorer_metrics.observe,
+            )
+        scorer_metrics.concurrency = concurrency.limiter_snapshot(scorer_name)
+        if rules and k + 1 < len(specs):
+            alive = _prune(alive, rules, pending={n for n, _ in specs[k + 1 :]})
+    return candidates
+
+
+def score_candidates_blocking(
+    candidates: list[dict],
+    scorer_name: str,
+    scorer_params: dict,
+    *,
+    on_result=None,
+    observe=None,
+    **engine_kwargs,
+) -> list[dict]:
+    """Synchronous entry point: score with a fresh engine on a private loop.
+
+    Must not be called from a running event loop (use ``ascore_candidates``
+    there).
+    """
+
+    async def main():
+        async with AsyncEngine(**engine_kwargs):
+            return await ascore_candidates(
+                candidates,
+                scorer_name,
+                scorer_params,
+                on_result=on_result,
+                observe=observe,
+            )
+
+    return asyncio.run(main())
+
+
+def in_event_loop() -> bool:
+    """Whether the caller is running inside an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Async pipeline runner
+# ---------------------------------------------------------------------------
+
+
+async def arun_pipeline(
+    stages,
+    *,
+    names: list[str] | None = None,
+    context: str | None = None,
+    project_name: str | None = None,
+    resume_from: int | None = None,
+    pipeline_dir: str | None = None,
+    on_stage_complete=None,
+    max_in_flight: int = DFLT_MAX_IN_FLIGHT,
+    per_host: int = DFLT_PER_HOST,
+    host_limits: dict | None = None,
+    artifact_format=None,
+    delta: bool = False,
+    cache: bool = True,
+    budget=None,
+    record_seen: bool = False,
+):
+    """Execute a pipeline as a coroutine, scoring on the asyncio engine.
+
+    Same parameters and return value as ``run_pipeline``, plus the
+    ``AsyncEngine`` limits ``max_in_flight``, ``per_host`` and
+    ``host_limits``.  Artifacts are persisted (and reused, with *cache*)
+    exactly as in eager mode.
+    """
+    from brand import pipeline as _pipeline
+
+    stages, proj_dir = _pipeline._prepare_project(
+        stages, context=context, project_name=project_name, pipeline_dir=pipeline_dir
+    )
+
+    candidates = None
+    if resume_from is not None and resume_from > 0:
+        candidates = list(_pipeline._resume_candidates(proj_dir, resume_from))
+    elif names is not None:
+        candidates = [{"name": n, "scores": {}} for n in names]
+
+    metrics = RunMetrics()
+    metrics.start()
+    with tracing.span(
+        "pipeline", project_dir=proj_dir, stream=False
+    ), use_budget(budget) as tracker, _pipeline._seen_index(
+        proj_dir, stages, record=record_seen
+    ):
+        async with AsyncEngine(
+            max_in_flight=max_in_flight, per_host=per_host, host_limits=host_limits
+        ):
+            steps = _pipeline._stage_steps(
+                stages,
+                candidates,
+                proj_dir=proj_dir,
+                start_idx=resume_from or 0,
+                context=context,
+                on_stage_complete=on_stage_complete,
+                fmt=artifact_format,
+                delta=delta,
+                cache=cache,
+                metrics=metrics,
+            )
+            try:
+                i, stage, candidates, kwargs = next(steps)
+                while True:
+                    try:
+                        candidates = await _arun_stage(i, stage, candidates, **kwargs)
+                    except Exception as e:
+                        steps.throw(e)
+                    i, stage, candidates, kwargs = steps.send(candidates)
+            except StopIteration as done:
+                candidates = done.value
+        _pipeline._record_final(candidates, stages)
+        if tracker is not None:
+            metrics.budget = tracker.usage()
+
+    final_dir = os.path.join(proj_dir, "final")
+    os.makedirs(final_dir, exist_ok=True)
+    _pipeline._write_json(os.path.join(final_dir, "results.json"), candidates)
+    metrics.stop()
+    metrics.write(final_dir)
+
+    return {
+        "candidates": candidates,
+        "project_dir": proj_dir,
+        "stages_completed": len(stages),
+    }
+
+
+async def _arun_stage(i, stage, candidates, *, proj_dir, rules, metrics, **kwargs):
+    """``_run_stage``, with Score stages scored on the event loop first."""
+    from brand import pipeline as _pipeline
+
+    score = None
+    if isinstance(stage, _pipeline.Score) and candidates is not None:
+        sdir = _pipeline._stage_dir(proj_dir, i, "score")
+        metrics.candidates_in = len(candidates)
+        with open_stage_journal(sdir, stage) as journal, metrics.timed():
+            candidates = await ascore_stage(
+                stage, candidates, rules=rules, journal=journal, metrics=metrics
+            )
+        score = _already_scored
+    return _pipeline._run_stage(
+        i,
+        stage,
+        candidates,
+        proj_dir=proj_dir,
+        rules=rules,
+        score=score,
+        metrics=metrics,
+        **kwargs,
+    )
+
+
+def _already_scored(stage, candidates, *, rules=None, metrics=None):
+    """``score`` hook for ``_run_stage`` when the stage was scored async."""
+    return candidates
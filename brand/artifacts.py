@@ -0,0 +1,487 @@
+"""Pluggable storage formats for stage artifacts.
+
+Each pipeline stage persists its candidates in its stage folder.  How they are
+stored is up to an ``ArtifactFormat``:
+
+* ``'json'`` — one pretty-printed ``results.json`` (the historical layout,
+  written in one go; easy to eyeball, heavy for large runs);
+* ``'jsonl'`` — ``results.jsonl``, one candidate per line, appended as
+  candidates flow;
+* ``'npz'`` — compressed NumPy part files in ``results-npz/``, one typed
+  array per scorer;
+* ``'parquet'`` — Parquet part files in ``results-parquet/`` (needs
+  ``pyarrow``).
+
+``'columnar'`` picks ``'parquet'`` when ``pyarrow`` is installed and ``'npz'``
+otherwise.  All formats accept chunked, append-as-you-go writes, and all are
+read back lazily; the columnar ones only load the columns asked for.
+
+>>> import tempfile
+>>> path = tempfile.mkdtemp()
+>>> with get_format('jsonl').writer(path) as w:
+...     w.write_many([{'name': 'figiri', 'scores': {'name_length': 6, 'syllables': 3}}])
+>>> list(read_candidates(path, columns=['syllables']))
+[{'name': 'figiri', 'scores': {'syllables': 3}}]
+
+Custom formats subclass ``ArtifactFormat`` (implementing all of its abstract
+methods, or it can't be instantiated) and are registered in
+``artifact_formats``.
+"""
+
+import json
+import os
+import shutil
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+DFLT_ROWS_PER_PART = 10_000
+
+_SCORE_PREFIX = "score/"
+_JSON_SUFFIX = "#json"
+_PRESENT_SUFFIX = "#present"
+
+
+def _snapshot(cand: Mapping) -> dict:
+    """Copy a candidate so that later stages can't mutate what gets written."""
+    return {"name": cand["name"], "scores": dict(cand["scores"])}
+
+
+def _select_columns(cand: dict, columns) -> dict:
+    """Keep only the scores named in *columns* (all of them if None)."""
+    if columns is None:
+        return cand
+    return {
+        "name": cand["name"],
+        "scores": {k: v for k, v in cand["scores"].items() if k in columns},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Format interface
+# ---------------------------------------------------------------------------
+
+
+class ArtifactWriter(ABC):
+    """Append candidates to a stage artifact; use as a context manager."""
+
+    @abstractmethod
+    def write(self, cand: Mapping):
+        """Append *cand* (a snapshot of it: it may be mutated afterwards)."""
+
+    def write_many(self, candidates: Iterable[Mapping]):
+        for cand in candidates:
+            self.write(cand)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArtifactFormat(ABC):
+    """How a stage's candidates are laid out in its folder."""
+
+    name = ""
+
+    @abstractmethod
+    def writer(self, stage_path: str) -> ArtifactWriter:
+        """A writer of a new artifact in *stage_path* (replacing any other)."""
+
+    @abstractmethod
+    def exists(self, stage_path: str) -> bool:
+        """Whether *stage_path* has an artifact in this format."""
+
+    @abstractmethod
+    def read(self, stage_path: str, *, columns=None) -> Iterator[dict]:
+        """Yield the stored candidates, with only the *columns* scores if given."""
+
+    @abstractmethod
+    def remove(self, stage_path: str):
+        """Delete this format's artifact from *stage_path*, if present."""
+
+
+# ---------------------------------------------------------------------------
+# JSON and JSON Lines
+# ---------------------------------------------------------------------------
+
+
+class _JsonWriter(ArtifactWriter):
+    def __init__(self, path: str):
+        self._path = path
+        self._candidates = []
+
+    def write(self, cand):
+        self._candidates.append(_snapshot(cand))
+
+    def close(self):
+        with open(self._path, "w") as f:
+            json.dump(self._candidates, f, indent=2, default=str)
+
+
+class JsonFormat(ArtifactFormat):
+    """A single pretty-printed ``results.json``.
+
+    Reads understand all historical layouts: a candidate list, a Filter's
+    ``{'candidates': [...]}`` dict and a Generate's ``{'names': [...]}`` dict.
+    """
+
+    name = "json"
+    filename = "results.json"
+
+    def writer(self, stage_path):
+        return _JsonWriter(os.path.join(stage_path, self.filename))
+
+    def exists(self, stage_path):
+        return os.path.exists(os.path.join(stage_path, self.filename))
+
+    def remove(self, stage_path):
+        if self.exists(stage_path):
+            os.remove(os.path.join(stage_path, self.filename))
+
+    def read(self, stage_path, *, columns=None):
+        with open(os.path.join(stage_path, self.filename)) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            if "candidates" in data:
+                data = data["candidates"]
+            else:
+                data = [{"name": n, "scores": {}} for n in data.get("names", [])]
+        for cand in data:
+            yield _select_columns(cand, columns)
+
+
+class _JsonlWriter(ArtifactWriter):
+    def __init__(self, path: str):
+        self._f = open(path, "w")
+
+    def write(self, cand):
+        self._f.write(json.dumps(_snapshot(cand), default=str) + "\n")
+
+    def close(self):
+        self._f.close()
+
+
+class JsonlFormat(ArtifactFormat):
+    """``results.jsonl``: one candidate per line, written as they pass."""
+
+    name = "jsonl"
+    filename = "results.jsonl"
+
+    def writer(self, stage_path):
+        return _JsonlWriter(os.path.join(stage_path, self.filename))
+
+    def exists(self, stage_path):
+        return os.path.exists(os.path.join(stage_path, self.filename))
+
+    def remove(self, stage_path):
+        if self.exists(stage_path):
+            os.remove(os.path.join(stage_path, self.filename))
+
+    def read(self, stage_path, *, columns=None):
+        with open(os.path.join(stage_path, self.filename)) as f:
+            for line in f:
+                if line.strip():
+                    yield _select_columns(json.loads(line), columns)
+
+
+# ---------------------------------------------------------------------------
+# Columnar part files
+# ---------------------------------------------------------------------------
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "Columnar artifacts require numpy. Install with: pip install brand[columnar]"
+        )
+
+
+def _column_kind(values: list) -> str:
+    """The narrowest array kind holding all *values*: bool, int, float, str or json."""
+    types = {type(v) for v in values}
+    if types == {bool}:
+        return "bool"
+    if types == {int} and all(-(2**63) <= v < 2**63 for v in values):
+        return "int"
+    if types == {float}:
+        return "float"
+    if types == {str}:
+        return "str"
+    return "json"
+
+
+_FILL = {"bool": False, "int": 0, "float": 0.0, "str": ""}
+_DTYPES = {"bool": bool, "int": "int64", "float": "float64", "str": str}
+
+
+def _encode_columns(candidates: list[dict]) -> dict:
+    """Turn candidate records into named NumPy arrays.
+
+    Each scorer becomes a ``'score/<scorer>'`` array of its natural type, or a
+    ``'score/<scorer>#json'`` array of JSON strings for dicts and mixed types.
+    A ``'#present'`` mask is added when some candidates lack the score.
+    """
+    columns = {"name": np.array([c["name"] for c in candidates], dtype=str)}
+    scorer_names = {}
+    for c in candidates:
+        scorer_names.update(dict.fromkeys(c["scores"]))
+
+    for scorer in scorer_names:
+        present = [scorer in c["scores"] for c in candidates]
+        values = [c["scores"][scorer] for c in candidates if scorer in c["scores"]]
+        kind = _column_kind(values)
+        key = _SCORE_PREFIX + scorer
+        if kind == "json":
+            key += _JSON_SUFFIX
+            values = [json.dumps(v, default=str) for v in values]
+            kind = "str"
+        if all(present):
+            columns[key] = np.array(values, dtype=_DTYPES[kind])
+        else:
+            it = iter(values)
+            filled = [next(it) if p else _FILL[kind] for p in present]
+            columns[key] = np.array(filled, dtype=_DTYPES[kind])
+            columns[_SCORE_PREFIX + scorer + _PRESENT_SUFFIX] = np.array(present)
+    return columns
+
+
+def _decode_columns(columns: Mapping) -> list[dict]:
+    """Inverse of ``_encode_columns`` (columns may be arrays or lists)."""
+    candidates = [{"name": n, "scores": {}} for n in _pylist(columns["name"])]
+    for key, values in columns.items():
+        if not key.startswith(_SCORE_PREFIX) or key.endswith(_PRESENT_SUFFIX):
+            continue
+        scorer = key[len(_SCORE_PREFIX) :].removesuffix(_JSON_SUFFIX)
+        is_json = key.endswith(_JSON_SUFFIX)
+        present = columns.get(_SCORE_PREFIX + scorer + _PRESENT_SUFFIX)
+        present = _pylist(present) if present is not None else None
+        for i, v in enumerate(_pylist(values)):
+            if present is None or present[i]:
+                candidates[i]["scores"][scorer] = json.loads(v) if is_json else v
+    return candidates
+
+
+def _pylist(values) -> list:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def _wanted_keys(keys: Iterable[str], columns) -> list[str]:
+    """The stored column *keys* needed to read back the *columns* scores."""
+    if columns is None:
+        return list(keys)
+    columns = set(columns)
+    wanted = []
+    for key in keys:
+        scorer = key.removeprefix(_SCORE_PREFIX)
+        scorer = scorer.removesuffix(_PRESENT_SUFFIX).removesuffix(_JSON_SUFFIX)
+        if key == "name" or (key.startswith(_SCORE_PREFIX) and scorer in columns):
+            wanted.append(key)
+    return wanted
+
+
+class _PartsWriter(ArtifactWriter):
+    """Buffer candidates and flush them as numbered part files."""
+
+    def __init__(self, fmt: "_PartsFormat", dirpath: str):
+        self._fmt = fmt
+        self._dir = dirpath
+        self._buffer = []
+        self._n_parts = 0
+        os.makedirs(dirpath, exist_ok=True)
+
+    def write(self, cand):
+        self._buffer.append(_snapshot(cand))
+        if len(self._buffer) >= self._fmt.rows_per_part:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            path = os.path.join(
+                self._dir, f"part-{self._n_parts:05d}{self._fmt.extension}"
+            )
+            self._fmt._write_part(path, _encode_columns(self._buffer))
+            self._n_parts += 1
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+
+
+class _PartsFormat(ArtifactFormat):
+    """A ``results-<name>/`` folder of columnar part files, read part by part."""
+
+    extension = ""
+
+    def __init__(self, rows_per_part: int = DFLT_ROWS_PER_PART):
+        self.rows_per_part = rows_per_part
+
+    def _dirpath(self, stage_path):
+        return os.path.join(stage_path, f"results-{self.name}")
+
+    def writer(self, stage_path):
+        self._check_available()
+        self.remove(stage_path)
+        return _PartsWriter(self, self._dirpath(stage_path))
+
+    def exists(self, stage_path):
+        return os.path.isdir(self._dirpath(stage_path))
+
+    def remove(self, stage_path):
+        shutil.rmtree(self._dirpath(stage_path), ignore_errors=True)
+
+    def read(self, stage_path, *, columns=None):
+        self._check_available()
+        dirpath = self._dirpath(stage_path)
+        for filename in sorted(os.listdir(dirpath)):
+            if filename.endswith(self.extension):
+                part = self._read_part(os.path.join(dirpath, filename), columns)
+                yield from _decode_columns(part)
+
+    def _check_available(self):
+        _require_numpy()
+
+    @abstractmethod
+    def _write_part(self, path: str, columns: dict):
+        """Write one part file of encoded *columns* to *path*."""
+
+    @abstractmethod
+    def _read_part(self, path: str, columns) -> dict:
+        """The encoded columns of the part file *path* (those of *columns*)."""
+
+
+class NpzFormat(_PartsFormat):
+    """Compressed ``.npz`` part files (NumPy only)."""
+
+    name = "npz"
+    extension = ".npz"
+
+    def _write_part(self, path, columns):
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **columns)
+
+    def _read_part(self, path, columns):
+        with np.load(path) as npz:
+            return {key: npz[key] for key in _wanted_keys(npz.files, columns)}
+
+
+def _pyarrow_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pq
+
+
+class ParquetFormat(_PartsFormat):
+    """Parquet part files (requires ``pyarrow``)."""
+
+    name = "parquet"
+    extension = ".parquet"
+
+    def _check_available(self):
+        _require_numpy()
+        if _pyarrow_parquet() is None:
+            raise ImportError(
+                "Parquet artifacts require pyarrow. "
+                "Install with: pip install brand[parquet]"
+            )
+
+    def _write_part(self, path, columns):
+        import pyarrow as pa
+
+        table = pa.table(
+            {
+                key: pa.array(arr.tolist() if arr.dtype.kind == "U" else arr)
+                for key, arr in columns.items()
+            }
+        )
+        _pyarrow_parquet().write_table(table, path)
+
+    def _read_part(self, path, columns):
+        pq = _pyarrow_parquet()
+        keys = _wanted_keys(pq.read_schema(path).names, columns)
+        return pq.read_table(path, columns=keys).to_pydict()
+
+
+# ---------------------------------------------------------------------------
+# Format registry
+# ---------------------------------------------------------------------------
+
+artifact_formats: dict[str, ArtifactFormat] = {
+    "json": JsonFormat(),
+    "jsonl": JsonlFormat(),
+    "npz": NpzFormat(),
+    "parquet": ParquetFormat(),
+}
+
+
+def get_format(fmt: "str | ArtifactFormat") -> ArtifactFormat:
+    """Resolve a format name (or pass an ``ArtifactFormat`` through).
+
+    ``'columnar'`` means ``'parquet'`` if ``pyarrow`` is installed, else
+    ``'npz'``.
+    """
+    if isinstance(fmt, ArtifactFormat):
+        return fmt
+    if fmt == "columnar":
+        fmt = "parquet" if _pyarrow_parquet() is not None else "npz"
+    try:
+        return artifact_formats[fmt]
+    except KeyError:
+        raise ValueError(
+            f"Unknown artifact format {fmt!r}. "
+            f"Available: {sorted(artifact_formats)} or 'columnar'"
+        ) from None
+
+
+def find_format(stage_path: str) -> ArtifactFormat | None:
+    """The format of the artifact stored in *stage_path*, if any."""
+    for fmt in artifact_formats.values():
+        if fmt.exists(stage_path):
+            return fmt
+    return None
+
+
+def open_writer(stage_path: str, fmt: "str | ArtifactFormat") -> ArtifactWriter:
+    """Open a *fmt* writer in *stage_path*, removing artifacts of other formats.
+
+    Re-running a stage in another format must not leave a stale artifact that
+    ``read_candidates`` would pick up instead.
+    """
+    fmt = get_format(fmt)
+    remove_other_formats(stage_path, fmt)
+    return fmt.writer(stage_path)
+
+
+def remove_other_formats(stage_path: str, fmt: "str | ArtifactFormat | None"):
+    """Delete artifacts in *stage_path* that are not in format *fmt* (None: all)."""
+    name = get_format(fmt).name if fmt is not None else None
+    for other in artifact_formats.values():
+        if other.name != name:
+            other.remove(stage_path)
+
+
+def read_candidates(stage_path: str, *, columns=None) -> Iterator[dict]:
+    """Lazily read the candidates stored in *stage_path*, whatever the format.
+
+    Parameters
+    ----------
+    stage_path : str
+        A stage folder (or ``final/``) of a pipeline project.
+    columns : iterable of str | None
+        Only load these scores (columnar formats skip the other columns
+        entirely).  All scores by default.
+    """
+    fmt = find_format(stage_path)
+    if fmt is None:
+        raise FileNotFoundError(f"No candidates artifact in {stage_path}")
+    return fmt.read(stage_path, columns=columns)
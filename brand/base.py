@@ -8,10 +8,11 @@ import pickle
 from functools import partial
 from typing import Union
 from collections.abc import Callable, Iterable, MutableMapping
-from time import sleep
+from urllib.parse import urlsplit
 
 from dol import PickleFiles
 
+from brand import ratelimit
 from brand.util import print_progress, DFLT_ROOT_DIR, StoreType
 
 
@@ -48,6 +49,10 @@ import whois
 DNS_TIMEOUT = 3  # seconds
 WHOIS_TIMEOUT = 12  # seconds
 
+# Request rates are paced by the process-wide, per-host limits of
+# brand.ratelimit ('dns', 'whois', and the network location of URLs), shared
+# with the pipeline's scorers.  Change them with ``ratelimit.set_rate_limit``.
+
 
 @timeout(DNS_TIMEOUT)
 def domain_exists_socket(domain):
@@ -108,10 +113,12 @@ def domain_exists(domain, tld=".com"):
         domain = domain + tld
 
     # Fast DNS check first
+    ratelimit.acquire("dns")
     if domain_exists_socket(domain):
         return True
 
     # If DNS fails, double-check with WHOIS to reduce false negatives
+    ratelimit.acquire("whois")
     return domain_exists_whois(domain)
 
 
@@ -135,6 +142,7 @@ name_is_available = domain_name_is_available  # back-compatibility alias
 
 def _dns_is_available(domain, timeout=3):
     """Fast DNS-only check. Returns True if domain does NOT resolve (likely available)."""
+    ratelimit.acquire("dns")
     old_timeout = socket.getdefaulttimeout()
     try:
         socket.setdefaulttimeout(timeout)
@@ -148,6 +156,7 @@ def _dns_is_available(domain, timeout=3):
 
 def _whois_is_available(domain):
     """WHOIS-based check. Returns True if domain appears unregistered."""
+    ratelimit.acquire("whois")
     try:
         w = whois.whois(domain)
         if w.domain_name:
@@ -163,7 +172,7 @@ def batch_check_available(
     tld=".com",
     dns_workers=20,
     whois_workers=5,
-    whois_batch_sleep=1,
+    whois_batch_sleep=None,
     on_available=None,
     on_progress=None,
 ):
@@ -172,12 +181,17 @@ def batch_check_available(
     Pass 1 (fast, parallel): DNS lookup filters out domains that resolve.
     Pass 2 (slower, parallel): WHOIS verification on DNS-negative candidates.
 
+    Both passes are paced by the shared 'dns' and 'whois' rate limits of
+    ``brand.ratelimit``, so WHOIS servers see a steady request rate rather
+    than bursts separated by fixed sleeps.
+
     Args:
         names: Iterable of domain names (without TLD).
         tld: TLD to append (default '.com').
         dns_workers: Number of parallel DNS workers.
         whois_workers: Number of parallel WHOIS workers.
-        whois_batch_sleep: Seconds to sleep between WHOIS batches.
+        whois_batch_sleep: Deprecated and ignored; use
+            ``ratelimit.set_rate_limit('whois', rate, burst)`` instead.
         on_available: Optional callback(name) when a name is confirmed available.
         on_progress: Optional callback(phase, checked, total, available_count).
 
@@ -186,6 +200,16 @@ def batch_check_available(
     """
     from concurrent.futures import ThreadPoolExecutor, as_completed
 
+    if whois_batch_sleep is not None:
+        import warnings
+
+        warnings.warn(
+            "whois_batch_sleep is ignored: WHOIS lookups are paced by the 'whois' "
+            "rate limit (see brand.ratelimit.set_rate_limit)",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+
     names = list(names)
     total = len(names)
 
@@ -222,28 +246,22 @@ def batch_check_available(
         return name, _whois_is_available(domain)
 
     whois_total = len(dns_negative)
-    batch_size = whois_workers * 2
-
-    for batch_start in range(0, whois_total, batch_size):
-        batch = dns_negative[batch_start : batch_start + batch_size]
-
-        with ThreadPoolExecutor(max_workers=whois_workers) as executor:
-            futures = {executor.submit(_whois_check, n): n for n in batch}
-            for future in as_completed(futures):
-                name, is_avail = future.result()
-                if is_avail:
-                    available.append(name)
-                    if on_available:
-                        on_available(name)
-                else:
-                    whois_not_available.append(name)
+    progress_every = whois_workers * 2
 
-        checked = min(batch_start + batch_size, whois_total)
-        if on_progress:
-            on_progress("whois", checked, whois_total, len(available))
-
-        if batch_start + batch_size < whois_total:
-            sleep(whois_batch_sleep)
+    with ThreadPoolExecutor(max_workers=whois_workers) as executor:
+        futures = {executor.submit(_whois_check, n): n for n in dns_negative}
+        done = 0
+        for future in as_completed(futures):
+            name, is_avail = future.result()
+            done += 1
+            if is_avail:
+                available.append(name)
+                if on_available:
+                    on_available(name)
+            else:
+                whois_not_available.append(name)
+            if on_progress and (done % progress_every == 0 or done == whois_total):
+                on_progress("whois", done, whois_total, len(available))
 
     return {
         "available": sorted(available),
@@ -292,9 +310,8 @@ def process_names(
 ):
     skip_names = already_checked_names(store)
 
+    # Lookups are paced by brand.ratelimit (see domain_exists)
     for i, name in enumerate(filter(lambda x: x not in skip_names, names)):
-        if i % 10 == 0:
-            sleep(1)
         if progress_prints:
             print_progress(f"{i}: {name}", refresh=same_line_print)
         if not name_is_available(name + domain_suffix):
@@ -591,6 +608,7 @@ def url_says_it_is_available(
     request_func=requests.get,
 ):
     url = name_to_url(name)
+    ratelimit.acquire(urlsplit(url).netloc)
     response = request_func(url)
     return response_bool_func(response)
 
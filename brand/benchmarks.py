@@ -0,0 +1,507 @@
+"""Benchmarks: throughput and memory of scorers, generators and pipelines.
+
+``run_benchmarks`` measures
+
+* every scorer in ``brand.scorers`` on synthetic names (names per second,
+  error count),
+* every generator in ``brand.generators`` (names per second, up to a cap),
+* ``run_pipeline`` end to end with the ``quick_screen`` and
+  ``research_company`` templates on synthetic candidate sets of 1K, 10K and
+  100K names (1M on request),
+
+and, for each, the peak memory traced by ``tracemalloc`` (in a second run, so
+that tracing doesn't skew the timings).  The process' resident-set high-water
+mark is recorded too.  Results are plain JSON, tagged with the git commit,
+so runs on different commits can be compared with ``compare_results``::
+
+    python -m brand.benchmarks run --output before.json
+    git checkout my-branch
+    python -m brand.benchmarks run --output after.json
+    python -m brand.benchmarks compare before.json after.json
+
+Network scorers, generators and templates are skipped unless ``network=True``
+(they'd measure the remote services more than this code).  With
+``standins=True``, network scorers and templates run against the local
+stand-ins of ``brand.standins`` instead, which makes them reproducible.
+
+>>> results = run_benchmarks(
+...     scorers=['name_length'], generators=['from_list'], templates=[],
+...     scorer_size=100, memory=False,
+... )
+>>> results['scorers']['name_length']['n'], results['scorers']['name_length']['errors']
+(100, 0)
+>>> compare_results(results, results)
+[]
+"""
+
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import islice
+
+from brand import ratelimit
+from brand.metrics import _error_type, _rate
+from brand.pipeline import _iter_generate, _run_score, load_template, run_pipeline
+from brand.profiling import _start_tracing, _stop_tracing
+from brand.registry import generators as generator_registry
+from brand.registry import scorers as scorer_registry
+from brand.stages import Generate, Score
+from brand.standins import Service, StandIns
+
+DFLT_SCORER_SIZE = 2000
+DFLT_NETWORK_SIZE = 50
+DFLT_GENERATOR_LIMIT = 100_000
+DFLT_TEMPLATES = ("quick_screen", "research_company")
+DFLT_SIZES = (1_000, 10_000, 100_000)
+DFLT_THRESHOLD = 0.1
+
+# How the stand-ins behave in ``run_benchmarks(standins=True)``.
+STANDIN_SERVICE = Service(latency={"dist": "lognormal", "median": 0.02, "sigma": 0.5})
+
+_CONSONANTS = "bcdfghjklmnprstvwxz"
+_VOWELS = "aeiou"
+
+# Parameters the built-in generators are benchmarked with (from_list and
+# from_file get synthetic names; see _generator_params).
+GENERATOR_PARAMS = {
+    "cvcvcv": {},
+    "cvcvcv_filtered": {},
+    "pattern": {"pattern": "CVCCV"},
+    "english_words": {"pattern": "^[a-z]{4,8}$"},
+    "morpheme_combiner": {},
+    "ai_suggest": {"context": "a developer tool for data pipelines", "n": 30},
+}
+
+
+def synthetic_names(n: int, *, seed: int = 0) -> list[str]:
+    """*n* pronounceable, reproducible names of 4 to 8 letters.
+
+    >>> synthetic_names(3) == synthetic_names(3)
+    True
+    >>> all(4 <= len(name) <= 8 for name in synthetic_names(100))
+    True
+    """
+    rng = random.Random(seed)
+    names = []
+    for _ in range(n):
+        length = rng.randint(4, 8)
+        start = rng.randint(0, 1)
+        names.append(
+            "".join(
+                rng.choice(_CONSONANTS if (k + start) % 2 == 0 else _VOWELS)
+                for k in range(length)
+            )
+        )
+    return names
+
+
+def _max_rss() -> int | None:
+    """The process' resident-set high-water mark, in bytes (None if unknown)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _measure(func, *, memory: bool = True) -> tuple:
+    """Run *func* and return ``(its result, a record of its wall/CPU time)``.
+
+    With *memory*, *func* is run a second time under ``tracemalloc`` and the
+    record gets the ``peak_memory`` (bytes) of that run.
+    """
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = func()
+    record = {
+        "wall_time": time.perf_counter() - wall,
+        "cpu_time": time.process_time() - cpu,
+    }
+    if memory:
+        _start_tracing()
+        try:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            func()
+            record["peak_memory"] = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            _stop_tracing()
+    return result, record
+
+
+def _skipped(reason: str) -> dict:
+    return {"skipped": reason}
+
+
+# ---------------------------------------------------------------------------
+# Individual benchmarks
+# ---------------------------------------------------------------------------
+
+
+def bench_scorer(name: str, names: list[str], *, memory: bool = True) -> dict:
+    """Score *names* with scorer *name* alone (as a one-scorer Score stage)."""
+
+    def score():
+        candidates = [{"name": n, "scores": {}} for n in names]
+        return _run_score(Score([name]), candidates)
+
+    candidates, record = _measure(score, memory=memory)
+    errors = [_error_type(c["scores"].get(name)) for c in candidates]
+    return {
+        "n": len(names),
+        **record,
+        "throughput": _rate(len(names), record["wall_time"]),
+        "errors": sum(e is not None for e in errors),
+    }
+
+
+def _generator_params(name: str, names: list[str], tmpdir: str) -> dict | None:
+    if name == "from_list":
+        return {"names": names}
+    if name == "from_file":
+        path = os.path.join(tmpdir, "names.txt")
+        if not os.path.exists(path):
+            with open(path, "w") as f:
+                f.write("\n".join(names) + "\n")
+        return {"path": path}
+    return GENERATOR_PARAMS.get(name)
+
+
+def bench_generator(
+    name: str,
+    params: dict,
+    *,
+    limit: int = DFLT_GENERATOR_LIMIT,
+    memory: bool = True,
+) -> dict:
+    """Draw up to *limit* names from generator *name* called with *params*."""
+
+    def generate():
+        names = _iter_generate(Generate(name, params=params))
+        return sum(1 for _ in islice(names, limit))
+
+    try:
+        n, record = _measure(generate, memory=memory)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return {"n": n, **record, "throughput": _rate(n, record["wall_time"])}
+
+
+def bench_pipeline(
+    template: str,
+    names: list[str],
+    *,
+    stream: bool = False,
+    memory: bool = True,
+) -> dict:
+    """Run the *template* pipeline on *names*, in a throwaway project folder.
+
+    The record includes each stage's wall time (from ``final/metrics.json``).
+    """
+    with tempfile.TemporaryDirectory() as pipeline_dir:
+
+        def run():
+            return run_pipeline(
+                template,
+                names=names,
+                pipeline_dir=pipeline_dir,
+                stream=stream,
+                cache=False,
+            )
+
+        result, record = _measure(run, memory=memory)
+        with open(os.path.join(result["project_dir"], "final", "metrics.json")) as f:
+            stages = json.load(f)["stages"]
+    return {
+        "n": len(names),
+        "stream": stream,
+        **record,
+        "throughput": _rate(len(names), record["wall_time"]),
+        "survivors": len(result["candidates"]),
+        "stages": [
+            {"stage": s["stage"], "type": s["type"], "wall_time": s["wall_time"]}
+            for s in stages
+        ],
+    }
+
+
+def _template_needs_network(template: str) -> bool:
+    return any(
+        scorer_registry[spec if isinstance(spec, str) else spec[0]].requires_network
+        for stage in load_template(template)
+        if isinstance(stage, Score)
+        for spec in stage.scorers
+    )
+
+
+# ---------------------------------------------------------------------------
+# Suite
+# ---------------------------------------------------------------------------
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _meta() -> dict:
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run_benchmarks(
+    *,
+    scorers=None,
+    generators=None,
+    templates=DFLT_TEMPLATES,
+    sizes=DFLT_SIZES,
+    scorer_size: int = DFLT_SCORER_SIZE,
+    network_size: int = DFLT_NETWORK_SIZE,
+    generator_limit: int = DFLT_GENERATOR_LIMIT,
+    stream: bool = False,
+    network: bool = False,
+    standins=None,
+    memory: bool = True,
+    output: str | None = None,
+    verbose: bool = False,
+) -> dict:
+    """Run the benchmark suite; return (and optionally save) its results.
+
+    Parameters
+    ----------
+    scorers, generators : list[str] | None
+        Components to benchmark.  ``None`` means all registered ones.
+    templates : list[str]
+        Pipeline templates to run end to end, at each of *sizes* candidates.
+    scorer_size : int
+        Number of names each local scorer scores (*network_size* for network
+        scorers).
+    generator_limit : int
+        Maximum number of names drawn from each generator.
+    stream : bool
+        Also run each pipeline in streaming mode.
+    network : bool
+        Benchmark network components too (otherwise they're listed as
+        skipped).
+    standins : bool | StandIns | None
+        Benchmark network scorers and templates against local stand-ins
+        (``True`` for ``STANDIN_SERVICE`` everywhere, or a configured
+        ``brand.standins.StandIns``) rather than the real services.  The
+        client-side rate limits of ``brand.ratelimit`` are lifted meanwhile.
+    memory : bool
+        Measure ``tracemalloc`` peaks (runs everything twice).
+    output : str | None
+        Path of a JSON file to write the results to.
+    verbose : bool
+        Print each result as it comes.
+    """
+    results = {"meta": _meta(), "scorers": {}, "generators": {}, "pipelines": {}}
+
+    def report(section, key, record):
+        results[section][key] = record
+        if verbose:
+            print(_format_line(section, key, record), file=sys.stderr)
+
+    if standins is True:
+        standins = StandIns(default=STANDIN_SERVICE)
+    results["meta"]["standins"] = bool(standins)
+    remote = network or bool(standins)
+
+    with contextlib.ExitStack() as stack:
+        if standins:
+            stack.enter_context(standins)
+            stack.enter_context(ratelimit.use_rate_limits({}, replace=True))
+        names = synthetic_names(max([scorer_size, *sizes]))
+        for name in scorer_registry if scorers is None else scorers:
+            if scorer_registry[name].requires_network:
+                if not remote:
+                    report("scorers", name, _skipped("requires network"))
+                    continue
+                size = network_size
+            else:
+                size = scorer_size
+            report("scorers", name, bench_scorer(name, names[:size], memory=memory))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in generator_registry if generators is None else generators:
+                if generator_registry[name].requires_network and not network:
+                    report("generators", name, _skipped("requires network"))
+                    continue
+                params = _generator_params(name, names[:generator_limit], tmpdir)
+                if params is None:
+                    report("generators", name, _skipped("no benchmark parameters"))
+                    continue
+                record = bench_generator(
+                    name, params, limit=generator_limit, memory=memory
+                )
+                report("generators", name, record)
+
+        for template in templates:
+            needs_network = _template_needs_network(template)
+            for size in sizes:
+                for streaming in (False, True) if stream else (False,):
+                    key = f"{template}/{size}" + ("/stream" if streaming else "")
+                    if needs_network and not remote:
+                        report("pipelines", key, _skipped("requires network"))
+                        continue
+                    record = bench_pipeline(
+                        template,
+                        synthetic_names(size),
+                        stream=streaming,
+                        memory=memory,
+                    )
+                    report("pipelines", key, record)
+
+    results["meta"]["max_rss"] = _max_rss()
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Comparing runs
+# ---------------------------------------------------------------------------
+
+
+def _load(results) -> dict:
+    if isinstance(results, (str, os.PathLike)):
+        with open(results) as f:
+            return json.load(f)
+    return results
+
+
+def compare_results(old, new, *, threshold: float = DFLT_THRESHOLD) -> list[dict]:
+    """The regressions of *new* over *old* (results dicts or JSON paths).
+
+    A benchmark regresses if its throughput dropped, or its peak memory grew,
+    by more than *threshold* (a fraction).  Benchmarks missing or skipped in
+    either run are ignored.
+
+    >>> old = {'scorers': {'a': {'throughput': 100.0, 'peak_memory': 1000}}}
+    >>> new = {'scorers': {'a': {'throughput': 80.0, 'peak_memory': 1050}}}
+    >>> compare_results(old, new)
+    [{'section': 'scorers', 'name': 'a', 'metric': 'throughput', 'old': 100.0, 'new': 80.0, 'change': -0.2}]
+    """
+    old, new = _load(old), _load(new)
+    regressions = []
+    for section in ("scorers", "generators", "pipelines"):
+        for name, before in old.get(section, {}).items():
+            after = new.get(section, {}).get(name)
+            if after is None:
+                continue
+            for metric, sign in (("throughput", -1), ("peak_memory", 1)):
+                a, b = before.get(metric), after.get(metric)
+                if not a or b is None:
+                    continue
+                change = (b - a) / a
+                if sign * change > threshold:
+                    regressions.append(
+                        {
+                            "section": section,
+                            "name": name,
+                            "metric": metric,
+                            "old": a,
+                            "new": b,
+                            "change": round(change, 4),
+                        }
+                    )
+    return regressions
+
+
+def _format_line(section: str, key: str, record: dict) -> str:
+    label = f"{section[:-1]:<9} {key:<40}"
+    if "skipped" in record:
+        return f"{label} skipped ({record['skipped']})"
+    if "error" in record:
+        return f"{label} error: {' '.join(record['error'].split())[:80]}"
+    line = f"{label} {record['throughput'] or 0:>12,.0f} names/s"
+    if "peak_memory" in record:
+        line += f"  peak {record['peak_memory'] / 2**20:>8.1f} MiB"
+    if record.get("errors"):
+        line += f"  ({record['errors']} errors)"
+    return line
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+
+def _split(arg: str | None):
+    return None if arg is None else [s for s in arg.split(",") if s]
+
+
+def run(
+    *,
+    output: str = "benchmarks.json",
+    scorers: str | None = None,
+    generators: str | None = None,
+    templates: str = ",".join(DFLT_TEMPLATES),
+    sizes: str = ",".join(map(str, DFLT_SIZES)),
+    scorer_size: int = DFLT_SCORER_SIZE,
+    generator_limit: int = DFLT_GENERATOR_LIMIT,
+    stream: bool = False,
+    network: bool = False,
+    standins: bool = False,
+    no_memory: bool = False,
+):
+    """Run the benchmarks and write their results to *output*.
+
+    Lists are comma-separated, e.g. ``--sizes 1000,10000,100000,1000000``.
+    """
+    run_benchmarks(
+        scorers=_split(scorers),
+        generators=_split(generators),
+        templates=_split(templates),
+        sizes=[int(s) for s in _split(sizes)],
+        scorer_size=int(scorer_size),
+        generator_limit=int(generator_limit),
+        stream=stream,
+        network=network,
+        standins=standins,
+        memory=not no_memory,
+        output=output,
+        verbose=True,
+    )
+
+
+def compare(old: str, new: str, *, threshold: float = DFLT_THRESHOLD):
+    """Print the regressions of results file *new* over *old*; exit 1 if any."""
+    regressions = compare_results(old, new, threshold=float(threshold))
+    for r in regressions:
+        print(
+            f"{r['section'][:-1]:<9} {r['name']:<40} {r['metric']}: "
+            f"{r['old']:,.1f} -> {r['new']:,.1f} ({r['change']:+.0%})"
+        )
+    if regressions:
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    from argh import dispatch_commands
+
+    dispatch_commands([run, compare])
@@ -0,0 +1,201 @@
+"""Run budgets: wall-clock time, requests per service, estimated cost.
+
+``run_pipeline(..., budget=Budget(...))`` (or a dict of the same fields) caps
+what a run may spend:
+
+* ``seconds``: wall-clock time; once it's up, scorers are no longer called,
+* ``requests``: ``{host: count}``, the number of requests to each service
+  (hosts as in ``brand.ratelimit``: ``'github.com'``, ``'whois'``, ``'dns'``,
+  ``'api.anthropic.com'``, ...),
+* ``cost``: estimated dollars, from ``request_costs`` (dollars per request,
+  merged over ``DFLT_REQUEST_COSTS``) and, for LLM calls, the actual token
+  usage of each response.
+
+Every network request is charged to the active budget before it goes out
+(``charge``); one that would overspend raises ``BudgetExhausted``, so the
+scorer's result is ``{'error': 'BudgetExhausted: ...'}``.  Network scorers
+meanwhile serve candidates best-ranked first (by the aggregate of their scores
+so far), so a run cut short has spent its budget on its most promising
+candidates.  Like other error results, those are not journaled, and stages
+cut short are not reused by the stage cache: rerun with more budget to finish.
+
+>>> with use_budget({'requests': {'whois': 2}}) as tracker:
+...     charge('whois'); charge('whois')
+...     charge('whois')
+Traceback (most recent call last):
+  ...
+brand.budget.BudgetExhausted: whois requests (2)
+>>> tracker.usage()['requests']
+{'whois': {'limit': 2, 'used': 2}}
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+
+DFLT_REQUEST_COSTS = {  # estimated dollars per request, before actual usage
+    "api.anthropic.com": 0.01,
+}
+
+
+class BudgetExhausted(Exception):
+    """A run's budget doesn't allow a request (or any more scoring)."""
+
+
+@dataclass
+class Budget:
+    """Limits of one run (``None``: unlimited).  See the module docstring."""
+
+    seconds: float | None = None
+    requests: dict | None = None
+    cost: float | None = None
+    request_costs: dict | None = None
+
+    def to_dict(self) -> dict:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+    @classmethod
+    def from_dict(cls, d: dict):
+        return cls(**d)
+
+
+def as_budget(budget) -> Budget | None:
+    """A ``Budget`` from a ``Budget``, a dict of its fields, or None."""
+    if budget is None or isinstance(budget, Budget):
+        return budget
+    return Budget.from_dict(budget)
+
+
+class BudgetTracker:
+    """What a run has spent of its *budget* so far."""
+
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self.request_costs = {**DFLT_REQUEST_COSTS, **(budget.request_costs or {})}
+        self.requests = Counter()
+        self.cost = 0.0
+        self.exhausted = []  # reasons for which something was refused
+        self.stopped = None  # reason given to ``stop``, if any
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    def out_of_time(self) -> bool:
+        """Whether the wall-clock budget is spent (noting it if so)."""
+        if self.budget.seconds is None or self.elapsed < self.budget.seconds:
+            return False
+        self._refuse("time")
+        return True
+
+    def spent(self) -> str | None:
+        """Why nothing more may be scored (``'time'`` or the reason given to
+        ``stop``), or None."""
+        if self.stopped is not None:
+            return self.stopped
+        if self.out_of_time():
+            return "time"
+        return None
+
+    def stop(self, reason: str):
+        """Refuse all further requests and scoring: the run has what it needs."""
+        self.stopped = reason
+        self._refuse(reason)
+
+    def check(self, host: str):
+        """Raise ``BudgetExhausted`` if a request to *host* would be refused
+        now (without counting it)."""
+        if (reason := self.spent()) is not None:
+            raise BudgetExhausted(reason)
+        with self._lock:
+            self._check(host)
+
+    def charge(self, host: str):
+        """Count one request to *host*, or raise ``BudgetExhausted``."""
+        if (reason := self.spent()) is not None:
+            raise BudgetExhausted(reason)
+        with self._lock:
+            self._check(host)
+            self.requests[host] += 1
+            self.cost += self.request_costs.get(host, 0.0)
+
+    def _check(self, host: str):
+        limit = (self.budget.requests or {}).get(host)
+        if limit is not None and self.requests[host] >= limit:
+            raise self._refuse(f"{host} requests ({limit})")
+        estimate = self.request_costs.get(host, 0.0)
+        if self.budget.cost is not None and self.cost + estimate > self.budget.cost:
+            raise self._refuse(f"cost (${self.budget.cost})")
+
+    def settle(self, host: str, actual_cost: float):
+        """Replace the estimated cost of a request to *host* by its actual cost."""
+        with self._lock:
+            self.cost += actual_cost - self.request_costs.get(host, 0.0)
+
+    def _refuse(self, reason: str) -> BudgetExhausted:
+        if reason not in self.exhausted:
+            self.exhausted.append(reason)
+        return BudgetExhausted(reason)
+
+    def usage(self) -> dict:
+        """Limits and use of each budget, for ``final/metrics.json``."""
+        limits = self.budget.requests or {}
+        return {
+            "seconds": {"limit": self.budget.seconds, "used": self.elapsed},
+            "requests": {
+                host: {"limit": limits.get(host), "used": self.requests[host]}
+                for host in {**limits, **self.requests}
+            },
+            "cost": {"limit": self.budget.cost, "used": round(self.cost, 6)},
+            "exhausted": list(self.exhausted),
+        }
+
+
+# The tracker of the current run: a context variable, so that concurrent runs
+# (threads, coroutines) each have their own.  The pipeline's worker threads
+# and the asyncio engine run in a copy of the run's context.
+_active: contextvars.ContextVar = contextvars.ContextVar(
+    "brand_budget_tracker", default=None
+)
+
+
+def current_tracker() -> BudgetTracker | None:
+    """The tracker of the budget in force, if any."""
+    return _active.get()
+
+
+@contextlib.contextmanager
+def use_budget(budget):
+    """Enforce *budget* (in the current context) for the duration of a ``with``
+    block."""
+    budget = as_budget(budget)
+    tracker = BudgetTracker(budget) if budget is not None else None
+    token = _active.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _active.reset(token)
+
+
+def check(host: str):
+    """Raise ``BudgetExhausted`` if the active budget, if any, would refuse a
+    request to *host* now."""
+    if (tracker := _active.get()) is not None:
+        tracker.check(host)
+
+
+def charge(host: str):
+    """Charge one request to *host* to the active budget, if any."""
+    if (tracker := _active.get()) is not None:
+        tracker.charge(host)
+
+
+def settle(host: str, actual_cost: float):
+    """Record the actual cost of a request charged with ``charge``."""
+    if (tracker := _active.get()) is not None:
+        tracker.settle(host, actual_cost)
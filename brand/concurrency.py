@@ -0,0 +1,271 @@
+"""Adaptive per-scorer concurrency (AIMD).
+
+A network scorer can declare the range of calls it may have in flight::
+
+    @scorers.register('my_api', requires_network=True, concurrency=(2, 64))
+
+The engine (thread pool or asyncio) then starts at the low end and adjusts
+the limit as calls complete, the way TCP adjusts its congestion window:
+
+* each successful call adds ``1 / limit`` (about +1 per round of ``limit``
+  calls), or 1 while in *slow start*, which doubles the limit every round
+  until the first sign of congestion;
+* a sign of congestion multiplies the limit by ``decrease``, at most once per
+  round.  Signs are HTTP 429 and 5xx responses, timeouts and connection
+  errors (reported by ``note_status`` and ``note_overload`` from the lookup
+  primitives, or seen in error results), and a short-term average latency
+  above ``latency_tolerance`` times the long-term one.  Other errors (an
+  exhausted budget, a name a scorer rejects) say nothing about the service's
+  load: they count as neither success nor congestion.
+
+Limiters are kept per scorer for the life of the process (see
+``get_limiter``), so what is learned in one stage or chunk carries over to the
+next.  Per-host limits of the asyncio engine still apply on top.
+
+>>> limiter = AIMDLimiter(1, 8)
+>>> for _ in range(20):
+...     limiter.record(0.01, True)
+>>> limiter.limit
+8
+>>> limiter.record(0.01, {'error': 'ValueError: bad name'})
+>>> limiter.limit
+8
+>>> limiter.record(0.01, {'error': 'HTTPError: 429'})
+>>> limiter.limit
+4
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import math
+import re
+import threading
+
+from brand.metrics import _error_type
+
+DFLT_DECREASE = 0.5
+DFLT_LATENCY_TOLERANCE = 2.0
+_SHORT_ALPHA = 0.2
+_LONG_ALPHA = 0.02
+_WARMUP = 10
+
+# Error types (or parts of them) that are signs of congestion, and HTTP
+# statuses in error messages ("HTTPError: 503 ...", "github.com: HTTP 429")
+_OVERLOAD_ERRORS = (
+    "Timeout",
+    "Connect",  # ConnectionError, ConnectTimeout, ClientConnectorError, ...
+    "ServerDisconnected",
+    "RateLimit",
+    "Overloaded",
+    "ServiceUnavailable",
+    "InternalServerError",
+)
+_OVERLOAD_STATUS = re.compile(
+    r"(?:HTTP\w*|ClientResponseError|[Ss]tatus(?: code)?)\W+(?:429|5\d\d)\b"
+)
+
+_call_feedback: contextvars.ContextVar = contextvars.ContextVar(
+    "brand_call_feedback", default=None
+)
+
+
+class AIMDLimiter:
+    """Concurrency limit between *minimum* and *maximum*, adjusted by AIMD."""
+
+    def __init__(
+        self,
+        minimum: int,
+        maximum: int,
+        *,
+        decrease: float = DFLT_DECREASE,
+        latency_tolerance: float = DFLT_LATENCY_TOLERANCE,
+    ):
+        if not 1 <= minimum <= maximum:
+            raise ValueError(f"Need 1 <= minimum <= maximum, got {minimum, maximum}")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self._window = float(minimum)
+        self._slow_start = True
+        self._since_decrease = math.inf
+        self._samples = 0
+        self._short = self._long = None
+        self.peak = minimum
+        self.decreases = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._window)
+
+    def record(self, seconds: float, result, *, overloaded: bool = False):
+        """Adjust the limit after a call that took *seconds* and gave *result*."""
+        with self._lock:
+            self._samples += 1
+            self._since_decrease += 1
+            if self._short is None:
+                self._short = self._long = seconds
+            else:
+                self._short += _SHORT_ALPHA * (seconds - self._short)
+                self._long += _LONG_ALPHA * (seconds - self._long)
+            slow = (
+                self._samples > _WARMUP
+                and self._short > self.latency_tolerance * self._long
+            )
+            error = _error_type(result)
+            if overloaded or slow or is_overload_error(result):
+                self._back_off()
+            elif error is not None:
+                pass  # not the service's load: no sign either way
+            elif self._slow_start:
+                self._window = min(self.maximum, self._window + 1)
+            else:
+                self._window = min(self.maximum, self._window + 1 / self._window)
+            self.peak = max(self.peak, self.limit)
+
+    def _back_off(self):
+        self._slow_start = False
+        if self._since_decrease < self._window:
+            return  # already backed off this round
+        self._window = max(self.minimum, self._window * self.decrease)
+        self._since_decrease = 0
+        self.decreases += 1
+
+    def snapshot(self) -> dict:
+        """Current limit, highest limit reached, and number of back-offs."""
+        return {"limit": self.limit, "peak": self.peak, "decreases": self.decreases}
+
+
+def is_overload_error(result) -> bool:
+    """Whether *result* is an error result that is a sign of congestion.
+
+    >>> is_overload_error({'error': 'HTTPError: 503 Server Error'})
+    True
+    >>> is_overload_error({'error': 'Indeterminate: github.com: HTTP 429'})
+    True
+    >>> is_overload_error({'error': 'ReadTimeout: read timed out'})
+    True
+    >>> is_overload_error({'error': 'BudgetExhausted: max_cost reached'})
+    False
+    >>> is_overload_error({'error': 'ValueError: 500 is not a name'})
+    False
+    """
+    error = _error_type(result)
+    if error is None:
+        return False
+    return any(part in error for part in _OVERLOAD_ERRORS) or bool(
+        _OVERLOAD_STATUS.search(str(result["error"]))
+    )
+
+
+_limiters: dict[str, AIMDLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(scorer_name: str, concurrency: tuple) -> AIMDLimiter:
+    """The process-wide limiter of *scorer_name* (created on first use)."""
+    with _limiters_lock:
+        limiter = _limiters.get(scorer_name)
+        if limiter is None or (limiter.minimum, limiter.maximum) != tuple(
+            concurrency
+        ):
+            limiter = _limiters[scorer_name] = AIMDLimiter(*concurrency)
+        return limiter
+
+
+def limiter_snapshot(scorer_name: str) -> dict | None:
+    """``AIMDLimiter.snapshot`` of *scorer_name*'s limiter, if it has one."""
+    limiter = _limiters.get(scorer_name)
+    return None if limiter is None else limiter.snapshot()
+
+
+def reset_limiters():
+    """Forget what was learned (limits restart at the low end)."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+# ---------------------------------------------------------------------------
+# Congestion signals from lookup primitives
+# ---------------------------------------------------------------------------
+
+
+class _Feedback:
+    overloaded = False
+
+
+@contextlib.contextmanager
+def call_feedback():
+    """Collect the congestion signals noted during one scorer call."""
+    feedback = _Feedback()
+    token = _call_feedback.set(feedback)
+    try:
+        yield feedback
+    finally:
+        _call_feedback.reset(token)
+
+
+def note_overload():
+    """Report a sign of congestion (timeout, refused connection, ...)."""
+    feedback = _call_feedback.get()
+    if feedback is not None:
+        feedback.overloaded = True
+
+
+def note_status(status_code: int):
+    """Report an HTTP status; 429 and 5xx are signs of congestion."""
+    if status_code == 429 or status_code >= 500:
+        note_overload()
+
+
+# ---------------------------------------------------------------------------
+# Gates
+# ---------------------------------------------------------------------------
+
+
+class ThreadGate:
+    """Keep at most ``limiter.limit`` threads inside ``with gate:``."""
+
+    def __init__(self, limiter: AIMDLimiter):
+        self.limiter = limiter
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight < self.limiter.limit)
+            self._in_flight += 1
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+
+async def adaptive_map(afunc, items, limiter: AIMDLimiter):
+    """Await ``afunc(item)`` for every item with at most ``limiter.limit`` in
+    flight (re-read as calls complete)."""
+    it = iter(items)
+    cond = asyncio.Condition()
+    in_flight = 0
+    done = object()
+
+    async def worker():
+        nonlocal in_flight
+        while True:
+            async with cond:
+                await cond.wait_for(lambda: in_flight < limiter.limit)
+                item = next(it, done)
+                if item is done:
+                    return
+                in_flight += 1
+            try:
+                await afunc(item)
+            finally:
+                async with cond:
+                    in_flight -= 1
+                    cond.notify_all()
+
+    await asyncio.gather(*(worker() for _ in range(limiter.maximum)))
@@ -0,0 +1,176 @@
+"""DAG pipelines: shared upstream stages feeding several branches.
+
+A flat pipeline is a single chain of stages.  To compare alternatives (say a
+``.com``-mandatory shortlist and an ``.io``-acceptable one) from the same
+scored candidates, describe the pipeline as a DAG of named ``Node`` s instead:
+
+>>> from brand.stages import Generate, Score, Filter, Node
+>>> dag = {
+...     'scored': Node([
+...         Generate('from_list', params={'names': ['figiri', 'lumex', 'vox']}),
+...         Score(['name_length', 'syllables']),
+...     ]),
+...     'short': Node(Filter(rules={'name_length': {'op': '<=', 'value': 5}}), after='scored'),
+...     'catchy': Node(Filter(rules={'syllables': 2}), after='scored'),
+... }
+>>> results = run_dag(dag)
+>>> sorted(results['candidates'])
+['catchy', 'short']
+>>> [c['name'] for c in results['candidates']['short']]
+['lumex', 'vox']
+
+Each node runs once, however many nodes it feeds; nodes whose inputs are
+ready run concurrently (on threads).  Every node gets its own folder in the
+project (``<project>/<node>/stage_00_.../``), and stages are cached by
+fingerprint as in ``run_pipeline``, so adding a branch to an existing project
+only computes the new nodes.
+"""
+
+import contextvars
+import os
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from brand.executors import make_process_pool
+from brand.pipeline import _project_dir, _run_stages, _write_json
+from brand.stages import Node
+
+
+def _as_nodes(nodes: dict) -> dict[str, Node]:
+    """Normalize ``{name: Node | stage | [stages]}`` and validate the graph."""
+    nodes = {
+        name: node if isinstance(node, Node) else Node(node)
+        for name, node in nodes.items()
+    }
+    for name, node in nodes.items():
+        if node.after is not None and node.after not in nodes:
+            raise ValueError(f"Node {name!r} comes after unknown node {node.after!r}")
+    for name in nodes:
+        seen = {name}
+        parent = nodes[name].after
+        while parent is not None:
+            if parent in seen:
+                raise ValueError(f"Node {name!r} is part of a cycle")
+            seen.add(parent)
+            parent = nodes[parent].after
+    return nodes
+
+
+def _copy_candidates(candidates: list[dict]) -> list[dict]:
+    """Give a branch its own candidates, so sibling branches can't see its scores."""
+    return [{"name": c["name"], "scores": dict(c["scores"])} for c in candidates]
+
+
+def run_dag(
+    nodes: dict,
+    *,
+    names: list[str] | None = None,
+    context: str | None = None,
+    project_name: str | None = None,
+    pipeline_dir: str | None = None,
+    on_node_complete=None,
+    max_workers: int | None = None,
+    processes: int | None = None,
+    artifact_format=None,
+    cache: bool = True,
+):
+    """Execute a pipeline DAG.
+
+    Parameters
+    ----------
+    nodes : dict
+        ``{node_name: Node}``.  A bare stage or list of stages stands for a
+        root ``Node``.
+    names : list[str] | None
+        Candidate names fed to every root node (instead of a Generate stage).
+    context : str | None
+        Context string for AI generators.
+    project_name, pipeline_dir :
+        As for ``run_pipeline``.  The DAG definition is saved as ``dag.json``.
+    on_node_complete : callable | None
+        Callback ``(node_name, n_candidates)`` after each node.
+    max_workers : int | None
+        Maximum number of nodes running at the same time (default: all ready
+        nodes).
+    processes, artifact_format, cache :
+        As for ``run_pipeline``, applied to every node.
+
+    Returns
+    -------
+    dict
+        ``{'candidates': {leaf_node: [...]}, 'project_dir': str}``, with the
+        output of every leaf node (nodes no other node comes after).
+    """
+    nodes = _as_nodes(nodes)
+    children = defaultdict(list)
+    for name, node in nodes.items():
+        if node.after is not None:
+            children[node.after].append(name)
+
+    proj_dir = _project_dir(project_name, pipeline_dir=pipeline_dir)
+    _write_json(
+        os.path.join(proj_dir, "dag.json"),
+        {
+            "nodes": {name: node.to_dict() for name, node in nodes.items()},
+            "context": context,
+        },
+    )
+
+    pool = make_process_pool(processes) if processes else None
+
+    def run_node(name, candidates):
+        return _run_stages(
+            nodes[name].stages,
+            candidates,
+            proj_dir=_project_dir(name, pipeline_dir=proj_dir),
+            context=context,
+            pool=pool,
+            fmt=artifact_format,
+            cache=cache,
+        )
+
+    outputs = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or len(nodes) or 1) as ex:
+            running = {}
+
+            def submit(name):
+                parent = nodes[name].after
+                if parent is None:
+                    candidates = (
+                        [{"name": n, "scores": {}} for n in names]
+                        if names is not None
+                        else None
+                    )
+                else:
+                    candidates = _copy_candidates(outputs[parent])
+                # In a copy of this context: the budget, tracer and seen index
+                # in force around ``run_dag`` apply to its nodes too
+                context = contextvars.copy_context()
+                running[ex.submit(context.run, run_node, name, candidates)] = name
+
+            for name, node in nodes.items():
+                if node.after is None:
+                    submit(name)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outputs[name] = future.result()
+                    if on_node_complete:
+                        on_node_complete(name, len(outputs[name]))
+                    for child in children[name]:
+                        submit(child)
+                    if children[name]:
+                        del outputs[name]  # each child has its own copy
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    for name, candidates in outputs.items():
+        final_dir = os.path.join(proj_dir, name, "final")
+        os.makedirs(final_dir, exist_ok=True)
+        _write_json(os.path.join(final_dir, "results.json"), candidates)
+
+    return {"candidates": outputs, "project_dir": proj_dir}
@@ -0,0 +1,430 @@
+"""Sharded pipeline execution: one coordinator, workers on any number of hosts.
+
+The coordinator runs the pipeline as usual (Generate, Filters, artifacts,
+caching), except that Score stages are cut into shards of ``shard_size``
+candidates and put on a work queue served over plain TCP
+(``multiprocessing.connection``, authenticated with an ``authkey``).  Workers
+connect, pull shards, score them with the regular engine, and send them back.
+The coordinator reassembles shards in shard order, so the merged output is
+the same whichever worker scored which shard, and it always does so before the
+next stage (in particular before any ``top_n``/``top_pct`` Filter).
+
+Everything can run on one box:
+
+>>> from brand.stages import Score
+>>> results = run_distributed(
+...     [Score(['name_length'])], names=['figiri', 'lumex', 'vox'],
+...     local_workers=2, shard_size=2,
+... )
+>>> [c['scores']['name_length'] for c in results['candidates']]
+[6, 5, 3]
+
+On other hosts, start workers with::
+
+    python -m brand.distributed COORDINATOR_HOST:PORT --authkey SECRET
+
+Workers score with the scorers registered when ``brand`` is imported, so
+custom scorers must live in an importable module loaded on every host.
+"""
+
+import logging
+import os
+import secrets
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing import AuthenticationError, Process
+from multiprocessing.connection import Client, Listener
+
+from brand.executors import make_process_pool
+from brand.stages import stage_from_dict
+
+DFLT_SHARD_SIZE = 500
+DFLT_SHARD_TIMEOUT = 600
+_POLL_SECONDS = 1.0
+_ACCEPT_BACKOFF = (0.05, 5.0)  # first and longest wait after a failed accept()
+
+_log = logging.getLogger(__name__)
+
+
+def _parse_address(address) -> tuple[str, int]:
+    """``'host:port'`` or ``(host, port)`` to ``(host, port)``."""
+    if isinstance(address, str):
+        host, _, port = address.rpartition(":")
+        return host or "127.0.0.1", int(port)
+    host, port = address
+    return host, int(port)
+
+
+def _as_bytes(authkey) -> bytes:
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+# ---------------------------------------------------------------------------
+# Coordinator
+# ---------------------------------------------------------------------------
+
+
+class _WorkQueue:
+    """Shards waiting, shards out with a worker, and shard results."""
+
+    def __init__(self, shard_timeout: float | None):
+        self.shard_timeout = shard_timeout
+        self.closed = False
+        self._pending = deque()
+        self._out = {}  # key -> (task, time handed out)
+        self._results = {}  # key -> (candidates, error, scorer metrics)
+        self._cond = threading.Condition()
+
+    def submit(self, tasks: list[tuple]):
+        with self._cond:
+            self._pending.extend(tasks)
+            self._cond.notify_all()
+
+    def next_task(self, timeout: float):
+        """The next shard to hand out, or None if there is none for now."""
+        with self._cond:
+            self._requeue_overdue()
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            if self.closed or not self._pending:
+                return None
+            task = self._pending.popleft()
+            self._out[task[0]] = (task, time.monotonic())
+            return task
+
+    def _requeue_overdue(self):
+        if self.shard_timeout is None:
+            return
+        now = time.monotonic()
+        for key, (task, started) in list(self._out.items()):
+            if now - started > self.shard_timeout:
+                del self._out[key]
+                self._pending.append(task)
+
+    def requeue(self, key):
+        """Put back a shard whose worker went away."""
+        with self._cond:
+            if key in self._out:
+                self._pending.appendleft(self._out.pop(key)[0])
+                self._cond.notify_all()
+
+    def complete(self, key, candidates, error, scorers=None):
+        with self._cond:
+            if self._out.pop(key, None) is not None:  # ignore late duplicates
+                self._results[key] = (candidates, error, scorers or {})
+                self._cond.notify_all()
+
+    def gather(self, keys: list) -> list:
+        """Wait for the shards *keys*; return their ``(candidates, scorer
+        metrics)`` in *keys* order."""
+        with self._cond:
+            while not all(k in self._results for k in keys):
+                self._cond.wait(_POLL_SECONDS)
+                self._requeue_overdue()
+            results = [self._results.pop(k) for k in keys]
+        for key, (_, error, _) in zip(keys, results):
+            if error is not None:
+                raise RuntimeError(f"Shard {key} failed on a worker:\n{error}")
+        return [(candidates, scorers) for candidates, _, scorers in results]
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class Coordinator:
+    """Serve Score-stage shards to workers over TCP.
+
+    Parameters
+    ----------
+    address : str | tuple
+        ``(host, port)`` or ``'host:port'`` to listen on.  Port 0 picks a free
+        port (see ``.address``).  Listen on ``'0.0.0.0'`` to accept workers
+        from other hosts.
+    authkey : bytes | str | None
+        Shared secret workers must present.  Defaults to ``$BRAND_AUTHKEY``,
+        or to a random key (only usable by ``start_local_workers``).
+    shard_size : int
+        Candidates per shard.
+    shard_timeout : float | None
+        Seconds after which a shard still out with a worker is handed to
+        another one.  Results are keyed by shard, so duplicates are harmless.
+    """
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        *,
+        authkey=None,
+        shard_size: int = DFLT_SHARD_SIZE,
+        shard_timeout: float | None = DFLT_SHARD_TIMEOUT,
+    ):
+        authkey = authkey or os.environ.get("BRAND_AUTHKEY") or secrets.token_hex(16)
+        self.authkey = _as_bytes(authkey)
+        self.shard_size = shard_size
+        self._queue = _WorkQueue(shard_timeout)
+        self._listener = Listener(_parse_address(address), authkey=self.authkey)
+        self._n_stages = 0
+        self._workers = []
+        self._threads = []
+        self._accepter = threading.Thread(target=self._accept, daemon=True)
+        self._accepter.start()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._listener.address
+
+    def _accept(self):
+        delay = 0.0
+        while not self._queue.closed:
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError as e:
+                _log.warning("Rejected a worker: %s", e)
+                continue
+            except Exception as e:
+                if self._queue.closed:
+                    return  # ``close`` closed the listener
+                first, longest = _ACCEPT_BACKOFF
+                delay = min(longest, delay * 2 or first)
+                _log.warning(
+                    "accept() failed (%s: %s); retrying in %.2fs",
+                    type(e).__name__,
+                    e,
+                    delay,
+                )
+                time.sleep(delay)
+                continue
+            delay = 0.0
+            thread = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _serve(self, conn):
+        """Talk to one worker: answer each message with the next instruction."""
+        current = None
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] == "done":
+                    _, key, candidates, error, scorers = message
+                    self._queue.complete(key, candidates, error, scorers)
+                    current = None
+                task = self._queue.next_task(_POLL_SECONDS)
+                if self._queue.closed:
+                    conn.send(("stop",))
+                    return
+                if task is None:
+                    conn.send(("wait",))
+                else:
+                    current = task[0]
+                    conn.send(("task", *task))
+        except (EOFError, OSError):
+            if current is not None:
+                self._queue.requeue(current)
+        finally:
+            conn.close()
+
+    def score(
+        self, stage, candidates: list[dict], *, rules=None, metrics=None
+    ) -> list[dict]:
+        """Score *candidates* on the workers; a ``score`` hook for ``_run_stage``.
+
+        The workers' per-scorer metrics are merged into *metrics* (a
+        ``StageMetrics``): calls, latencies and errors add up, and so do
+        wall and CPU times, which are the workers' (shards run in parallel).
+        """
+        self._n_stages += 1
+        stage_dict = stage.to_dict()
+        shards = [
+            candidates[i : i + self.shard_size]
+            for i in range(0, len(candidates), self.shard_size)
+        ]
+        keys = [(self._n_stages, k) for k in range(len(shards))]
+        self._queue.submit(
+            [(key, stage_dict, rules, shard) for key, shard in zip(keys, shards)]
+        )
+        scored = []
+        for shard, scorers in self._queue.gather(keys):
+            scored += shard
+            if metrics is not None:
+                for name, scorer_metrics in scorers.items():
+                    metrics.scorer(name).merge(scorer_metrics)
+        return scored
+
+    def start_local_workers(self, n: int, *, processes: int | None = None):
+        """Start *n* worker processes on this machine."""
+        for _ in range(n):
+            worker = Process(
+                target=run_worker,
+                args=(self.address,),
+                kwargs={"authkey": self.authkey, "processes": processes},
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def close(self):
+        """Tell workers to stop and stop listening."""
+        self._queue.close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+
+def run_worker(address, *, authkey=None, processes: int | None = None) -> int:
+    """Pull shards from the coordinator at *address* until told to stop.
+
+    ``processes`` spreads CPU-bound local scorers over a process pool (see
+    ``run_pipeline``).  Returns the number of shards scored.
+    """
+    import brand  # noqa: F401  (registers the built-in scorers)
+    from brand.metrics import StageMetrics
+    from brand.pipeline import _run_score
+
+    authkey = _as_bytes(authkey or os.environ.get("BRAND_AUTHKEY", ""))
+    conn = Client(_parse_address(address), authkey=authkey)
+    pool = make_process_pool(int(processes)) if processes else None
+    n_shards = 0
+    try:
+        conn.send(("next",))
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break  # coordinator went away
+            if message[0] == "stop":
+                break
+            if message[0] == "wait":
+                conn.send(("next",))
+                continue
+            _, key, stage_dict, rules, candidates = message
+            try:
+                stage = stage_from_dict(stage_dict)
+                metrics = StageMetrics(None, "score")
+                candidates = _run_score(
+                    stage, candidates, pool=pool, rules=rules, metrics=metrics
+                )
+                conn.send(("done", key, candidates, None, metrics.scorers))
+                n_shards += 1
+            except Exception:
+                conn.send(("done", key, None, traceback.format_exc(), None))
+    finally:
+        conn.close()
+        if pool is not None:
+            pool.shutdown()
+    return n_shards
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def run_distributed(
+    stages,
+    *,
+    names: list[str] | None = None,
+    context: str | None = None,
+    project_name: str | None = None,
+    resume_from: int | None = None,
+    pipeline_dir: str | None = None,
+    on_stage_complete=None,
+    coordinator: Coordinator | None = None,
+    address=("127.0.0.1", 0),
+    authkey=None,
+    local_workers: int = 0,
+    shard_size: int = DFLT_SHARD_SIZE,
+    artifact_format=None,
+    delta: bool = False,
+    cache: bool = True,
+):
+    """Execute a pipeline with Score stages sharded across workers.
+
+    Same parameters and return value as ``run_pipeline`` (eager mode), plus:
+
+    Parameters
+    ----------
+    coordinator : Coordinator | None
+        An existing coordinator (whose workers may already be connected).
+        Otherwise one is created on *address* with *authkey* and
+        *shard_size*, and closed at the end of the run.
+    local_workers : int
+        Number of worker processes to start on this machine.  With 0, the
+        run waits for remote workers (``python -m brand.distributed``).
+    """
+    from brand.metrics import RunMetrics
+    from brand.pipeline import (
+        _prepare_project,
+        _resume_candidates,
+        _run_stages,
+        _write_json,
+    )
+
+    stages, proj_dir = _prepare_project(
+        stages, context=context, project_name=project_name, pipeline_dir=pipeline_dir
+    )
+    candidates = None
+    if resume_from is not None and resume_from > 0:
+        candidates = list(_resume_candidates(proj_dir, resume_from))
+    elif names is not None:
+        candidates = [{"name": n, "scores": {}} for n in names]
+
+    metrics = RunMetrics()
+    metrics.start()
+    own = coordinator is None
+    if own:
+        coordinator = Coordinator(address, authkey=authkey, shard_size=shard_size)
+    try:
+        if local_workers:
+            coordinator.start_local_workers(local_workers)
+        candidates = _run_stages(
+            stages,
+            candidates,
+            proj_dir=proj_dir,
+            start_idx=resume_from or 0,
+            context=context,
+            on_stage_complete=on_stage_complete,
+            fmt=artifact_format,
+            delta=delta,
+            cache=cache,
+            score=coordinator.score,
+            metrics=metrics,
+        )
+    finally:
+        if own:
+            coordinator.close()
+
+    final_dir = os.path.join(proj_dir, "final")
+    os.makedirs(final_dir, exist_ok=True)
+    _write_json(os.path.join(final_dir, "results.json"), candidates)
+    metrics.stop()
+    metrics.write(final_dir)
+
+    return {
+        "candidates": candidates,
+        "project_dir": proj_dir,
+        "stages_completed": len(stages),
+    }
+
+
+if __name__ == "__main__":
+    from argh import dispatch_command
+
+    dispatch_command(run_worker)
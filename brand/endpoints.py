@@ -0,0 +1,218 @@
+"""Where network scorers send their lookups.
+
+By default, scorers talk to the real services.  ``use_endpoints`` redirects
+them, typically to the local stand-ins of ``brand.standins``:
+
+* ``http``: base URL that every HTTP lookup (GitHub, PyPI, OpenCorporates,
+  Datamuse, the Anthropic API, ...) is sent to, as
+  ``<base>/<original host>/<original path>``,
+* ``dns``: ``(host, port)`` of a DNS server answering A queries over UDP,
+* ``whois``: ``(host, port)`` of a port-43 style WHOIS server.
+
+Hosts seen by tracing spans and by the asyncio engine's per-host limits stay
+the original ones.  The redirection is process-wide; worker processes pick it
+up from the ``BRAND_ENDPOINTS`` environment variable (a JSON object with the
+same keys).
+
+>>> with use_endpoints(http='http://127.0.0.1:8000'):
+...     http_url('https://pypi.org/project/lumex/')
+'http://127.0.0.1:8000/pypi.org/project/lumex/'
+>>> http_url('https://pypi.org/project/lumex/')
+'https://pypi.org/project/lumex/'
+"""
+
+import contextlib
+import json
+import os
+import random
+import socket
+import struct
+from urllib.parse import urlsplit
+
+ENDPOINTS_ENV_VAR = "BRAND_ENDPOINTS"
+_KEYS = ("http", "dns", "whois")
+_STANDIN_API_KEY = "stand-in"
+
+_endpoints: dict = {}
+
+
+def _parse_address(address) -> tuple[str, int]:
+    """``'host:port'`` or ``(host, port)`` to ``(host, port)``."""
+    if isinstance(address, str):
+        host, _, port = address.rpartition(":")
+        return host or "127.0.0.1", int(port)
+    host, port = address
+    return host, int(port)
+
+
+def _normalize(endpoints: dict) -> dict:
+    unknown = set(endpoints) - set(_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown endpoints {sorted(unknown)}; expected {_KEYS}")
+    out = {}
+    for key, value in endpoints.items():
+        if value is None:
+            continue
+        out[key] = value.rstrip("/") if key == "http" else _parse_address(value)
+    return out
+
+
+def set_endpoints(**endpoints):
+    """Redirect lookups (``http=``, ``dns=``, ``whois=``); ``None`` resets one."""
+    for key in endpoints:
+        _endpoints.pop(key, None)
+    _endpoints.update(_normalize(endpoints))
+
+
+def get_endpoints() -> dict:
+    """The current redirections."""
+    return dict(_endpoints)
+
+
+@contextlib.contextmanager
+def use_endpoints(**endpoints):
+    """Redirect lookups for the duration of a ``with`` block."""
+    previous = dict(_endpoints)
+    set_endpoints(**endpoints)
+    try:
+        yield get_endpoints()
+    finally:
+        _endpoints.clear()
+        _endpoints.update(previous)
+
+
+def _from_env():
+    value = os.environ.get(ENDPOINTS_ENV_VAR)
+    if value:
+        set_endpoints(**json.loads(value))
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+def http_url(url: str) -> str:
+    """The URL to actually request for *url*."""
+    base = _endpoints.get("http")
+    if base is None:
+        return url
+    parts = urlsplit(url)
+    return f"{base}/{parts.netloc}{parts.path or '/'}" + (
+        f"?{parts.query}" if parts.query else ""
+    )
+
+
+def anthropic_client_kwargs() -> dict:
+    """Extra ``anthropic.Anthropic(...)`` arguments for the current endpoints."""
+    base = _endpoints.get("http")
+    if base is None:
+        return {}
+    return {"base_url": f"{base}/api.anthropic.com", "api_key": _STANDIN_API_KEY}
+
+
+# ---------------------------------------------------------------------------
+# DNS
+# ---------------------------------------------------------------------------
+
+_RCODE_NXDOMAIN = 3
+
+
+def _dns_query(query_id: int, hostname: str) -> bytes:
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    labels = b"".join(
+        bytes([len(label)]) + label.encode("idna")
+        for label in hostname.rstrip(".").split(".")
+    )
+    return header + labels + b"\x00" + struct.pack("!HH", 1, 1)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:  # compression pointer
+            return offset + 2
+        offset += 1 + length
+        if length == 0:
+            return offset
+
+
+def _dns_answer(data: bytes, query_id: int, hostname: str) -> str:
+    """The first A record of a DNS response, or raise ``socket.gaierror``."""
+    rid, flags, qdcount, ancount = struct.unpack("!HHHH", data[:8])
+    if rid != query_id:
+        raise socket.gaierror(socket.EAI_AGAIN, f"Mismatched DNS reply for {hostname}")
+    rcode = flags & 0xF
+    if rcode == _RCODE_NXDOMAIN:
+        raise socket.gaierror(socket.EAI_NONAME, f"{hostname} does not resolve")
+    if rcode:
+        raise socket.gaierror(socket.EAI_AGAIN, f"DNS error {rcode} for {hostname}")
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        rtype, _, _, rdlength = struct.unpack("!HHIH", data[offset : offset + 10])
+        offset += 10
+        if rtype == 1 and rdlength == 4:
+            return socket.inet_ntoa(data[offset : offset + 4])
+        offset += rdlength
+    raise socket.gaierror(socket.EAI_NONAME, f"{hostname} has no A record")
+
+
+def gethostbyname(hostname: str, *, timeout: float = 3) -> str:
+    """Resolve *hostname* to an IPv4 address (``OSError`` if it doesn't)."""
+    server = _endpoints.get("dns")
+    if server is None:
+        old_timeout = socket.getdefaulttimeout()
+        try:
+            socket.setdefaulttimeout(timeout)
+            return socket.gethostbyname(hostname)
+        finally:
+            socket.setdefaulttimeout(old_timeout)
+    query_id = random.getrandbits(16)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(timeout)
+        sock.sendto(_dns_query(query_id, hostname), server)
+        data, _ = sock.recvfrom(512)
+    return _dns_answer(data, query_id, hostname)
+
+
+def getaddrinfo(hostname: str, port=None, *, timeout: float = 3) -> list:
+    """``socket.getaddrinfo``, through the DNS endpoint if one is set."""
+    if "dns" not in _endpoints:
+        return socket.getaddrinfo(hostname, port)
+    address = gethostbyname(hostname, timeout=timeout)
+    return [
+        (socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, port))
+    ]
+
+
+def has_dns_endpoint() -> bool:
+    return "dns" in _endpoints
+
+
+# ---------------------------------------------------------------------------
+# WHOIS
+# ---------------------------------------------------------------------------
+
+WHOIS_NO_MATCH = "No match for"
+
+
+def whois_endpoint() -> tuple[str, int] | None:
+    return _endpoints.get("whois")
+
+
+def whois_query(domain: str, *, timeout: float = 10) -> str:
+    """Raw reply of the WHOIS endpoint for *domain* (``ConnectionError`` if none)."""
+    with socket.create_connection(_endpoints["whois"], timeout=timeout) as sock:
+        sock.sendall(domain.encode("idna") + b"\r\n")
+        chunks = []
+        while chunk := sock.recv(4096):
+            chunks.append(chunk)
+    if not chunks:
+        raise ConnectionError(f"Empty WHOIS reply for {domain}")
+    return b"".join(chunks).decode("utf-8", "replace")
+
+
+_from_env()
@@ -0,0 +1,134 @@
+"""Process-pool execution backend for CPU-bound local scorers.
+
+Local scorers (``brandability``, ``pronunciation_entropy``,
+``sound_symbolism``, ...) are pure Python and CPU-bound, so threads don't help
+them.  This module spreads them over a pool of worker processes:
+
+* candidates are split into chunks, each chunk is scored in a worker, and
+  results are merged back in the original order;
+* scorers travel to workers as ``ComponentRef`` (registry name and
+  registering module), never as function objects: closures, such as the
+  scorers built by factories, can't be pickled.  Workers import the module
+  and look the name up again, so a factory-built scorer only works there if
+  its module registers it at import time (scorers defined in ``__main__``
+  are kept out of the pool, see ``is_process_safe``; ones registered later,
+  at run time, fail in the workers);
+* the pool lives for the whole pipeline run, and functions registered with
+  ``on_worker_start`` (loading the CMU dict, wordfreq tables, ...) run once
+  per worker rather than once per chunk.
+
+>>> from brand.registry import scorers
+>>> import brand._scorers  # noqa: F401
+>>> with make_process_pool(2) as pool:
+...     score_in_processes(pool, scorers.ref('name_length'), ['ab', 'abc'], {})
+[2, 3]
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from brand.registry import ComponentMeta, ComponentRef
+
+_worker_start_hooks: list = []
+
+MIN_NAMES_PER_CHUNK = 64
+MAX_NAMES_PER_CHUNK = 5000
+
+
+def on_worker_start(func):
+    """Register *func* to run once in every worker process when it starts.
+
+    Use it (as a decorator) to preload heavy resources that scorers would
+    otherwise load lazily on first use.  Failures are ignored: the scorer will
+    simply load (or fail) on demand.
+    """
+    _worker_start_hooks.append(func)
+    return func
+
+
+def _init_worker():
+    """Process-pool initializer: run every ``on_worker_start`` hook."""
+    import brand  # noqa: F401  (registers built-in scorers and their hooks)
+
+    for hook in _worker_start_hooks:
+        try:
+            hook()
+        except Exception:
+            pass
+
+
+def make_process_pool(processes: int | None = None) -> ProcessPoolExecutor:
+    """Create a process pool whose workers are warmed up by ``_init_worker``.
+
+    ``processes=None`` uses one worker per CPU.
+    """
+    return ProcessPoolExecutor(
+        max_workers=processes or os.cpu_count() or 1,
+        initializer=_init_worker,
+    )
+
+
+def is_process_safe(meta: ComponentMeta) -> bool:
+    """Whether a scorer can (and should) run in worker processes.
+
+    Network scorers are I/O-bound and stay on threads.  Scorers defined in
+    ``__main__`` can't be re-imported by spawned workers.
+    """
+    return (
+        meta.parallelizable
+        and not meta.requires_network
+        and getattr(meta.func, "__module__", "__main__") != "__main__"
+    )
+
+
+def _score_names(ref: ComponentRef, names: list[str], params: dict) -> list:
+    """Worker-side: score a chunk of names, turning exceptions into error dicts.
+
+    Returns ``(result, seconds)`` pairs.
+    """
+    func = ref.resolve().func
+    results = []
+    for name in names:
+        started = time.perf_counter()
+        try:
+            result = func(name, **params)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        results.append((result, time.perf_counter() - started))
+    return results
+
+
+def _chunk_size(n_names: int, n_workers: int) -> int:
+    """About four chunks per worker, within sensible bounds."""
+    size = math.ceil(n_names / (4 * max(1, n_workers)))
+    return max(MIN_NAMES_PER_CHUNK, min(MAX_NAMES_PER_CHUNK, size))
+
+
+def score_in_processes(
+    pool: ProcessPoolExecutor,
+    ref: ComponentRef,
+    names: list[str],
+    params: dict,
+    *,
+    observe=None,
+) -> list:
+    """Score *names* with the referenced scorer across *pool*'s workers.
+
+    Returns the results in the same order as *names*, so the merge is
+    deterministic regardless of which worker finishes first.  If given,
+    ``observe(seconds, result)`` is called with each call's duration (as
+    measured in the worker).
+    """
+    size = _chunk_size(len(names), getattr(pool, "_max_workers", os.cpu_count()))
+    chunks = [names[i : i + size] for i in range(0, len(names), size)]
+    results = []
+    for chunk_results in pool.map(
+        _score_names, [ref] * len(chunks), chunks, [params] * len(chunks)
+    ):
+        for result, seconds in chunk_results:
+            if observe:
+                observe(seconds, result)
+            results.append(result)
+    return results
@@ -0,0 +1,143 @@
+"""Append-only scoring journals, so interrupted Score stages resume mid-way.
+
+Stage artifacts are only written once a stage is done.  While a Score stage
+runs, every network scorer result is also appended to the stage's
+``journal.jsonl`` (one ``{"name", "scorer", "result"}`` record per line,
+flushed immediately).  If the run dies — rate limit, laptop sleep, Ctrl-C —
+rerunning the stage (e.g. with ``resume_from``) replays the journal and only
+scores what's missing.  The journal is removed once the stage's artifact is
+written.
+
+Error results (dicts with an ``'error'`` key) are not journaled, so they are
+retried on the next run.
+
+>>> import os, tempfile
+>>> path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+>>> with ScoreJournal(path) as journal:
+...     journal.record('figiri', 'dns_com', True)
+>>> cands = [{'name': 'figiri', 'scores': {}}, {'name': 'lumex', 'scores': {}}]
+>>> with ScoreJournal(path) as journal:
+...     todo = journal.replay(cands, 'dns_com')
+>>> [c['name'] for c in todo], cands[0]['scores']
+(['lumex'], {'dns_com': True})
+"""
+
+import json
+import os
+
+JOURNAL_FILENAME = "journal.jsonl"
+
+
+def _is_failure(result) -> bool:
+    return isinstance(result, dict) and "error" in result
+
+
+class ScoreJournal:
+    """Append-only journal of ``(name, scorer, result)`` records.
+
+    Parameters
+    ----------
+    path : str
+        The journal file.  Existing records are loaded; new ones are appended.
+    header : dict | None
+        What the journal is for (e.g. the stage's ``to_dict()``).  An existing
+        journal written with a different header is stale and is discarded.
+    """
+
+    def __init__(self, path: str, *, header: dict | None = None):
+        self.path = path
+        self._results = {}
+        self._truncated = False
+        fresh = not self._load(header)
+        self._f = open(path, "w" if fresh else "a")
+        if fresh:
+            self._write({"header": header})
+        elif self._truncated:
+            self._f.write("\n")  # terminate the line a crash cut short
+
+    def _load(self, header) -> bool:
+        """Load existing records; False if there is no usable journal."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            text = f.read()
+        lines = text.splitlines()
+        self._truncated = not text.endswith("\n")
+        # Compare as JSON would round-trip it (tuples become lists, ...)
+        expected = json.loads(json.dumps({"header": header}, default=str))
+        if not lines or _parse(lines[0]) != expected:
+            return False
+        for line in lines[1:]:
+            record = _parse(line)
+            if isinstance(record, dict) and "scorer" in record:
+                self._results[record["name"], record["scorer"]] = record["result"]
+        return True
+
+    def _write(self, record: dict):
+        self._f.write(json.dumps(record, default=str) + "\n")
+        self._f.flush()
+
+    def __contains__(self, key) -> bool:
+        return key in self._results
+
+    def __getitem__(self, key):
+        return self._results[key]
+
+    def __len__(self):
+        return len(self._results)
+
+    def record(self, name: str, scorer: str, result):
+        """Append one result (unless it's an error) and flush it to disk."""
+        if _is_failure(result) or (name, scorer) in self._results:
+            return
+        self._results[name, scorer] = result
+        self._write({"name": name, "scorer": scorer, "result": result})
+
+    def replay(self, candidates: list[dict], scorer: str) -> list[dict]:
+        """Fill in journaled *scorer* results; return the candidates left to score."""
+        todo = []
+        for cand in candidates:
+            key = (cand["name"], scorer)
+            if key in self._results:
+                cand["scores"][scorer] = self._results[key]
+            else:
+                todo.append(cand)
+        return todo
+
+    def recorder(self, scorer: str):
+        """A callback journaling a candidate's *scorer* result once it's in."""
+
+        def on_result(cand):
+            self.record(cand["name"], scorer, cand["scores"][scorer])
+
+        return on_result
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parse(line: str):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+def open_stage_journal(stage_path: str, stage) -> ScoreJournal:
+    """The journal of the Score *stage* persisted in *stage_path*."""
+    return ScoreJournal(
+        os.path.join(stage_path, JOURNAL_FILENAME), header={"stage": stage.to_dict()}
+    )
+
+
+def remove_stage_journal(stage_path: str):
+    """Delete *stage_path*'s journal (once the stage's artifact is written)."""
+    path = os.path.join(stage_path, JOURNAL_FILENAME)
+    if os.path.exists(path):
+        os.remove(path)
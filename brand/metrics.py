@@ -0,0 +1,296 @@
+"""Performance metrics of pipeline stages and scorers.
+
+Every stage folder gets a ``metrics.json`` with the stage's wall and CPU time,
+candidate counts and throughput, and, for Score stages, per-scorer figures:
+
+* ``calls``, ``wall_time``, ``cpu_time`` and ``throughput`` (calls per second
+  of the scorer's wall time),
+* ``latency`` — per-call ``mean``, ``p50``, ``p95``, ``p99`` and ``max``
+  seconds (percentiles from a histogram, to within about 2%, so that
+  metrics take constant memory however many candidates stream through),
+* ``mean_in_flight`` — total call time over wall time, i.e. how many calls
+  were in flight on average.  A network scorer whose ``mean_in_flight`` sits
+  at its concurrency cap is latency-bound; one well under it, with rising
+  latencies, is rate-bound on the remote side,
+* ``errors`` and ``error_types`` — results that are ``{'error': ...}`` dicts,
+  counted by exception type,
+* ``concurrency`` — for scorers with an adaptive concurrency range (see
+  ``brand.concurrency``), the limit at the end of the stage, the highest limit
+  reached, and the number of back-offs so far.
+
+``final/metrics.json`` rolls up the stages of the run and totals each scorer
+across them; a run with a ``budget`` also records each budget's limit and use
+(see ``brand.budget``), and one with a ``target`` whether it was reached.
+CPU times are those of the pipeline's process (all threads); CPU spent in
+``processes=`` workers isn't included.
+
+>>> m = StageMetrics(1, 'score')
+>>> sm = m.scorer('dns_com')
+>>> with sm.timed():
+...     sm.observe(0.25, True)
+...     sm.observe(0.5, {'error': 'TimeoutError: timed out'})
+>>> d = m.to_dict()['scorers']['dns_com']
+>>> d['calls'], d['errors'], d['error_types'], d['latency']['max']
+(2, 1, {'TimeoutError': 1}, 0.5)
+"""
+
+import contextlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+METRICS_FILENAME = "metrics.json"
+
+_ERROR_TYPE = re.compile(r"^([A-Za-z_][\w.]*)(?::|$)")
+
+
+_BUCKETS_PER_DOUBLING = 16  # histogram resolution: buckets about 4.4% wide
+_ZERO_BUCKET = -(2**31)  # for calls that took no measurable time
+
+
+class LatencyHistogram:
+    """Latencies in logarithmic buckets: constant memory, and mergeable.
+
+    The count, total and max are exact; percentiles are the geometric middle
+    of their bucket (capped by the max), so within about 2%.
+
+    >>> h = LatencyHistogram()
+    >>> for seconds in [0.1, 0.2, 0.3, 0.4]:
+    ...     h.add(seconds)
+    >>> h.count, h.max, round(h.percentile(50), 2), h.percentile(99)
+    (4, 0.4, 0.2, 0.4)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = None
+        self.buckets = Counter()
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = seconds if self.max is None else max(self.max, seconds)
+        if seconds > 0:
+            self.buckets[math.floor(math.log2(seconds) * _BUCKETS_PER_DOUBLING)] += 1
+        else:
+            self.buckets[_ZERO_BUCKET] += 1
+
+    def merge(self, other: "LatencyHistogram"):
+        self.count += other.count
+        self.total += other.total
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.buckets.update(other.buckets)
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank *q*-th percentile (None if there's no latency)."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * q / 100))
+        if rank == self.count:
+            return self.max
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                break
+        if bucket == _ZERO_BUCKET:
+            return 0.0
+        return min(self.max, 2 ** ((bucket + 0.5) / _BUCKETS_PER_DOUBLING))
+
+
+def _error_type(result) -> str | None:
+    """The exception type of an error result (``'TypeError: ...'``), if any.
+
+    >>> _error_type({'error': 'ConnectionError: refused'}), _error_type(3)
+    ('ConnectionError', None)
+    """
+    if not (isinstance(result, dict) and "error" in result):
+        return None
+    match = _ERROR_TYPE.match(str(result["error"]))
+    return match.group(1) if match else "error"
+
+
+def _rate(count: float, seconds: float) -> float | None:
+    return count / seconds if seconds > 0 else None
+
+
+class _Timer:
+    """Accumulated wall and CPU time over any number of start/stop spans."""
+
+    def __init__(self):
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self._started = None
+
+    def start(self):
+        self._started = (time.perf_counter(), time.process_time())
+
+    def stop(self):
+        if self._started is not None:
+            wall, cpu = self._started
+            self.wall_time += time.perf_counter() - wall
+            self.cpu_time += time.process_time() - cpu
+            self._started = None
+
+    @contextlib.contextmanager
+    def timed(self):
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+
+class ScorerMetrics(_Timer):
+    """Calls, latencies and errors of one scorer within a stage.
+
+    ``observe`` is thread-safe, so it can be called from thread pools and
+    event loops alike.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.latencies = LatencyHistogram()
+        self.error_types = Counter()
+        self.concurrency = None
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, result):
+        """Record one call that took *seconds* and returned *result*."""
+        error = _error_type(result)
+        with self._lock:
+            self.latencies.add(seconds)
+            if error is not None:
+                self.error_types[error] += 1
+
+    def __getstate__(self):  # picklable, to come back from distributed workers
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def merge(self, other: "ScorerMetrics"):
+        """Add *other*'s figures to these ones (e.g. across stages or shards)."""
+        self.wall_time += other.wall_time
+        self.cpu_time += other.cpu_time
+        self.latencies.merge(other.latencies)
+        self.error_types.update(other.error_types)
+        self.concurrency = other.concurrency or self.concurrency
+
+    def to_dict(self) -> dict:
+        latencies = self.latencies
+        calls, total = latencies.count, latencies.total
+        return {
+            "calls": calls,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "throughput": _rate(calls, self.wall_time),
+            "latency": {
+                "mean": total / calls if calls else None,
+                "p50": latencies.percentile(50),
+                "p95": latencies.percentile(95),
+                "p99": latencies.percentile(99),
+                "max": latencies.max,
+            },
+            "mean_in_flight": _rate(total, self.wall_time),
+            "errors": sum(self.error_types.values()),
+            "error_types": dict(self.error_types),
+            "concurrency": self.concurrency,
+        }
+
+
+class StageMetrics(_Timer):
+    """Times and counts of one stage, and metrics of each of its scorers."""
+
+    def __init__(self, stage_index: int, stage_type: str):
+        super().__init__()
+        self.stage_index = stage_index
+        self.stage_type = stage_type
+        self.candidates_in = None
+        self.candidates_out = None
+        self.scorers: dict[str, ScorerMetrics] = {}
+
+    def scorer(self, name: str) -> ScorerMetrics:
+        """The metrics of scorer *name* (created on first use)."""
+        if name not in self.scorers:
+            self.scorers[name] = ScorerMetrics()
+        return self.scorers[name]
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.stage_index,
+            "type": self.stage_type,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "candidates_in": self.candidates_in,
+            "candidates_out": self.candidates_out,
+            "throughput": _rate(self.candidates_in or 0, self.wall_time),
+            "scorers": {name: m.to_dict() for name, m in self.scorers.items()},
+        }
+
+    def write(self, stage_path: str):
+        """Write ``metrics.json`` into *stage_path*."""
+        os.makedirs(stage_path, exist_ok=True)
+        with open(os.path.join(stage_path, METRICS_FILENAME), "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class RunMetrics(_Timer):
+    """The stages of one run, for ``final/metrics.json``.
+
+    Stages reused from an earlier run (see ``run_pipeline``'s ``cache``) are
+    listed with ``"reused": true`` and the metrics of the run that computed
+    them, but don't count towards the scorer totals.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stages = []
+        self.budget = None  # ``BudgetTracker.usage()`` of a budgeted run
+        self.target = None  # ``{'count': K, 'reached': bool}`` of a target run
+
+    def add(self, stage_metrics: StageMetrics):
+        self.stages.append(stage_metrics)
+
+    def add_reused(self, stage_path: str):
+        path = os.path.join(stage_path, METRICS_FILENAME)
+        record = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                record = json.load(f)
+        self.stages.append({**record, "reused": True})
+
+    def to_dict(self) -> dict:
+        totals = {}
+        for stage in self.stages:
+            if isinstance(stage, StageMetrics):
+                for name, m in stage.scorers.items():
+                    totals.setdefault(name, ScorerMetrics()).merge(m)
+        out = {
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "stages": [
+                s.to_dict() if isinstance(s, StageMetrics) else s for s in self.stages
+            ],
+            "scorers": {name: m.to_dict() for name, m in totals.items()},
+        }
+        if self.budget is not None:
+            out["budget"] = self.budget
+        if self.target is not None:
+            out["target"] = self.target
+        return out
+
+    def write(self, final_dir: str):
+        """Write the roll-up ``metrics.json`` into *final_dir*."""
+        os.makedirs(final_dir, exist_ok=True)
+        with open(os.path.join(final_dir, METRICS_FILENAME), "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
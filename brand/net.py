@@ -0,0 +1,55 @@
+"""Blocking network primitives for (sync) scorers.
+
+The sync twin of ``brand.aio``'s ``http_get``: every HTTP lookup made by a
+scorer goes through ``http_get``, which
+
+* waits for a token of the host's rate limit (``brand.ratelimit``),
+* sends it where ``brand.endpoints`` says (the real service, or a stand-in),
+* records it as an ``http`` tracing span (host, status, bytes),
+* reports 429/5xx responses, timeouts and connection errors to the adaptive
+  concurrency control (``brand.concurrency``),
+* retries those with backoff, under the host's circuit breaker, and raises
+  ``brand.resilience.Indeterminate`` if they persist (``brand.resilience``).
+"""
+
+from urllib.parse import urlsplit
+
+import requests
+
+from brand import concurrency, endpoints, ratelimit, resilience, tracing
+
+
+def http_get(
+    url: str,
+    *,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float = 10,
+    allow_redirects: bool = True,
+) -> requests.Response:
+    """GET *url*, retrying network failures, 429 and 5xx responses.
+
+    Raises ``brand.resilience.Indeterminate`` if they persist.
+    """
+    host = urlsplit(url).netloc
+
+    def attempt():
+        ratelimit.acquire(host)
+        with tracing.span("http", host=host, url=url) as span:
+            try:
+                r = requests.get(
+                    endpoints.http_url(url),
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                    allow_redirects=allow_redirects,
+                )
+            except requests.RequestException as e:
+                concurrency.note_overload()
+                raise resilience.Retryable(f"{type(e).__name__}: {e}") from e
+            tracing.set_response(span, r)
+        concurrency.note_status(r.status_code)
+        resilience.check_status(r.status_code, r.headers)
+        return r
+
+    return resilience.call(host, attempt)
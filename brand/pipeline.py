@@ -6,17 +6,81 @@ and narrows them.
 
 Every run creates a project folder with intermediate artifacts at each stage,
 allowing inspection, resumption, and branching.
+
+Two execution modes are available:
+
+* **eager** (default) — every stage receives and returns a fully materialized
+  ``list[dict]`` of candidates.
+* **streaming** (``run_pipeline(..., stream=True)`` or ``iter_pipeline``) —
+  candidates flow lazily from stage to stage.  Generate yields names one by
+  one, Score stages work on chunks of ``chunk_size`` candidates, and rule-only
+  Filters pass candidates through as iterators.  ``top_n`` Filters keep a
+  bounded heap and ``top_pct`` Filters spill to disk, so memory depends on the
+  chunk size and on ``top_n`` rather than on the size of the candidate space.
+* **pipelined** (``pipelined=True``) — streaming, with every stage running on
+  its own thread and handing candidates to the next one through a bounded
+  queue.  A candidate that passes a rule-only Filter reaches the next Score
+  stage while the previous Score stage is still working, so a chain of
+  network checks takes about as long as its slowest stage rather than the sum
+  of all of them.  Full queues block the stage feeding them (backpressure).
+
+With ``delta=True`` (eager mode), stage folders only hold what each stage
+added: a Score stage its new score columns, a Filter stage the positions of
+its survivors.  ``_iter_stage_candidates`` rebuilds full candidates on demand
+by replaying the deltas over the previous stages.
+
+Eager runs are also cached like a build: each stage folder records a
+fingerprint of the stage definition and of its input candidates, and a rerun
+of the same project reuses any stage whose fingerprint hasn't changed.
 """
 
+import contextlib
+import contextvars
+import hashlib
+import heapq
+import itertools
 import json
 import os
 import math
+import pickle
+import queue
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator, Mapping, Sized
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from brand.aio import in_event_loop, score_candidates_blocking
+from brand import concurrency, resilience, seen, tracing
+from brand.budget import Budget, current_tracker, use_budget
+from brand.artifacts import (
+    find_format,
+    get_format,
+    open_writer,
+    read_candidates,
+    remove_other_formats,
+)
 from brand.config import PIPELINES_DIR
+from brand.journal import open_stage_journal, remove_stage_journal
+from brand.metrics import RunMetrics, StageMetrics
+from brand.profiling import StageProfiler, as_profile
+from brand.executors import (
+    MIN_NAMES_PER_CHUNK,
+    is_process_safe,
+    make_process_pool,
+    score_in_processes,
+)
 from brand.registry import scorers as scorer_registry, generators as generator_registry
 from brand.stages import Generate, Score, Filter, stages_to_dicts, stages_from_dicts
+from brand.table import CandidateTable
+
+DFLT_CHUNK_SIZE = 1000
+DFLT_QUEUE_SIZE = 1000
+DFLT_SHUFFLE_BUFFER = 1_000_000
+DELTA_MANIFEST = "delta.json"
+FINGERPRINT_FILENAME = "fingerprint.json"
 
 
 # ---------------------------------------------------------------------------
@@ -34,10 +98,13 @@ def _project_dir(project_name: str | None, *, pipeline_dir: str | None = None) -
     return path
 
 
+def _stage_dirname(stage_index: int, stage_type: str) -> str:
+    return f"stage_{stage_index:02d}_{stage_type}"
+
+
 def _stage_dir(project_path: str, stage_index: int, stage_type: str) -> str:
     """Create and return the directory for a specific stage."""
-    dirname = f"stage_{stage_index:02d}_{stage_type}"
-    path = os.path.join(project_path, dirname)
+    path = os.path.join(project_path, _stage_dirname(stage_index, stage_type))
     os.makedirs(path, exist_ok=True)
     return path
 
@@ -45,7 +112,14 @@ def _stage_dir(project_path: str, stage_index: int, stage_type: str) -> str:
 def _write_json(path: str, data):
     """Write data as pretty-printed JSON."""
     with open(path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+        json.dump(data, f, indent=2, default=_json_default)
+
+
+def _json_default(obj):
+    """Serialize candidate tables as records, anything else as ``str``."""
+    if isinstance(obj, CandidateTable):
+        return obj.to_dicts()
+    return str(obj)
 
 
 def _read_json(path: str):
@@ -54,13 +128,123 @@ def _read_json(path: str):
         return json.load(f)
 
 
+def _find_stage_dir(project_path: str, stage_index: int) -> str | None:
+    """Return the existing directory of stage *stage_index*, or None."""
+    prefix = f"stage_{stage_index:02d}_"
+    dirs = sorted(d for d in os.listdir(project_path) if d.startswith(prefix))
+    return os.path.join(project_path, dirs[0]) if dirs else None
+
+
+def _iter_stage_candidates(stage_path: str, *, columns=None) -> Iterator[dict]:
+    """Lazily load the candidates persisted in a stage directory.
+
+    Works with any artifact format (see ``brand.artifacts``), including the
+    eager ``results.json`` layouts (a candidate list, a filter
+    ``{'candidates': [...]}`` dict, or a generate ``{'names': [...]}`` dict),
+    and with delta artifacts, which are replayed over their base stage.
+    """
+    manifest_path = os.path.join(stage_path, DELTA_MANIFEST)
+    if os.path.exists(manifest_path):
+        return _iter_delta_candidates(
+            stage_path, _read_json(manifest_path), columns=columns
+        )
+    return read_candidates(stage_path, columns=columns)
+
+
+def _iter_delta_candidates(
+    stage_path: str, manifest: dict, *, columns=None
+) -> Iterator[dict]:
+    """Rebuild full candidates from a delta artifact and its base stage."""
+    base = manifest["base"]
+    base_path = os.path.join(os.path.dirname(stage_path), base) if base else None
+
+    if manifest["kind"] == "filter":
+        indices = manifest["indices"]
+        previous = _iter_stage_candidates(base_path, columns=columns)
+        if indices == sorted(indices):
+            # Order-preserving filter: pick survivors in one pass
+            wanted = iter(indices)
+            target = next(wanted, None)
+            for k, cand in enumerate(previous):
+                if k == target:
+                    yield cand
+                    target = next(wanted, None)
+        else:
+            previous = list(previous)
+            for k in indices:
+                yield previous[k]
+        return
+
+    added = read_candidates(stage_path, columns=columns)
+    if base_path is None:
+        yield from added
+        return
+    for cand, new in zip(_iter_stage_candidates(base_path, columns=columns), added):
+        cand["scores"].update(new["scores"])
+        yield cand
+
+
+def _has_stage_artifact(stage_path: str) -> bool:
+    """Whether *stage_path* holds a loadable candidates artifact."""
+    return find_format(stage_path) is not None or os.path.exists(
+        os.path.join(stage_path, DELTA_MANIFEST)
+    )
+
+
+def _persist_stream(
+    candidates: Iterable[dict],
+    stage_path: str,
+    *,
+    fmt="jsonl",
+    summary: dict | None = None,
+    on_done=None,
+) -> Iterator[dict]:
+    """Write candidates to a *fmt* artifact (``results.jsonl``) as they flow.
+
+    Each candidate is snapshotted at the moment it passes, so later stages may
+    freely mutate it.  Once the stream is exhausted, a ``summary.json`` with
+    the final count is written and ``on_done(count, stopped=False)`` is
+    called.  If the consumer stops early (closes the stream), the upstream
+    stream is closed too and the same is done, with ``'stopped': True`` in the
+    summary and ``stopped=True``.
+    """
+    count = 0
+    stopped = {}
+    candidates = iter(candidates)
+    with open_writer(stage_path, fmt) as writer:
+        try:
+            for cand in candidates:
+                writer.write(cand)
+                count += 1
+                yield cand
+        except GeneratorExit:
+            if hasattr(candidates, "close"):
+                candidates.close()
+            stopped["stopped"] = True
+    _write_json(
+        os.path.join(stage_path, "summary.json"),
+        {**(summary or {}), **stopped, "count": count},
+    )
+    if on_done:
+        on_done(count, stopped=bool(stopped))
+
+
+def _persist_candidates(
+    candidates: Iterable[dict], stage_path: str, *, fmt, summary: dict
+):
+    """Write a stage's candidates in *fmt*, plus its ``summary.json``."""
+    with open_writer(stage_path, fmt) as writer:
+        writer.write_many(candidates)
+    _write_json(os.path.join(stage_path, "summary.json"), summary)
+
+
 # ---------------------------------------------------------------------------
 # Stage execution
 # ---------------------------------------------------------------------------
 
 
-def _run_generate(stage: Generate, *, context: str | None = None) -> list[str]:
-    """Execute a Generate stage, returning a list of candidate names."""
+def _iter_generate(stage: Generate, *, context: str | None = None) -> Iterator[str]:
+    """Execute a Generate stage lazily, yielding candidate names."""
     gen_meta = generator_registry[stage.generator]
     params = dict(stage.params)
 
@@ -68,40 +252,332 @@ def _run_generate(stage: Generate, *, context: str | None = None) -> list[str]:
     if context and "context" in gen_meta.func.__code__.co_varnames:
         params.setdefault("context", context)
 
-    result = gen_meta.func(**params)
-    # Materialize iterables
-    return list(result)
+    names = iter(gen_meta.func(**params))
+    if stage.seen is not None:
+        names = seen.select(names, stage.seen)
+    return names
+
+
+def _run_generate(stage: Generate, *, context: str | None = None) -> list[str]:
+    """Execute a Generate stage, returning a list of candidate names."""
+    return list(_iter_generate(stage, context=context))
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Split *iterable* into lists of at most *size* items.
+
+    >>> list(_chunked(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    """
+    it = iter(iterable)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
 
 
 def _run_score(
     stage: Score,
     candidates: list[dict],
+    *,
+    pool=None,
+    rules: dict | None = None,
+    journal=None,
+    metrics: StageMetrics | None = None,
+    profiler: StageProfiler | None = None,
 ) -> list[dict]:
-    """Execute a Score stage, enriching each candidate's scores dict."""
-    for scorer_spec in stage.scorers:
-        if isinstance(scorer_spec, str):
-            scorer_name, scorer_params = scorer_spec, {}
-        else:
-            scorer_name, scorer_params = scorer_spec
+    """Execute a Score stage, enriching each candidate's scores dict.
+
+    Scorers run cheapest first (see ``_ordered_scorer_specs``).  If *rules*
+    (those of the following Filter) are given, candidates are checked against
+    them as soon as the scorers they involve have run, and candidates that
+    already fail are not passed to the remaining (more expensive) scorers.
+    Such candidates are still returned — with the skipped scores absent — and
+    the Filter then drops them.
+
+    Network scorers with an async variant run on the asyncio engine (see
+    ``brand.aio``), unless we're already inside an event loop, in which case
+    they fall back to a thread pool.  If a process *pool* is given, CPU-bound
+    local scorers are spread across its workers (see ``brand.executors``).
+
+    With a *journal* (see ``brand.journal``), network scorer results already
+    journaled are reused, and new ones are journaled as they arrive.  Scorer
+    calls are timed into the stage's *metrics* (see ``brand.metrics``).  With
+    a *profiler* (see ``brand.profiling``), its sample of the candidates is
+    scored inline, under the profiler.
+    """
+    if metrics is None:
+        metrics = StageMetrics(None, "score")
+    if isinstance(candidates, CandidateTable):
+        return _run_score_table(
+            stage,
+            candidates,
+            pool=pool,
+            rules=rules,
+            journal=journal,
+            metrics=metrics,
+            profiler=profiler,
+        )
 
+    specs = _ordered_scorer_specs(stage)
+    alive = candidates
+
+    for k, (scorer_name, scorer_params) in enumerate(specs):
+        if not alive:
+            break
         scorer_meta = scorer_registry[scorer_name]
+        scorer_metrics = metrics.scorer(scorer_name)
+        observe = scorer_metrics.observe
+
+        todo, on_result = alive, None
+        if journal is not None and scorer_meta.requires_network:
+            todo = journal.replay(alive, scorer_name)
+            on_result = journal.recorder(scorer_name)
+        todo = _within_budget(todo, scorer_name, scorer_meta)
+
+        with tracing.span(
+            "scorer", scorer=scorer_name, candidates=len(todo)
+        ), scorer_metrics.timed():
+            if profiler is not None and todo:
+                sampled, todo = profiler.split(todo)
+                with profiler.span(scorer_name):
+                    _score_inline(
+                        sampled,
+                        scorer_name,
+                        scorer_meta,
+                        scorer_params,
+                        on_result=on_result,
+                        observe=observe,
+                    )
+            if todo:
+                _score_batch(
+                    todo,
+                    scorer_name,
+                    scorer_meta,
+                    scorer_params,
+                    pool=pool,
+                    on_result=on_result,
+                    observe=observe,
+                )
+        scorer_metrics.concurrency = concurrency.limiter_snapshot(scorer_name)
 
-        # Decide parallelism
-        if scorer_meta.parallelizable and scorer_meta.requires_network:
-            candidates = _score_parallel(
-                candidates, scorer_name, scorer_meta, scorer_params
-            )
-        else:
-            for cand in candidates:
-                try:
-                    result = scorer_meta.func(cand["name"], **scorer_params)
-                except Exception as e:
-                    result = {"error": f"{type(e).__name__}: {e}"}
-                cand["scores"][scorer_name] = result
+        if rules and k + 1 < len(specs):
+            alive = _prune(alive, rules, pending={n for n, _ in specs[k + 1 :]})
 
     return candidates
 
 
+def _within_budget(todo: list[dict], scorer_name: str, scorer_meta) -> list[dict]:
+    """The candidates to score, in order, under the run's budget (if any).
+
+    Once the time budget is up (or the run was stopped, see ``_take``), none:
+    their results are ``BudgetExhausted`` errors.  Network scorers otherwise
+    serve the best-ranked candidates (by aggregate score so far) first, so
+    whatever budget remains is spent on the most promising ones.
+    """
+    tracker = current_tracker()
+    if tracker is None:
+        return todo
+    if (reason := tracker.spent()) is not None:
+        for cand in todo:
+            cand["scores"][scorer_name] = {"error": f"BudgetExhausted: {reason}"}
+        return []
+    if scorer_meta.requires_network:
+        return sorted(todo, key=lambda c: -_compute_aggregate(c["scores"]))
+    return todo
+
+
+def _score_batch(
+    candidates: list[dict],
+    scorer_name: str,
+    scorer_meta,
+    scorer_params: dict,
+    *,
+    pool=None,
+    on_result=None,
+    observe=None,
+):
+    """Score candidates with one scorer, on the executor that suits it."""
+    if scorer_meta.afunc is not None and not in_event_loop():
+        score_candidates_blocking(
+            candidates,
+            scorer_name,
+            scorer_params,
+            on_result=on_result,
+            observe=observe,
+        )
+    elif scorer_meta.parallelizable and scorer_meta.requires_network:
+        _score_parallel(
+            candidates,
+            scorer_name,
+            scorer_meta,
+            scorer_params,
+            on_result=on_result,
+            observe=observe,
+        )
+    elif (
+        pool is not None
+        and len(candidates) > MIN_NAMES_PER_CHUNK
+        and is_process_safe(scorer_meta)
+    ):
+        results = score_in_processes(
+            pool,
+            scorer_registry.ref(scorer_name),
+            [cand["name"] for cand in candidates],
+            scorer_params,
+            observe=observe,
+        )
+        for cand, result in zip(candidates, results):
+            cand["scores"][scorer_name] = result
+    else:
+        _score_inline(
+            candidates,
+            scorer_name,
+            scorer_meta,
+            scorer_params,
+            on_result=on_result,
+            observe=observe,
+        )
+
+
+def _score_inline(
+    candidates: list[dict],
+    scorer_name: str,
+    scorer_meta,
+    scorer_params: dict,
+    *,
+    on_result=None,
+    observe=None,
+):
+    """Score candidates one by one in this thread."""
+    for cand in candidates:
+        started = time.perf_counter()
+        try:
+            with tracing.span("call", scorer=scorer_name, candidate=cand["name"]):
+                result = scorer_meta.func(cand["name"], **scorer_params)
+        except Exception as e:
+            result = {"error": f"{type(e).__name__}: {e}"}
+        if observe:
+            observe(time.perf_counter() - started, result)
+        cand["scores"][scorer_name] = result
+        if on_result:
+            on_result(cand)
+
+
+_COST_RANK = {"cheap": 0, "moderate": 1, "expensive": 2}
+_LATENCY_RANK = {"fast": 0, "medium": 1, "slow": 2}
+
+
+def _scorer_specs(stage: Score) -> list[tuple[str, dict]]:
+    """Normalize a Score stage's scorers to ``(name, params)`` pairs."""
+    return [
+        (spec, {}) if isinstance(spec, str) else tuple(spec) for spec in stage.scorers
+    ]
+
+
+def _scorer_cost_key(scorer_name: str) -> tuple:
+    """Sort key ranking scorers by declared cost, then latency, then network."""
+    meta = scorer_registry[scorer_name]
+    return (
+        _COST_RANK.get(meta.cost, 1),
+        _LATENCY_RANK.get(meta.latency, 1),
+        meta.requires_network,
+    )
+
+
+def _ordered_scorer_specs(stage: Score) -> list[tuple[str, dict]]:
+    """The stage's scorers, cheapest first (stable for equal costs).
+
+    >>> [n for n, _ in _ordered_scorer_specs(Score(['whois_com', 'github_org', 'dns_com', 'syllables']))]
+    ['syllables', 'dns_com', 'github_org', 'whois_com']
+    """
+    return sorted(_scorer_specs(stage), key=lambda spec: _scorer_cost_key(spec[0]))
+
+
+def _prune(candidates: list[dict], rules: dict, *, pending: set) -> list[dict]:
+    """Drop candidates that already fail a rule not involving *pending* scorers."""
+    decidable = _decidable_rules(rules, pending)
+    if not decidable:
+        return candidates
+    return [cand for cand in candidates if _passes_rules(cand, decidable)]
+
+
+def _decidable_rules(rules: dict, pending: set) -> dict:
+    """The rules that don't depend on any of the *pending* scorers."""
+    return {k: v for k, v in rules.items() if k not in pending}
+
+
+def _run_score_table(
+    stage: Score,
+    table: CandidateTable,
+    *,
+    pool=None,
+    rules: dict | None = None,
+    journal=None,
+    metrics: StageMetrics | None = None,
+    profiler: StageProfiler | None = None,
+) -> CandidateTable:
+    """``_run_score`` for a columnar ``CandidateTable``.
+
+    Each scorer's results are computed with the regular machinery (threads,
+    asyncio engine or process pool) and stored as a typed column; pushed-down
+    rules are evaluated as vectorized masks.
+    """
+    import numpy as np
+
+    specs = _ordered_scorer_specs(stage)
+    alive = np.arange(len(table))
+
+    for k, (scorer_name, scorer_params) in enumerate(specs):
+        if not len(alive):
+            break
+        batch = [{"name": n, "scores": {}} for n in table.names[alive].tolist()]
+        _run_score(
+            Score([(scorer_name, scorer_params)]),
+            batch,
+            pool=pool,
+            journal=journal,
+            metrics=metrics,
+            profiler=profiler,
+        )
+        table.set_scores(
+            scorer_name, [c["scores"].get(scorer_name) for c in batch], rows=alive
+        )
+        if rules and k + 1 < len(specs):
+            decidable = _decidable_rules(rules, {n for n, _ in specs[k + 1 :]})
+            if decidable:
+                alive = alive[table.mask_rules(decidable)[alive]]
+
+    return table
+
+
+def _pushdown_key(stages: list, i: int) -> dict | None:
+    """What of the Filter after stage *i* shapes stage *i*'s output (for
+    ``_stage_fingerprint``): its pushed-down rules and ``keep_indeterminate``.
+
+    >>> stages = [Score(['name_length']), Filter(rules={'name_length': 5})]
+    >>> _pushdown_key(stages, 0)
+    {'rules': {'name_length': 5}, 'keep_indeterminate': False}
+    """
+    if i + 1 < len(stages) and isinstance(stages[i + 1], Filter):
+        return {
+            "rules": _pushdown_rules(stages, i),
+            "keep_indeterminate": stages[i + 1].keep_indeterminate,
+        }
+    return None
+
+
+def _pushdown_rules(stages: list, i: int) -> dict | None:
+    """Rules of the Filter right after stage *i*, if any (for ``_run_score``).
+
+    Filters keeping indeterminate results aren't pushed down (pruning would
+    drop the candidates they keep).
+    """
+    if i + 1 < len(stages) and isinstance(stages[i + 1], Filter):
+        if stages[i + 1].keep_indeterminate:
+            return None
+        return stages[i + 1].rules
+    return None
+
+
 def _score_parallel(
     candidates: list[dict],
     scorer_name: str,
@@ -109,29 +585,82 @@ def _score_parallel(
     scorer_params: dict,
     *,
     max_workers: int = 10,
+    on_result=None,
+    observe=None,
 ) -> list[dict]:
-    """Score candidates in parallel using a thread pool."""
+    """Score candidates in parallel using a thread pool.
+
+    Used for network scorers without an async variant, and as the fallback
+    when ``run_pipeline`` is called from a running event loop.  Scorers
+    declaring a ``concurrency`` range get that many threads, with the calls
+    in flight adapted within the range (see ``brand.concurrency``).
+    ``on_result(cand)`` is called (in this thread) as each result arrives, and
+    ``observe(seconds, result)`` (in the pool's threads) after each call.
+    """
+    limiter = gate = None
+    if scorer_meta.concurrency:
+        limiter = concurrency.get_limiter(scorer_name, scorer_meta.concurrency)
+        gate = concurrency.ThreadGate(limiter)
+        max_workers = limiter.maximum
 
     def _score_one(cand):
-        try:
-            result = scorer_meta.func(cand["name"], **scorer_params)
-        except Exception as e:
-            result = {"error": f"{type(e).__name__}: {e}"}
+        with gate or contextlib.nullcontext(), concurrency.call_feedback() as feedback:
+            started = time.perf_counter()
+            try:
+                with tracing.span("call", scorer=scorer_name, candidate=cand["name"]):
+                    result = scorer_meta.func(cand["name"], **scorer_params)
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            seconds = time.perf_counter() - started
+            if limiter is not None:
+                limiter.record(seconds, result, overloaded=feedback.overloaded)
+        if observe:
+            observe(seconds, result)
         return cand["name"], result
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_score_one, c): c for c in candidates}
-        results = {}
+        futures = {
+            executor.submit(contextvars.copy_context().run, _score_one, c): c
+            for c in candidates
+        }
         for future in as_completed(futures):
-            name, result = future.result()
-            results[name] = result
-
-    for cand in candidates:
-        cand["scores"][scorer_name] = results.get(cand["name"])
+            _, result = future.result()
+            cand = futures[future]
+            cand["scores"][scorer_name] = result
+            if on_result:
+                on_result(cand)
 
     return candidates
 
 
+def _iter_score(
+    stage: Score,
+    candidates: Iterable[dict],
+    *,
+    chunk_size: int = DFLT_CHUNK_SIZE,
+    pool=None,
+    rules: dict | None = None,
+    journal=None,
+    metrics: StageMetrics | None = None,
+    profiler: StageProfiler | None = None,
+) -> Iterator[dict]:
+    """Execute a Score stage lazily, one chunk of candidates at a time."""
+    if isinstance(candidates, _Pipe):
+        chunks = candidates.chunks(chunk_size)
+    else:
+        chunks = _chunked(candidates, chunk_size)
+    for chunk in chunks:
+        yield from _run_score(
+            stage,
+            chunk,
+            pool=pool,
+            rules=rules,
+            journal=journal,
+            metrics=metrics,
+            profiler=profiler,
+        )
+
+
 def _compute_aggregate(scores: dict) -> float:
     """Compute a simple aggregate score from a scores dict.
 
@@ -147,75 +676,252 @@ def _compute_aggregate(scores: dict) -> float:
     return sum(values) / len(values) if values else 0.0
 
 
+def _sort_value(cand: dict, sort_key: str) -> float:
+    """Numeric value used to rank *cand* by *sort_key* (or the aggregate)."""
+    if sort_key == "aggregate":
+        return _compute_aggregate(cand["scores"])
+    val = cand["scores"].get(sort_key, 0)
+    if isinstance(val, bool):
+        return 1.0 if val else 0.0
+    if isinstance(val, (int, float)):
+        return float(val)
+    return 0.0
+
+
+def _select_top(stage: Filter, candidates: Iterable[dict]) -> list[dict]:
+    """Keep the ``top_n`` / ``top_pct`` best candidates of a Filter stage.
+
+    Uses a bounded heap: O(N log k) time and O(k) memory for k kept
+    candidates, with each candidate's sort value computed once.  Works on
+    lists and on (streamed) iterators.  Ties keep their input order, exactly
+    like a stable descending sort.
+
+    >>> cands = [{'name': n, 'scores': {'x': x}} for n, x in zip('abcd', [1, 3, 2, 3])]
+    >>> [c['name'] for c in _select_top(Filter(top_n=3, by='x'), iter(cands))]
+    ['b', 'd', 'c']
+    >>> [c['name'] for c in _select_top(Filter(top_pct=50, by='x'), iter(cands))]
+    ['b', 'd']
+    """
+    sort_key = stage.by or "aggregate"
+
+    def key(cand):
+        return _sort_value(cand, sort_key)
+
+    if stage.top_n is not None:
+        return heapq.nlargest(stage.top_n, candidates, key=key)
+
+    if isinstance(candidates, Sized):
+        n = _pct_count(len(candidates), stage.top_pct)
+        return heapq.nlargest(n, candidates, key=key)
+
+    # Streamed input: the count is only known at the end, so spill to disk
+    # while counting (pass 1), then heap-select from the spill (pass 2).
+    with tempfile.TemporaryFile() as spill:
+        count = 0
+        for cand in candidates:
+            pickle.dump(cand, spill, protocol=pickle.HIGHEST_PROTOCOL)
+            count += 1
+        spill.seek(0)
+        return heapq.nlargest(
+            _pct_count(count, stage.top_pct), _iter_pickles(spill), key=key
+        )
+
+
+def _pct_count(total: int, top_pct: float) -> int:
+    """Number of candidates kept by ``top_pct`` out of *total* (at least 1)."""
+    return max(1, math.ceil(total * top_pct / 100.0))
+
+
+def _iter_pickles(f) -> Iterator:
+    """Read back objects written one after the other with ``pickle.dump``."""
+    while True:
+        try:
+            yield pickle.load(f)
+        except EOFError:
+            return
+
+
 def _run_filter(stage: Filter, candidates: list[dict]) -> list[dict]:
     """Execute a Filter stage, reducing the candidate list."""
+    if isinstance(candidates, CandidateTable):
+        return candidates.select(
+            rules=stage.rules,
+            top_n=stage.top_n,
+            top_pct=stage.top_pct,
+            by=stage.by,
+            keep_indeterminate=stage.keep_indeterminate,
+        )
+
     result = candidates
 
     # Apply rules first
     if stage.rules:
-        result = _apply_rules(result, stage.rules)
+        result = _apply_rules(
+            result, stage.rules, keep_indeterminate=stage.keep_indeterminate
+        )
 
     # Apply top_n / top_pct
     if stage.top_n is not None or stage.top_pct is not None:
-        sort_key = stage.by or "aggregate"
-
-        def _sort_value(cand):
-            if sort_key == "aggregate":
-                return _compute_aggregate(cand["scores"])
-            val = cand["scores"].get(sort_key, 0)
-            if isinstance(val, bool):
-                return 1.0 if val else 0.0
-            if isinstance(val, (int, float)):
-                return float(val)
-            return 0.0
-
-        result = sorted(result, key=_sort_value, reverse=True)
-
-        if stage.top_n is not None:
-            result = result[: stage.top_n]
-        elif stage.top_pct is not None:
-            n = max(1, math.ceil(len(result) * stage.top_pct / 100.0))
-            result = result[:n]
+        result = _select_top(stage, result)
 
     return result
 
 
-def _apply_rules(candidates: list[dict], rules: dict) -> list[dict]:
+def _run_filter_indexed(stage: Filter, candidates: list[dict]) -> tuple[list, list]:
+    """Like ``_run_filter``, also returning the survivors' input positions."""
+    if isinstance(candidates, CandidateTable):
+        idx = candidates.select_indices(
+            rules=stage.rules,
+            top_n=stage.top_n,
+            top_pct=stage.top_pct,
+            by=stage.by,
+            keep_indeterminate=stage.keep_indeterminate,
+        )
+        return candidates.take(idx), idx.tolist()
+
+    position = {id(c): k for k, c in enumerate(candidates)}
+    survivors = _run_filter(stage, candidates)
+    return survivors, [position[id(c)] for c in survivors]
+
+
+def _iter_filter(stage: Filter, candidates: Iterable[dict]) -> Iterator[dict]:
+    """Execute a Filter stage lazily.
+
+    Rules are applied candidate by candidate.  ``top_n`` keeps only a bounded
+    heap of the best candidates seen so far; ``top_pct`` needs the count of
+    the whole (rule-surviving) population, so it spills it to a temporary
+    file rather than to memory.
+    """
+    if stage.rules:
+        keep = stage.keep_indeterminate
+        candidates = (
+            c
+            for c in candidates
+            if _passes_rules(c, stage.rules, keep_indeterminate=keep)
+        )
+
+    if stage.top_n is not None or stage.top_pct is not None:
+        yield from _select_top(stage, candidates)
+    else:
+        yield from candidates
+
+
+def _apply_rules(
+    candidates: list[dict], rules: dict, *, keep_indeterminate: bool = False
+) -> list[dict]:
     """Filter candidates by score rules.
 
     Rules map scorer names to expected values:
     - True/False: exact boolean match
     - number: minimum threshold
     - dict with 'op' and 'value': comparison
+
+    With *keep_indeterminate*, indeterminate results pass their rule.
     """
-    result = []
+    return [
+        cand
+        for cand in candidates
+        if _passes_rules(cand, rules, keep_indeterminate=keep_indeterminate)
+    ]
+
+
+def _passes_rules(cand: dict, rules: dict, *, keep_indeterminate=False) -> bool:
+    """Whether a single candidate satisfies every rule (see ``_apply_rules``)."""
+    for scorer_name, expected in rules.items():
+        actual = cand["scores"].get(scorer_name)
+        if actual is None:
+            return False
+        if keep_indeterminate and resilience.is_indeterminate(actual):
+            continue
+        if isinstance(expected, bool):
+            if actual != expected:
+                return False
+        elif isinstance(expected, (int, float)):
+            if not isinstance(actual, (int, float)):
+                return False
+            if actual < expected:
+                return False
+        elif isinstance(expected, dict):
+            op = expected.get("op", ">=")
+            val = expected.get("value", 0)
+            if not _compare(actual, op, val):
+                return False
+    return True
+
+
+def _failed_rule(cand, rules: dict, *, keep_indeterminate=False) -> str | None:
+    """Why *cand* fails *rules* (the first rule it fails), or None.
+
+    Rules on scores that weren't computed (e.g. pruned by a pushed-down rule)
+    only count if no other rule fails.
+
+    >>> cand = {'name': 'vox', 'scores': {'name_length': 3, 'dns_com': False}}
+    >>> _failed_rule(cand, {'github_org': True, 'name_length': 5, 'dns_com': True})
+    'name_length: 3'
+    >>> _failed_rule(cand, {'github_org': True})
+    'github_org: not scored'
+    """
+    missing = None
+    for scorer_name, expected in rules.items():
+        rule = {scorer_name: expected}
+        if _passes_rules(cand, rule, keep_indeterminate=keep_indeterminate):
+            continue
+        actual = cand["scores"].get(scorer_name)
+        if actual is None:
+            missing = missing or f"{scorer_name}: not scored"
+        elif isinstance(actual, Mapping) and "error" in actual:
+            return f"{scorer_name}: {actual['error']}"
+        else:
+            return f"{scorer_name}: {actual!r}"
+    return missing
+
+
+def _drop_reason(stage: Filter, cand) -> str | None:
+    """Why *stage* would drop *cand*, for ``brand.seen``.
+
+    Candidates that pass the rules of a ``top_n``/``top_pct`` Filter get that
+    as their reason; the ones it keeps are recorded again further on.
+    """
+    if stage.rules:
+        keep = stage.keep_indeterminate
+        if reason := _failed_rule(cand, stage.rules, keep_indeterminate=keep):
+            return reason
+    if stage.top_n is not None:
+        return f"top_n ({stage.top_n})"
+    if stage.top_pct is not None:
+        return f"top_pct ({stage.top_pct})"
+    return None
+
+
+def _record_seen(i: int, stage: Filter, candidates: Iterable) -> Iterator:
+    """Record in ``brand.seen`` that *candidates* reached Filter *i* (and why
+    it drops those it does), as they go by."""
     for cand in candidates:
-        keep = True
-        for scorer_name, expected in rules.items():
-            actual = cand["scores"].get(scorer_name)
-            if actual is None:
-                keep = False
-                break
-            if isinstance(expected, bool):
-                if actual != expected:
-                    keep = False
-                    break
-            elif isinstance(expected, (int, float)):
-                if not isinstance(actual, (int, float)):
-                    keep = False
-                    break
-                if actual < expected:
-                    keep = False
-                    break
-            elif isinstance(expected, dict):
-                op = expected.get("op", ">=")
-                val = expected.get("value", 0)
-                if not _compare(actual, op, val):
-                    keep = False
-                    break
-        if keep:
-            result.append(cand)
-    return result
+        reason = _drop_reason(stage, cand)
+        seen.record(cand["name"], stage=i, stage_type="filter", dropped_by=reason)
+        yield cand
+
+
+def _record_final(candidates: Iterable, stages: list):
+    """Record in ``brand.seen`` that *candidates* made it through *stages*."""
+    if seen.is_recording():
+        for cand in candidates:
+            seen.record(cand["name"], stage=len(stages), stage_type="final")
+
+
+def _seen_index(proj_dir: str, stages: list, *, record: bool):
+    """``brand.seen.use_index`` for a run in *proj_dir*: the index of its
+    pipelines folder, if the run records names or a Generate stage of
+    *stages* uses the index (otherwise the index isn't opened at all)."""
+    if not record and not any(
+        isinstance(stage, Generate) and stage.seen is not None for stage in stages
+    ):
+        return contextlib.nullcontext()
+    return seen.use_index(
+        seen.index_path(os.path.dirname(proj_dir)),
+        project=os.path.basename(proj_dir),
+        record=record,
+    )
 
 
 def _compare(actual, op: str, value) -> bool:
@@ -231,11 +937,582 @@ def _compare(actual, op: str, value) -> bool:
     return ops.get(op, ops[">="])(actual, value)
 
 
+# ---------------------------------------------------------------------------
+# Stage cache
+# ---------------------------------------------------------------------------
+
+
+def _candidates_digest(candidates: Iterable | None) -> str | None:
+    """Content hash of a candidate set (order included), or None if absent."""
+    if candidates is None:
+        return None
+    h = hashlib.sha256()
+    for cand in candidates:
+        if not isinstance(cand, dict):
+            cand = cand.to_dict()  # CandidateTable rows
+        h.update(json.dumps(cand, sort_keys=True, default=str).encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _stage_fingerprint(
+    stage,
+    input_digest: str | None,
+    *,
+    context: str | None,
+    layout: dict,
+    pushdown: dict | None = None,
+) -> str:
+    """Fingerprint of running *stage* on the input with digest *input_digest*.
+
+    *layout* (artifact format, delta or not) is included so that a stage is
+    only reused if its artifact is stored the way it was asked for.  So is,
+    for Score stages, the *pushdown* of the following Filter (see
+    ``_pushdown_key``): its rules prune the stage's output.
+    """
+    payload = {"stage": stage.to_dict(), "input": input_digest, "layout": layout}
+    if isinstance(stage, Generate):
+        payload["context"] = context
+    if isinstance(stage, Score):
+        payload["pushdown"] = pushdown
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _cached_stage(proj_dir: str, i: int, fingerprint: str) -> dict | None:
+    """The record of stage *i*'s artifact if its fingerprint is *fingerprint*.
+
+    The record holds the artifact's ``path``, the ``output`` digest (the next
+    stage's input digest) and the candidate ``count``.
+    """
+    path = _find_stage_dir(proj_dir, i)
+    if path is None:
+        return None
+    record_path = os.path.join(path, FINGERPRINT_FILENAME)
+    if not os.path.exists(record_path) or not _has_stage_artifact(path):
+        return None
+    record = _read_json(record_path)
+    if record.get("fingerprint") != fingerprint:
+        return None
+    return {**record, "path": path}
+
+
+def _forget_stage(proj_dir: str, i: int, stage_type: str):
+    """Drop stage *i*'s fingerprint before recomputing it.
+
+    So that a run dying half-way never leaves a fingerprint next to a
+    half-written artifact.
+    """
+    path = os.path.join(proj_dir, _stage_dirname(i, stage_type), FINGERPRINT_FILENAME)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _remember_stage(
+    proj_dir: str,
+    i: int,
+    stage_type: str,
+    fingerprint: str,
+    candidates,
+    *,
+    metrics: StageMetrics | None = None,
+) -> str:
+    """Record stage *i*'s fingerprint; return its output digest.
+
+    A stage whose *metrics* show indeterminate results, or that ran after the
+    run's budget ran out, isn't recorded: rerunning it must redo that work.
+    """
+    output = _candidates_digest(candidates)
+    if not _stage_is_final(metrics):
+        return output
+    _write_json(
+        os.path.join(_stage_dir(proj_dir, i, stage_type), FINGERPRINT_FILENAME),
+        {"fingerprint": fingerprint, "output": output, "count": len(candidates)},
+    )
+    return output
+
+
+def _stage_is_final(metrics: StageMetrics | None) -> bool:
+    """Whether a stage's results are final (see ``_remember_stage``)."""
+    tracker = current_tracker()
+    if tracker is not None and tracker.exhausted:
+        return False
+    return metrics is None or not any(
+        m.error_types.get(resilience.INDETERMINATE) for m in metrics.scorers.values()
+    )
+
+
+def _load_cached(stage_path: str, *, columnar: bool = False):
+    """Materialize the candidates of a reused stage."""
+    candidates = list(_iter_stage_candidates(stage_path))
+    return CandidateTable.from_dicts(candidates) if columnar else candidates
+
+
+def _artifact_layout(fmt, delta: bool) -> dict:
+    return {"format": get_format(fmt).name if fmt else "json", "delta": delta}
+
+
 # ---------------------------------------------------------------------------
 # Main pipeline runner
 # ---------------------------------------------------------------------------
 
 
+def _prepare_project(
+    stages,
+    *,
+    context: str | None,
+    project_name: str | None,
+    pipeline_dir: str | None,
+):
+    """Resolve templates, create the project folder and save ``pipeline.json``."""
+    if isinstance(stages, str):
+        stages = load_template(stages)
+
+    proj_dir = _project_dir(project_name, pipeline_dir=pipeline_dir)
+    _write_json(
+        os.path.join(proj_dir, "pipeline.json"),
+        {"stages": stages_to_dicts(stages), "context": context},
+    )
+    return stages, proj_dir
+
+
+def _resume_candidates(proj_dir: str, resume_from: int) -> Iterator[dict]:
+    """Lazily load the candidates output by the stage before *resume_from*."""
+    prev_stage_idx = resume_from - 1
+    prev_path = _find_stage_dir(proj_dir, prev_stage_idx)
+    if prev_path is None or not _has_stage_artifact(prev_path):
+        raise FileNotFoundError(
+            f"Cannot resume from stage {resume_from}: "
+            f"no artifacts found for stage {prev_stage_idx} in {proj_dir}"
+        )
+    return _iter_stage_candidates(prev_path)
+
+
+class _Counter:
+    """Iterable wrapper recording how many items were drawn (as ``before``)."""
+
+    def __init__(self, iterable: Iterable):
+        self._iterable = iterable
+        self.summary = {"before": 0}
+
+    def __iter__(self):
+        for item in self._iterable:
+            self.summary["before"] += 1
+            yield item
+
+
+def _take(candidates: Iterable[dict], target: int) -> Iterator[dict]:
+    """The first *target* candidates, after which all upstream work stops.
+
+    The upstream stream is closed (so no more names are generated or scored)
+    and the run's budget tracker, if any, refuses further requests, so that
+    lookups still in flight on other threads fail fast instead of finishing.
+
+    >>> list(_take(iter('abcde'), 2))
+    ['a', 'b']
+    """
+    candidates = iter(candidates)
+    taken = 0
+    for cand in itertools.islice(candidates, target):
+        taken += 1
+        yield cand
+    if taken == target:
+        if hasattr(candidates, "close"):
+            candidates.close()
+        if (tracker := current_tracker()) is not None:
+            tracker.stop(f"target reached ({target})")
+
+
+def _shuffled(items: Iterable, seed=None, *, buffer_size: int = DFLT_SHUFFLE_BUFFER):
+    """Yield *items* in random order, holding at most *buffer_size* of them.
+
+    Each item is drawn at random from a buffer that the source keeps
+    refilling, so the source is consumed lazily (and order is only random
+    within about *buffer_size* items).
+
+    >>> sorted(_shuffled(range(10), seed=0, buffer_size=3))
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+    """
+    rng = random.Random(seed)
+    buffer = []
+    for item in items:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+        i = rng.randrange(buffer_size)
+        yield buffer[i]
+        buffer[i] = item
+    rng.shuffle(buffer)
+    yield from buffer
+
+
+def _ranked(items: Iterable, key, *, buffer_size: int = DFLT_SHUFFLE_BUFFER):
+    """Yield *items* highest *key* first, in windows of *buffer_size* items.
+
+    Each window is read from the source, sorted (ties keep their order) and
+    yielded before the next one is read.
+
+    >>> list(_ranked(['bb', 'a', 'ccc', 'dd', 'e'], len, buffer_size=3))
+    ['ccc', 'bb', 'a', 'dd', 'e']
+    """
+    items = iter(items)
+    while window := list(itertools.islice(items, buffer_size)):
+        window.sort(key=key, reverse=True)
+        yield from window
+
+
+def _rank_key(rank_by: str):
+    """The sort key of names ranked by scorer *rank_by* (see ``_sort_value``)."""
+    func = scorer_registry[rank_by].func
+
+    def key(name):
+        return _sort_value({"scores": {rank_by: func(name)}}, rank_by)
+
+    return key
+
+
+def _check_target(stages: list, start_idx: int = 0):
+    """Raise if a ``top_n``/``top_pct`` Filter (which must see all candidates
+    before letting any through) makes a target count meaningless."""
+    for stage in stages[start_idx:]:
+        if isinstance(stage, Filter) and (
+            stage.top_n is not None or stage.top_pct is not None
+        ):
+            raise ValueError(
+                "target can't be combined with top_n/top_pct Filters: they "
+                "must see every candidate before keeping any"
+            )
+
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class _Pipe:
+    """Iterate *iterable* on a background thread, through a bounded queue.
+
+    The producing thread blocks while the queue is full, so a fast upstream
+    stage can't run ahead of a slow downstream one by more than *maxsize*
+    candidates.  Exceptions raised upstream are re-raised on the consuming
+    side.  If the consumer stops early, the producer stops (and closes
+    *iterable*) too.
+
+    >>> list(_Pipe(iter(range(5)), maxsize=2))
+    [0, 1, 2, 3, 4]
+    """
+
+    def __init__(self, iterable: Iterable, *, maxsize: int = DFLT_QUEUE_SIZE):
+        self._iterable = iterable
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._produce,), daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            for item in self._iterable:
+                if not self._put(item):
+                    break
+            else:
+                self._put(_DONE)
+        except BaseException as e:
+            self._put(_Failure(e))
+        finally:
+            if hasattr(self._iterable, "close"):
+                self._iterable.close()
+
+    def _unwrap(self, item):
+        if isinstance(item, _Failure):
+            raise item.exc
+        return item
+
+    def __iter__(self):
+        try:
+            while (item := self._unwrap(self._queue.get())) is not _DONE:
+                yield item
+        finally:
+            self._stop.set()
+
+    def chunks(self, size: int) -> Iterator[list]:
+        """Lists of up to *size* items: whatever is ready once one item is.
+
+        Unlike ``_chunked``, this doesn't hold back the items it has until
+        *size* of them arrive.
+        """
+        try:
+            while (item := self._unwrap(self._queue.get())) is not _DONE:
+                chunk = [item]
+                while len(chunk) < size:
+                    try:
+                        item = self._unwrap(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        yield chunk
+                        return
+                    chunk.append(item)
+                yield chunk
+        finally:
+            self._stop.set()
+
+
+def _stream_stages(
+    stages: list,
+    candidates: Iterable[dict] | None,
+    *,
+    proj_dir: str,
+    start_idx: int = 0,
+    context: str | None = None,
+    chunk_size: int = DFLT_CHUNK_SIZE,
+    on_stage_complete=None,
+    pool=None,
+    fmt="jsonl",
+    pipelined: bool = False,
+    queue_size: int = DFLT_QUEUE_SIZE,
+    metrics: RunMetrics | None = None,
+    profile=None,
+    target: int | None = None,
+    shuffle=False,
+    rank_by: str | None = None,
+) -> Iterator[dict]:
+    """Chain the stages into one lazy candidate stream.
+
+    Nothing is computed until the returned iterator is consumed.  Each stage
+    persists its output (in artifact format *fmt*) as candidates flow through.
+    With *pipelined*, each stage runs on its own thread and feeds the next
+    through a ``_Pipe`` of at most *queue_size* candidates.
+
+    Stages overlap, so a stage's ``metrics.json`` times span from the start
+    of the stream to the stage's last candidate.  With a *profile*, only
+    Score stages are profiled.  With a *target*, the stream ends (and all
+    upstream work stops) once that many candidates came out of the last stage.
+    With *shuffle*, generated names are shuffled (see ``_shuffled``); with
+    *rank_by*, they're ranked by that scorer (see ``_ranked``).
+    """
+    if target is not None:
+        _check_target(stages, start_idx)
+    if rank_by is not None:
+        if shuffle is not False:
+            raise ValueError("Use shuffle or rank_by, not both")
+        rank_key = _rank_key(rank_by)
+    for i, stage in enumerate(stages[start_idx:], start=start_idx):
+        stage_type = type(stage).__name__.lower()
+        summary = {}
+        journal = None
+        profiler = None
+        stage_metrics = StageMetrics(i, stage_type)
+
+        if isinstance(stage, Generate):
+            if candidates is not None:
+                # Already have candidates, skip generate
+                continue
+            generated = _iter_generate(stage, context=context)
+            if shuffle is not False:
+                generated = _shuffled(generated, None if shuffle is True else shuffle)
+            elif rank_by is not None:
+                generated = _ranked(generated, rank_key)
+            candidates = ({"name": n, "scores": {}} for n in generated)
+
+        elif isinstance(stage, Score):
+            if candidates is None:
+                raise ValueError(
+                    f"Score stage at index {i} has no candidates. "
+                    "A Generate stage or 'names' parameter is required first."
+                )
+            journal = open_stage_journal(_stage_dir(proj_dir, i, stage_type), stage)
+            if profile is not None:
+                profiler = StageProfiler(profile, _stage_dir(proj_dir, i, stage_type))
+            candidates = _iter_score(
+                stage,
+                candidates,
+                chunk_size=chunk_size,
+                pool=pool,
+                rules=_pushdown_rules(stages, i),
+                journal=journal,
+                metrics=stage_metrics,
+                profiler=profiler,
+            )
+
+        elif isinstance(stage, Filter):
+            if candidates is None:
+                raise ValueError(f"Filter stage at index {i} has no candidates.")
+            if seen.is_recording():
+                candidates = _record_seen(i, stage, candidates)
+            counter = _Counter(candidates)
+            summary = counter.summary
+            candidates = _iter_filter(stage, counter)
+
+        def on_done(
+            count,
+            *,
+            stopped,
+            i=i,
+            stage_type=stage_type,
+            journal=journal,
+            stage_metrics=stage_metrics,
+            summary=summary,
+            profiler=profiler,
+        ):
+            sdir = _stage_dir(proj_dir, i, stage_type)
+            if journal is not None:
+                journal.close()
+                if not stopped:  # else keep it, to resume the stage from
+                    remove_stage_journal(sdir)
+            if profiler is not None:
+                profiler.write()
+            stage_metrics.stop()
+            if stage_type != "generate":
+                stage_metrics.candidates_in = summary.get("before", count)
+            stage_metrics.candidates_out = count
+            stage_metrics.write(sdir)
+            if on_stage_complete:
+                on_stage_complete(i, stage_type, count)
+
+        stage_metrics.start()
+        if metrics is not None:
+            metrics.add(stage_metrics)
+        candidates = _persist_stream(
+            candidates,
+            _stage_dir(proj_dir, i, stage_type),
+            fmt=fmt,
+            summary=summary,
+            on_done=on_done,
+        )
+        if pipelined:
+            candidates = _Pipe(candidates, maxsize=queue_size)
+
+    if target is not None and candidates is not None:
+        return _take(candidates, target)
+    return iter(candidates or ())
+
+
+def iter_pipeline(
+    stages,
+    *,
+    names: Iterable[str] | None = None,
+    context: str | None = None,
+    project_name: str | None = None,
+    resume_from: int | None = None,
+    pipeline_dir: str | None = None,
+    on_stage_complete=None,
+    chunk_size: int = DFLT_CHUNK_SIZE,
+    processes: int | None = None,
+    artifact_format="jsonl",
+    pipelined: bool = False,
+    queue_size: int = DFLT_QUEUE_SIZE,
+    profile=None,
+    target: int | None = None,
+    shuffle=False,
+    rank_by: str | None = None,
+    budget=None,
+    record_seen: bool = False,
+) -> Iterator[dict]:
+    """Execute a pipeline in streaming mode, yielding surviving candidates.
+
+    Candidates are pulled lazily through the stages, so memory depends on
+    ``chunk_size`` (and on the size of any ``top_n``/``top_pct`` Filter), not
+    on the size of the candidate space.  Each stage writes its output to its
+    stage folder as candidates flow through (``results.jsonl`` by default),
+    and the surviving candidates are written to ``final/`` in the same format.
+
+    Parameters are the same as for ``run_pipeline``; ``names`` may be any
+    (lazy) iterable.  With ``pipelined=True``, stages run concurrently, each
+    on its own thread (see the module docstring).
+
+    Examples
+    --------
+    >>> from brand.stages import Generate, Score, Filter
+    >>> it = iter_pipeline([
+    ...     Generate('pattern', params={'pattern': 'CVC', 'consonants': 'bd', 'vowels': 'a'}),
+    ...     Score(['name_length']),
+    ...     Filter(rules={'name_length': 3}),
+    ... ], chunk_size=2)
+    >>> [c['name'] for c in it]
+    ['bab', 'bad', 'dab', 'dad']
+    """
+    fmt = get_format(artifact_format)
+    profile = as_profile(profile)
+    stages, proj_dir = _prepare_project(
+        stages, context=context, project_name=project_name, pipeline_dir=pipeline_dir
+    )
+
+    candidates = None
+    if resume_from is not None and resume_from > 0:
+        candidates = _resume_candidates(proj_dir, resume_from)
+    elif names is not None:
+        candidates = ({"name": n, "scores": {}} for n in names)
+
+    budgeted = budget is not None  # usage is only recorded for the caller's
+    if target is not None and budget is None:
+        budget = Budget()  # a tracker, to refuse in-flight work at the end
+    # Without a budget, leave any budget the caller enforces in place
+    budgeting = (
+        use_budget(budget) if budget is not None else contextlib.nullcontext()
+    )
+    pool = make_process_pool(processes) if processes else None
+    metrics = RunMetrics()
+    metrics.start()
+    try:
+        with tracing.span(
+            "pipeline", project_dir=proj_dir, stream=True
+        ), budgeting as tracker, _seen_index(
+            proj_dir, stages, record=record_seen
+        ):
+            stream = _stream_stages(
+                stages,
+                candidates,
+                proj_dir=proj_dir,
+                start_idx=resume_from or 0,
+                context=context,
+                chunk_size=chunk_size,
+                on_stage_complete=on_stage_complete,
+                pool=pool,
+                fmt=fmt,
+                pipelined=pipelined,
+                queue_size=queue_size,
+                metrics=metrics,
+                profile=profile,
+                target=target,
+                shuffle=shuffle,
+                rank_by=rank_by,
+            )
+
+            final_dir = os.path.join(proj_dir, "final")
+            os.makedirs(final_dir, exist_ok=True)
+
+            def on_done(count, *, stopped):
+                if target is not None:
+                    metrics.target = {"count": target, "reached": count >= target}
+                if budgeted:
+                    metrics.budget = tracker.usage()
+                metrics.stop()
+                metrics.write(final_dir)
+
+            stream = _persist_stream(stream, final_dir, fmt=fmt, on_done=on_done)
+            for cand in stream:
+                _record_final([cand], stages)
+                yield cand
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
 def run_pipeline(
     stages,
     *,
@@ -245,6 +1522,21 @@ def run_pipeline(
     resume_from: int | None = None,
     pipeline_dir: str | None = None,
     on_stage_complete=None,
+    stream: bool = False,
+    chunk_size: int = DFLT_CHUNK_SIZE,
+    processes: int | None = None,
+    columnar: bool = False,
+    artifact_format=None,
+    delta: bool = False,
+    cache: bool = True,
+    pipelined: bool = False,
+    queue_size: int = DFLT_QUEUE_SIZE,
+    profile=None,
+    budget=None,
+    target: int | None = None,
+    shuffle=False,
+    rank_by: str | None = None,
+    record_seen: bool = False,
 ):
     """Execute a brand evaluation pipeline.
 
@@ -265,6 +1557,90 @@ def run_pipeline(
         Override the default pipeline storage directory.
     on_stage_complete : callable | None
         Callback ``(stage_index, stage_type, n_candidates)`` after each stage.
+    stream : bool
+        Run in streaming mode (see ``iter_pipeline``): candidates flow lazily
+        through the stages and stage artifacts are written as ``results.jsonl``.
+        Only the final candidates are materialized.
+    chunk_size : int
+        Number of candidates scored at a time in streaming mode.
+    processes : int | None
+        If given, run CPU-bound local scorers in a pool of this many worker
+        processes (e.g. ``os.cpu_count()``).  Network scorers keep using
+        threads.  By default everything is scored in-process.
+    columnar : bool
+        Hold candidates in a NumPy-backed ``CandidateTable`` (one typed column
+        per scorer) instead of a list of dicts, so Filters run as vectorized
+        masks and argsorts.  ``results['candidates']`` is then the table, a
+        sequence of read-only dict-like views.  Eager mode only.
+    artifact_format : str | ArtifactFormat | None
+        How stage artifacts are stored (see ``brand.artifacts``): ``'json'``,
+        ``'jsonl'``, ``'npz'``, ``'parquet'`` or ``'columnar'`` (Parquet if
+        ``pyarrow`` is installed, else ``.npz``).  Defaults to ``results.json``
+        files in eager mode and ``'jsonl'`` in streaming mode.  The final
+        ``final/results.json`` is always JSON in eager mode.
+    delta : bool
+        Only persist what each stage adds: Score stages store their own new
+        scores, Filter stages the positions of their survivors (in
+        ``delta.json``).  Full candidates are rebuilt on demand when a stage is
+        loaded (e.g. by ``resume_from``), and ``final/results.json`` is the
+        only fully materialized output.  Eager mode only.
+    cache : bool
+        Reuse the artifact of any stage whose fingerprint (its ``to_dict()``
+        plus a hash of its input candidates) matches the one recorded in the
+        project folder by a previous run, instead of recomputing it.  Only
+        changed stages, and the stages after them whose input changed, are
+        recomputed.  Eager mode only (streaming runs always recompute).
+    pipelined : bool
+        Streaming mode (implies ``stream=True``) with every stage running on
+        its own thread, connected to the next by a bounded queue: candidates
+        that pass a rule-only Filter are scored by the next stage right away,
+        while the upstream stage keeps working.  ``on_stage_complete`` is then
+        called from the stage's thread.
+    queue_size : int
+        Maximum number of candidates waiting between two pipelined stages.
+        A stage whose output queue is full waits for the next one to catch up.
+    profile : bool | dict | Profile | None
+        Run ``cProfile`` and/or ``tracemalloc`` around each stage or each
+        scorer and save ``.prof`` files and top allocations in the stage
+        folders (see ``brand.profiling``).  ``True`` profiles CPU per stage; a
+        dict such as ``{'memory': True, 'per': 'scorer', 'sample': 0.01}``
+        sets ``Profile`` fields.  In streaming mode, only Score stages are
+        profiled.  Stages reused from the cache aren't rerun, so aren't
+        profiled (pass ``cache=False``).
+    budget : Budget | dict | None
+        Wall-clock, per-service request and estimated-cost limits of the run
+        (see ``brand.budget``), e.g. ``{'seconds': 600, 'requests': {'whois':
+        500}, 'cost': 2.0}``.  Network scorers serve the best-ranked candidates
+        first; once a budget is spent, the remaining results are
+        ``BudgetExhausted`` errors.  The use of each budget is recorded in
+        ``final/metrics.json``.
+    target : int | None
+        Stop once this many candidates made it through every stage (implies
+        ``stream=True``): candidates are pulled from the generator
+        ``chunk_size`` at a time and pushed through all stages, and as soon
+        as *target* of them come out of the last one, generation stops and
+        lookups still in flight are refused (as ``BudgetExhausted`` errors,
+        by the run's *budget*, or by an unlimited one only used for that and
+        not recorded in ``metrics.json``).
+        Filters can't have ``top_n``/``top_pct`` (they must see every
+        candidate).  ``final/metrics.json`` records whether it was reached.
+    shuffle : bool | int
+        Pull generated names in random order rather than in the generator's
+        own order, so that a ``target`` run samples the whole candidate space
+        instead of its first corner (all ``'b...'`` names).  Order is random
+        within windows of ``DFLT_SHUFFLE_BUFFER`` names, which are held in
+        memory.  An int seeds the shuffle.  Streaming mode only.
+    rank_by : str | None
+        Pull generated names best first instead: ranked by this (cheap,
+        local) scorer, highest score first, within windows of
+        ``DFLT_SHUFFLE_BUFFER`` names (each window is scored and sorted
+        before its first name goes through).  Streaming mode only.
+    record_seen : bool
+        Record every candidate, with the last stage it reached and why it was
+        dropped, in the ``seen.sqlite`` index of the pipelines folder (see
+        ``brand.seen``), which Generate stages can use to skip or defer names
+        seen before.  Off by default: turn it on for the runs of a search
+        that later runs should know about.
 
     Returns
     -------
@@ -281,17 +1657,21 @@ def run_pipeline(
     >>> len(results['candidates'])
     3
     """
-    # Handle template name
-    if isinstance(stages, str):
-        stages = load_template(stages)
-
-    # Set up project directory
-    proj_dir = _project_dir(project_name, pipeline_dir=pipeline_dir)
-
-    # Save pipeline definition
-    _write_json(
-        os.path.join(proj_dir, "pipeline.json"),
-        {"stages": stages_to_dicts(stages), "context": context},
+    stream = stream or pipelined or target is not None
+    if shuffle is not False and not stream:
+        raise ValueError("shuffle is only supported in streaming mode")
+    if rank_by is not None and not stream:
+        raise ValueError("rank_by is only supported in streaming mode")
+    if stream and columnar:
+        raise ValueError("columnar=True is only supported in eager mode")
+    if stream and delta:
+        raise ValueError("delta=True is only supported in eager mode")
+    if artifact_format is not None:
+        artifact_format = get_format(artifact_format)
+    profile = as_profile(profile)
+
+    stages, proj_dir = _prepare_project(
+        stages, context=context, project_name=project_name, pipeline_dir=pipeline_dir
     )
 
     # Initialize candidates
@@ -299,76 +1679,83 @@ def run_pipeline(
 
     if resume_from is not None and resume_from > 0:
         # Load candidates from previous stage
-        prev_stage_idx = resume_from - 1
-        prev_dirs = sorted(
-            d
-            for d in os.listdir(proj_dir)
-            if d.startswith(f"stage_{prev_stage_idx:02d}_")
-        )
-        if prev_dirs:
-            prev_path = os.path.join(proj_dir, prev_dirs[0], "results.json")
-            if os.path.exists(prev_path):
-                candidates = _read_json(prev_path)
-        if candidates is None:
-            raise FileNotFoundError(
-                f"Cannot resume from stage {resume_from}: "
-                f"no artifacts found for stage {prev_stage_idx} in {proj_dir}"
-            )
+        candidates = _resume_candidates(proj_dir, resume_from)
     elif names is not None:
-        candidates = [{"name": n, "scores": {}} for n in names]
+        candidates = ({"name": n, "scores": {}} for n in names)
 
-    # Run stages
     start_idx = resume_from or 0
-
-    for i, stage in enumerate(stages[start_idx:], start=start_idx):
-        if isinstance(stage, Generate):
-            if candidates is not None:
-                # Already have candidates, skip generate
-                continue
-            raw_names = _run_generate(stage, context=context)
-            candidates = [{"name": n, "scores": {}} for n in raw_names]
-
-            sdir = _stage_dir(proj_dir, i, "generate")
-            _write_json(
-                os.path.join(sdir, "results.json"),
-                {"names": raw_names, "count": len(raw_names)},
-            )
-
-        elif isinstance(stage, Score):
-            if candidates is None:
-                raise ValueError(
-                    f"Score stage at index {i} has no candidates. "
-                    "A Generate stage or 'names' parameter is required first."
+    budgeted = budget is not None  # usage is only recorded for the caller's
+    if target is not None:
+        _check_target(stages, start_idx)
+        if budget is None:
+            budget = Budget()  # a tracker, to refuse in-flight work at the end
+    pool = make_process_pool(processes) if processes else None
+    metrics = RunMetrics()
+    metrics.start()
+
+    try:
+        with tracing.span(
+            "pipeline", project_dir=proj_dir, stream=stream
+        ), use_budget(budget) as tracker, _seen_index(
+            proj_dir, stages, record=record_seen
+        ):
+            if stream:
+                candidates = list(
+                    _stream_stages(
+                        stages,
+                        candidates,
+                        proj_dir=proj_dir,
+                        start_idx=start_idx,
+                        context=context,
+                        chunk_size=chunk_size,
+                        on_stage_complete=on_stage_complete,
+                        pool=pool,
+                        fmt=artifact_format or "jsonl",
+                        pipelined=pipelined,
+                        queue_size=queue_size,
+                        metrics=metrics,
+                        profile=profile,
+                        target=target,
+                        shuffle=shuffle,
+                        rank_by=rank_by,
+                    )
                 )
-            candidates = _run_score(stage, candidates)
-
-            sdir = _stage_dir(proj_dir, i, "score")
-            _write_json(os.path.join(sdir, "results.json"), candidates)
-
-        elif isinstance(stage, Filter):
-            if candidates is None:
-                raise ValueError(f"Filter stage at index {i} has no candidates.")
-            before_count = len(candidates)
-            candidates = _run_filter(stage, candidates)
-            after_count = len(candidates)
-
-            sdir = _stage_dir(proj_dir, i, "filter")
-            _write_json(
-                os.path.join(sdir, "results.json"),
-                {
-                    "before": before_count,
-                    "after": after_count,
-                    "candidates": candidates,
-                },
-            )
-
-        if on_stage_complete:
-            on_stage_complete(i, type(stage).__name__.lower(), len(candidates))
+                if target is not None:
+                    reached = len(candidates) >= target
+                    metrics.target = {"count": target, "reached": reached}
+            else:
+                if candidates is not None:
+                    candidates = list(candidates)
+                    if columnar:
+                        candidates = CandidateTable.from_dicts(candidates)
+                candidates = _run_stages(
+                    stages,
+                    candidates,
+                    proj_dir=proj_dir,
+                    start_idx=start_idx,
+                    context=context,
+                    on_stage_complete=on_stage_complete,
+                    pool=pool,
+                    columnar=columnar,
+                    fmt=artifact_format,
+                    delta=delta,
+                    cache=cache,
+                    metrics=metrics,
+                    profile=profile,
+                )
+            _record_final(candidates, stages)
+            if budgeted:
+                metrics.budget = tracker.usage()
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
     # Write final results
     final_dir = os.path.join(proj_dir, "final")
     os.makedirs(final_dir, exist_ok=True)
     _write_json(os.path.join(final_dir, "results.json"), candidates)
+    metrics.stop()
+    metrics.write(final_dir)
 
     return {
         "candidates": candidates,
@@ -377,6 +1764,308 @@ def run_pipeline(
     }
 
 
+def _run_stages(
+    stages: list,
+    candidates: list[dict] | None,
+    *,
+    proj_dir: str,
+    start_idx: int = 0,
+    context: str | None = None,
+    on_stage_complete=None,
+    pool=None,
+    columnar: bool = False,
+    fmt=None,
+    delta: bool = False,
+    cache: bool = False,
+    score=None,
+    metrics: RunMetrics | None = None,
+    profile=None,
+) -> list[dict]:
+    """Run the stages eagerly, persisting each stage's artifact.
+
+    With *cache*, stages whose fingerprint matches their existing artifact
+    are not recomputed; their candidates are only loaded if a later stage
+    needs them.  *score* and *profile* are passed on to ``_run_stage``.  Each
+    stage's ``StageMetrics`` is added to *metrics*, if given.
+    """
+    steps = _stage_steps(
+        stages,
+        candidates,
+        proj_dir=proj_dir,
+        start_idx=start_idx,
+        context=context,
+        on_stage_complete=on_stage_complete,
+        columnar=columnar,
+        fmt=fmt,
+        delta=delta,
+        cache=cache,
+        metrics=metrics,
+    )
+    try:
+        i, stage, candidates, kwargs = next(steps)
+        while True:
+            try:
+                candidates = _run_stage(
+                    i,
+                    stage,
+                    candidates,
+                    pool=pool,
+                    score=score,
+                    profile=profile,
+                    **kwargs,
+                )
+            except Exception as e:
+                steps.throw(e)
+            i, stage, candidates, kwargs = steps.send(candidates)
+    except StopIteration as done:
+        return done.value
+
+
+def _stage_steps(
+    stages: list,
+    candidates: list[dict] | None,
+    *,
+    proj_dir: str,
+    start_idx: int = 0,
+    context: str | None = None,
+    on_stage_complete=None,
+    columnar: bool = False,
+    fmt=None,
+    delta: bool = False,
+    cache: bool = False,
+    metrics: RunMetrics | None = None,
+):
+    """The stage loop of ``_run_stages``, for any engine to drive.
+
+    A generator that yields ``(i, stage, candidates, kwargs)`` for each stage
+    to compute (those not reused from the cache) and must be sent back the
+    stage's output, ``_run_stage(i, stage, candidates, **kwargs)`` or an
+    engine's equivalent (errors are thrown into it).  It returns the final
+    candidates.  Skipping Generate stages, caching, metrics and
+    *on_stage_complete* are handled here, so ``brand.aio`` shares them.
+    """
+    base = _delta_base(proj_dir, start_idx) if delta else None
+    layout = _artifact_layout(fmt, delta)
+    digest = _candidates_digest(candidates) if cache else None
+    reused = None  # folder of a reused stage whose candidates aren't loaded yet
+    for i, stage in enumerate(stages[start_idx:], start=start_idx):
+        if isinstance(stage, Generate) and (candidates is not None or reused):
+            # Already have candidates, skip generate
+            continue
+        stage_type = type(stage).__name__.lower()
+
+        hit = None
+        if cache:
+            fingerprint = _stage_fingerprint(
+                stage,
+                digest,
+                context=context,
+                layout=layout,
+                pushdown=_pushdown_key(stages, i),
+            )
+            hit = _cached_stage(proj_dir, i, fingerprint)
+        if hit is not None:
+            reused, digest, count = hit["path"], hit["output"], hit["count"]
+            candidates = None
+            if metrics is not None:
+                metrics.add_reused(reused)
+        else:
+            if reused is not None:
+                candidates, reused = _load_cached(reused, columnar=columnar), None
+            if cache:
+                _forget_stage(proj_dir, i, stage_type)
+            stage_metrics = StageMetrics(i, stage_type)
+            kwargs = {
+                "proj_dir": proj_dir,
+                "context": context,
+                "rules": _pushdown_rules(stages, i),
+                "columnar": columnar,
+                "fmt": fmt,
+                "delta": delta,
+                "base": base,
+                "metrics": stage_metrics,
+            }
+            with tracing.span("stage", index=i, type=stage_type):
+                candidates = yield i, stage, candidates, kwargs
+            if metrics is not None:
+                metrics.add(stage_metrics)
+            if cache:
+                digest = _remember_stage(
+                    proj_dir,
+                    i,
+                    stage_type,
+                    fingerprint,
+                    candidates,
+                    metrics=stage_metrics,
+                )
+            count = len(candidates)
+
+        base = _stage_dirname(i, stage_type)
+        if on_stage_complete:
+            on_stage_complete(i, stage_type, count)
+
+    if reused is not None:
+        candidates = _load_cached(reused, columnar=columnar)
+    return candidates
+
+
+def _delta_base(proj_dir: str, start_idx: int) -> str | None:
+    """The stage folder that stage *start_idx*'s delta builds on, if any."""
+    if start_idx <= 0:
+        return None
+    path = _find_stage_dir(proj_dir, start_idx - 1)
+    return os.path.basename(path) if path else None
+
+
+def _run_stage(
+    i: int,
+    stage,
+    candidates: list[dict] | None,
+    *,
+    proj_dir: str,
+    context: str | None = None,
+    pool=None,
+    rules: dict | None = None,
+    score=None,
+    columnar: bool = False,
+    fmt=None,
+    delta: bool = False,
+    base: str | None = None,
+    metrics: StageMetrics | None = None,
+    profile=None,
+) -> list[dict]:
+    """Run stage *i* eagerly and persist its artifact.
+
+    ``score(stage, candidates, rules=rules, metrics=metrics)`` computes Score
+    stages, recording per-scorer figures into *metrics*; it defaults to
+    ``_run_score`` (alternative engines pass their own).  *rules* are the
+    following Filter's rules, pushed down into ``_run_score``.  With
+    *columnar*, generated candidates go into a ``CandidateTable``.  The
+    artifact is the historical ``results.json`` unless another artifact
+    format *fmt* is given, in which case counts go to ``summary.json``.
+
+    With *delta*, Score and Filter stages only persist what they add on top
+    of the *base* stage folder (see ``_persist_delta``).
+
+    The stage's timings and counts are accumulated in *metrics* (a fresh
+    ``StageMetrics`` by default) and written to its ``metrics.json``.  With a
+    *profile* (a ``brand.profiling.Profile``), profiles are saved next to it.
+    """
+    if metrics is None:
+        metrics = StageMetrics(i, type(stage).__name__.lower())
+    if metrics.candidates_in is None and candidates is not None:
+        metrics.candidates_in = len(candidates)
+    metrics.start()
+    profiler = None
+    if profile is not None:
+        profiler = StageProfiler(
+            profile, _stage_dir(proj_dir, i, type(stage).__name__.lower())
+        )
+
+    if isinstance(stage, Generate):
+        with profiler.span() if profiler else contextlib.nullcontext():
+            raw_names = _run_generate(stage, context=context)
+        if columnar:
+            candidates = CandidateTable(raw_names)
+        else:
+            candidates = [{"name": n, "scores": {}} for n in raw_names]
+        summary = {"count": len(raw_names)}
+        legacy = {"names": raw_names, "count": len(raw_names)}
+
+    elif isinstance(stage, Score):
+        if candidates is None:
+            raise ValueError(
+                f"Score stage at index {i} has no candidates. "
+                "A Generate stage or 'names' parameter is required first."
+            )
+        if score is None:
+            sdir = _stage_dir(proj_dir, i, "score")
+            with open_stage_journal(sdir, stage) as journal:
+                candidates = _run_score(
+                    stage,
+                    candidates,
+                    pool=pool,
+                    rules=rules,
+                    journal=journal,
+                    metrics=metrics,
+                    profiler=profiler,
+                )
+        else:
+            candidates = score(stage, candidates, rules=rules, metrics=metrics)
+        summary = {"count": len(candidates)}
+        legacy = candidates
+
+    elif isinstance(stage, Filter):
+        if candidates is None:
+            raise ValueError(f"Filter stage at index {i} has no candidates.")
+        before_count = len(candidates)
+        if seen.is_recording():
+            for _ in _record_seen(i, stage, candidates):
+                pass
+        with profiler.span() if profiler else contextlib.nullcontext():
+            candidates, indices = _run_filter_indexed(stage, candidates)
+        summary = {"before": before_count, "after": len(candidates)}
+        legacy = {**summary, "candidates": candidates}
+
+    else:
+        return candidates
+
+    sdir = _stage_dir(proj_dir, i, type(stage).__name__.lower())
+    manifest_path = os.path.join(sdir, DELTA_MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    if delta and isinstance(stage, Score):
+        _persist_delta(stage, candidates, sdir, base=base, fmt=fmt, summary=summary)
+    elif delta and isinstance(stage, Filter) and base is not None:
+        _persist_delta(stage, indices, sdir, base=base, fmt=fmt, summary=summary)
+    elif fmt is None or get_format(fmt).name == "json":
+        remove_other_formats(sdir, "json")
+        _write_json(os.path.join(sdir, "results.json"), legacy)
+    else:
+        _persist_candidates(candidates, sdir, fmt=fmt, summary=summary)
+
+    if isinstance(stage, Score):
+        # The artifact now holds everything the journal had
+        remove_stage_journal(sdir)
+
+    metrics.stop()
+    metrics.candidates_out = len(candidates)
+    metrics.write(sdir)
+    if profiler is not None:
+        profiler.write()
+    return candidates
+
+
+def _persist_delta(stage, added, sdir: str, *, base, fmt, summary: dict):
+    """Persist only what a Score or Filter stage adds to its *base* stage.
+
+    A Score stage stores its candidates with only its own scorers' results
+    (in format *fmt*); a Filter stage stores no candidates at all, just the
+    positions of its survivors in the base stage's output.  Either way,
+    ``delta.json`` records the base stage folder.
+    """
+    if isinstance(stage, Score):
+        scorer_names = [name for name, _ in _scorer_specs(stage)]
+        records = (
+            {
+                "name": c["name"],
+                "scores": {k: c["scores"][k] for k in scorer_names if k in c["scores"]},
+            }
+            for c in added
+        )
+        _persist_candidates(records, sdir, fmt=fmt or "json", summary=summary)
+        manifest = {"kind": "score", "base": base, "scorers": scorer_names}
+    else:
+        remove_other_formats(sdir, None)
+        _write_json(os.path.join(sdir, "summary.json"), summary)
+        manifest = {"kind": "filter", "base": base, "indices": added}
+
+    # Compact on purpose: filter manifests hold one index per survivor
+    with open(os.path.join(sdir, DELTA_MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+
 # ---------------------------------------------------------------------------
 # Template loading
 # ---------------------------------------------------------------------------
@@ -481,7 +2170,7 @@ def evaluate_name(
             ),
         ]
 
-    result = run_pipeline(stages, names=[name])
+    result = run_pipeline(stages, names=[name], record_seen=False)
     if result["candidates"]:
         return result["candidates"][0]
     return {"name": name, "scores": {}}
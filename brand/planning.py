@@ -0,0 +1,344 @@
+"""Dry-run planning: project a run's time, requests and spend from a sample.
+
+``plan_pipeline(stages, names, sample=100)`` scores a random sample of the
+candidates with every scorer of the pipeline, then projects, stage by stage,
+what the full run would do:
+
+* how many candidates reach each stage and each scorer (Filter pass rates,
+  and the pruning of pushed-down rules, are taken from the sample),
+* how long each stage would take, from each scorer's measured seconds per
+  call, but no less than the hosts' rate limits allow (see
+  ``brand.ratelimit``),
+* how many requests each service would get, and the estimated cost (LLM
+  spend; see ``brand.budget``).
+
+Pass rates are measured jointly (on the sample's candidates, in pipeline
+order), so correlated Filters are accounted for.  The plan also searches the
+orders of the pipeline's Score stages (each with the Filters that follow it)
+for a faster one, keeping ``top_n``/``top_pct`` Filters in place and each
+Filter after the scorers its rules use.  A faster order that keeps the same
+survivors is suggested as ``suggested_order``: the stage indices, in their
+new order.
+
+Projections scale the sample linearly: small samples and rare survivors make
+them rough, and network latencies measured on a sample are at the sample's
+concurrency.  Network scorers do call their services (the sample's worth).
+
+>>> from brand.stages import Score, Filter
+>>> plan = plan_pipeline(
+...     [Score(['name_length']), Filter(rules={'name_length': 5})],
+...     ['vox', 'lumex', 'zap', 'figiri'],
+...     sample=4,
+... )
+>>> [(s['type'], s['candidates_in'], s['candidates_out']) for s in plan['stages']]
+[('score', 4, 4), ('filter', 4, 2)]
+>>> plan['suggested_order'] is None
+True
+"""
+
+import itertools
+import json
+import random
+import time
+from collections import Counter
+
+from brand import ratelimit
+from brand.budget import Budget, use_budget
+from brand.metrics import _error_type
+from brand.pipeline import (
+    _decidable_rules,
+    _iter_generate,
+    _ordered_scorer_specs,
+    _passes_rules,
+    _pct_count,
+    _pushdown_rules,
+    _run_score,
+    _scorer_specs,
+    _select_top,
+    load_template,
+)
+from brand.stages import Filter, Generate, Score
+
+DFLT_SAMPLE_SIZE = 100
+DFLT_MAX_PERMUTED = 6  # more movable stages than this: no order is suggested
+
+
+def _sample(names, size: int, rng: random.Random) -> tuple[list, int]:
+    """A uniform sample of up to *size* of *names*, and their count.
+
+    Reservoir sampling, so *names* may be a (long) iterator.
+
+    >>> sample, total = _sample(iter(range(1000)), 10, random.Random(0))
+    >>> len(sample), total, len(set(sample))
+    (10, 1000, 10)
+    """
+    sample, total = [], 0
+    for total, name in enumerate(names, start=1):
+        if len(sample) < size:
+            sample.append(name)
+        elif (j := rng.randrange(total)) < size:
+            sample[j] = name
+    return sample, total
+
+
+def _spec_key(spec: tuple) -> str:
+    name, params = spec
+    return name if not params else f"{name}{json.dumps(params, sort_keys=True)}"
+
+
+def _measure_scorer(spec: tuple, candidates: list[dict]) -> dict:
+    """Score *candidates* with one scorer; return its costs per call."""
+    name = spec[0]
+    n = len(candidates) or 1
+    with use_budget(Budget()) as tracker:
+        started = time.perf_counter()
+        _run_score(Score([spec]), candidates)
+        seconds = time.perf_counter() - started
+    errors = [_error_type(c["scores"].get(name)) for c in candidates]
+    return {
+        "seconds_per_call": seconds / n,
+        "requests_per_call": {h: k / n for h, k in tracker.requests.items()},
+        "cost_per_call": tracker.cost / n,
+        "error_rate": sum(e is not None for e in errors) / n,
+    }
+
+
+def _project(stages: list, order: list, sample: list, total: int, measures: dict):
+    """Project running ``stages[i] for i in order`` on *total* candidates, of
+    which *sample* (scored by every scorer) is a sample."""
+    ordered = [stages[i] for i in order]
+    alive, n = sample, float(total)
+    records = []
+    for pos, (i, stage) in enumerate(zip(order, ordered)):
+        record = {"stage": i, "type": type(stage).__name__.lower()}
+        record["candidates_in"] = round(n)
+        if isinstance(stage, Score):
+            record.update(_project_score(stage, ordered, pos, alive, n, measures))
+        elif isinstance(stage, Filter):
+            before = len(alive)
+            if stage.rules:
+                keep = stage.keep_indeterminate
+                alive = [
+                    c
+                    for c in alive
+                    if _passes_rules(c, stage.rules, keep_indeterminate=keep)
+                ]
+                n = n * len(alive) / before if before else 0.0
+            if stage.top_n is not None or stage.top_pct is not None:
+                kept = (
+                    min(stage.top_n, n)
+                    if stage.top_n is not None
+                    else _pct_count(round(n), stage.top_pct)
+                )
+                top_n = round(len(alive) * kept / n) if n else 0
+                alive = _select_top(Filter(top_n=top_n, by=stage.by), alive)
+                n = kept
+            record["pass_rate"] = len(alive) / before if before else None
+        record["candidates_out"] = round(n)
+        records.append(record)
+    return records
+
+
+def _project_score(stage, ordered, pos, alive, n, measures) -> dict:
+    """The projected calls, seconds, requests and cost of a Score stage."""
+    rules = _pushdown_rules(ordered, pos)
+    specs = _ordered_scorer_specs(stage)
+    scorers, requests, seconds, cost = {}, Counter(), 0.0, 0.0
+    for k, spec in enumerate(specs):
+        reaching = alive
+        if rules:
+            decidable = _decidable_rules(rules, {name for name, _ in specs[k:]})
+            reaching = [c for c in alive if _passes_rules(c, decidable)]
+        calls = n * len(reaching) / len(alive) if alive else 0.0
+        m = measures[_spec_key(spec)]
+        scorer_requests = {
+            h: round(calls * per_call) for h, per_call in m["requests_per_call"].items()
+        }
+        scorers[spec[0]] = {
+            "calls": round(calls),
+            "seconds": calls * m["seconds_per_call"],
+            "requests": scorer_requests,
+            "cost": calls * m["cost_per_call"],
+            "error_rate": m["error_rate"],
+        }
+        requests.update(scorer_requests)
+        seconds += scorers[spec[0]]["seconds"]
+        cost += scorers[spec[0]]["cost"]
+    limits = ratelimit.get_rate_limits()
+    floor = max(
+        (k / limits[h][0] for h, k in requests.items() if h in limits), default=0.0
+    )
+    return {
+        "seconds": max(seconds, floor),
+        "requests": dict(requests),
+        "cost": cost,
+        "scorers": scorers,
+    }
+
+
+def _totals(records: list) -> dict:
+    requests = Counter()
+    for record in records:
+        requests.update(record.get("requests", {}))
+    return {
+        "seconds": sum(r.get("seconds", 0.0) for r in records),
+        "requests": dict(requests),
+        "cost": sum(r.get("cost", 0.0) for r in records),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Stage order
+# ---------------------------------------------------------------------------
+
+
+def _is_barrier(stage) -> bool:
+    return isinstance(stage, Filter) and (
+        stage.top_n is not None or stage.top_pct is not None
+    )
+
+
+def _segments(stages: list, start: int) -> list:
+    """The movable blocks of ``stages[start:]``, per segment between barriers.
+
+    A block is a Score stage and the rule-only Filters right after it (or
+    such Filters alone); ``top_n``/``top_pct`` Filters end segments.
+    """
+    segments, blocks = [], []
+    for i in range(start, len(stages)):
+        if _is_barrier(stages[i]):
+            segments.append((blocks, i))
+            blocks = []
+        elif isinstance(stages[i], Score) or not blocks:
+            blocks.append([i])
+        else:
+            blocks[-1].append(i)
+    segments.append((blocks, None))
+    return segments
+
+
+def _block_order_is_valid(blocks: list, stages: list) -> bool:
+    """Whether every Filter comes after the scorers (of *blocks*) it uses."""
+    produced_by = {}
+    for b, block in enumerate(blocks):
+        if isinstance(stages[block[0]], Score):
+            for name, _ in _scorer_specs(stages[block[0]]):
+                produced_by.setdefault(name, b)
+    for b, block in enumerate(blocks):
+        for i in block:
+            for key in getattr(stages[i], "rules", None) or {}:
+                if produced_by.get(key, b) > b:
+                    return False
+    return True
+
+
+def _suggest_order(stages, start, sample, total, measures) -> list | None:
+    """A faster order of the stages from *start* on, if any (see module doc)."""
+    segments = _segments(stages, start)
+    if max(len(blocks) for blocks, _ in segments) > DFLT_MAX_PERMUTED:
+        return None
+
+    def seconds(order):
+        return _totals(_project(stages, order, sample, total, measures))["seconds"]
+
+    current = list(range(start, len(stages)))
+    choices = []
+    for blocks, barrier in segments:
+        orders = [
+            perm
+            for perm in itertools.permutations(blocks)
+            if _block_order_is_valid(perm, stages)
+        ]
+        tail = [barrier] if barrier is not None else []
+        choices.append([[i for block in p for i in block] + tail for p in orders])
+    best, best_seconds = None, seconds(current) * 0.99  # 1%: not just noise
+    for combination in itertools.product(*choices):
+        order = [i for part in combination for i in part]
+        if order != current and (s := seconds(order)) < best_seconds:
+            best, best_seconds = order, s
+    return list(range(start)) + best if best is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+
+def plan_pipeline(
+    stages,
+    names=None,
+    *,
+    sample: int = DFLT_SAMPLE_SIZE,
+    context: str | None = None,
+    seed: int = 0,
+) -> dict:
+    """Project the time, requests and cost of running *stages* on *names*.
+
+    Parameters
+    ----------
+    stages : list | str
+        Stages, or a template name, as for ``run_pipeline``.
+    names : Iterable[str] | None
+        The candidates of the full run.  If None, they're drawn from the
+        pipeline's Generate stage (all of them, to count them; the time it
+        takes is reported as the Generate stage's ``seconds``).
+    sample : int
+        Number of candidates (drawn at random) to score with every scorer.
+    context : str | None
+        Context for the Generate stage, as for ``run_pipeline``.
+    seed : int
+        Seed of the sample.
+
+    Returns
+    -------
+    dict
+        ``candidates`` and ``sample`` sizes; ``stages``, one record per stage
+        (``candidates_in``/``candidates_out``, Filter ``pass_rate``, and for
+        Score stages ``seconds``, ``requests`` per host, ``cost`` and
+        per-scorer figures); the totals ``seconds``, ``requests`` and
+        ``cost``; and ``suggested_order`` (stage indices) or None.
+    """
+    if isinstance(stages, str):
+        stages = load_template(stages)
+    rng = random.Random(seed)
+    start, records = 0, []
+    if stages and isinstance(stages[0], Generate):
+        start = 1
+        if names is None:
+            started = time.perf_counter()
+            generated = _iter_generate(stages[0], context=context)
+            names, total = _sample(generated, sample, rng)
+            records.append(
+                {
+                    "stage": 0,
+                    "type": "generate",
+                    "candidates_out": total,
+                    "seconds": time.perf_counter() - started,
+                }
+            )
+    if names is None:
+        raise ValueError("plan_pipeline needs names or a Generate stage first")
+    if not records:
+        names, total = _sample(names, sample, rng)
+    for stage in stages[start:]:
+        if not isinstance(stage, (Score, Filter)):
+            raise ValueError(f"Can't plan a {type(stage).__name__} stage")
+
+    candidates = [{"name": n, "scores": {}} for n in names]
+    measures = {}
+    for stage in stages[start:]:
+        if isinstance(stage, Score):
+            for spec in _scorer_specs(stage):
+                if (key := _spec_key(spec)) not in measures:
+                    measures[key] = _measure_scorer(spec, candidates)
+
+    order = list(range(start, len(stages)))
+    records += _project(stages, order, candidates, total, measures)
+    totals = _totals(records)
+    return {
+        "candidates": total,
+        "sample": len(candidates),
+        "stages": records,
+        **totals,
+        "suggested_order": _suggest_order(stages, start, candidates, total, measures),
+    }
@@ -0,0 +1,222 @@
+"""Opt-in profiling of pipeline stages and scorers.
+
+``run_pipeline(..., profile=...)`` runs ``cProfile`` and/or ``tracemalloc``
+around each stage, or around each scorer of Score stages, and saves the
+results in the stage folder:
+
+* ``profile.prof`` (per stage) or ``profile-<scorer>.prof`` (per scorer),
+  readable with ``pstats``, ``snakeviz``, ``python -m pstats``, ...;
+* ``allocations.json`` / ``allocations-<scorer>.json``: the peak traced
+  memory and the top allocation sites (net bytes and blocks still allocated
+  at the end of the profiled spans).
+
+To keep the overhead low on large runs, only a *sample* of each Score stage's
+candidates is profiled: those are scored one by one in the stage's own thread,
+which is what ``cProfile`` sees; the others are scored as usual (thread pools,
+asyncio engine, process pool), unprofiled.
+
+Since Python 3.12, only one ``cProfile`` profiler may be active in a process,
+so CPU-profiled spans of concurrent stages (``pipelined=True``) take turns.
+If another profiler is already running (e.g. ``profile=`` used inside an
+outer ``cProfile`` session), CPU profiling of the span is skipped and the
+reason is saved next to the ``.prof`` file, as ``profile.json``
+(``profile-<scorer>.json``).
+
+>>> as_profile(True)
+Profile(cpu=True, memory=False, per='stage', sample=1.0, top=20)
+>>> as_profile({'memory': True, 'per': 'scorer', 'sample': 0.01}).per
+'scorer'
+>>> StageProfiler(Profile(sample=0.25), '.').split(list(range(8)))
+([0, 4], [1, 2, 3, 5, 6, 7])
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+
+_PER = ("stage", "scorer")
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_cpu_lock = threading.RLock()  # one active cProfile profiler per process
+
+
+@dataclass
+class Profile:
+    """What to profile.
+
+    Parameters
+    ----------
+    cpu : bool
+        Run ``cProfile`` (saved as ``.prof`` files).
+    memory : bool
+        Run ``tracemalloc`` (saved as ``allocations*.json``).
+    per : str
+        ``'stage'`` for one profile per stage, ``'scorer'`` for one per scorer
+        of each Score stage (Generate and Filter stages are then not
+        profiled).
+    sample : float
+        Fraction of each Score stage's candidates that are profiled (every
+        ``round(1 / sample)``-th candidate), e.g. ``0.01`` on 100K-name runs.
+    top : int
+        Number of allocation sites listed in ``allocations*.json``.
+    """
+
+    cpu: bool = True
+    memory: bool = False
+    per: str = "stage"
+    sample: float = 1.0
+    top: int = 20
+
+    def __post_init__(self):
+        if self.per not in _PER:
+            raise ValueError(f"per must be one of {_PER}, not {self.per!r}")
+        if not 0 < self.sample <= 1:
+            raise ValueError(f"sample must be in (0, 1], not {self.sample!r}")
+
+
+def as_profile(profile) -> Profile | None:
+    """Normalize ``run_pipeline``'s ``profile`` argument.
+
+    ``None``/``False`` (off), ``True`` (``Profile()``), a dict of ``Profile``
+    fields, or a ``Profile``.
+    """
+    if profile is None or profile is False:
+        return None
+    if profile is True:
+        return Profile()
+    if isinstance(profile, dict):
+        return Profile(**profile)
+    if isinstance(profile, Profile):
+        return profile
+    raise TypeError(f"Can't make a Profile out of {profile!r}")
+
+
+def _start_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+
+
+class StageProfiler:
+    """The profiles of one stage, written into *stage_path* by ``write``."""
+
+    def __init__(self, profile: Profile, stage_path: str):
+        self.profile = profile
+        self.stage_path = stage_path
+        self._stride = max(1, round(1 / profile.sample))
+        self._cpu = {}  # key -> cProfile.Profile
+        self._sizes = {}  # key -> Counter of (file, line) -> net bytes
+        self._counts = {}  # key -> Counter of (file, line) -> net blocks
+        self._peaks = {}  # key -> peak traced bytes
+        self._skipped = {}  # key -> why CPU profiling was skipped
+
+    def split(self, candidates: list) -> tuple[list, list]:
+        """``(sampled, rest)``: the candidates to profile, and the others."""
+        if self._stride == 1:
+            return list(candidates), []
+        sampled = candidates[:: self._stride]
+        rest = [c for k, c in enumerate(candidates) if k % self._stride]
+        return sampled, rest
+
+    def _key(self, scorer: str | None) -> str | None:
+        if self.profile.per == "stage":
+            return "stage"
+        return scorer
+
+    @contextlib.contextmanager
+    def span(self, scorer: str | None = None):
+        """Profile the enclosed code (as part of *scorer*'s profile if per scorer)."""
+        key = self._key(scorer)
+        if key is None:
+            yield
+            return
+        if self.profile.memory:
+            _start_tracing()
+            tracemalloc.reset_peak()
+            before = _snapshot()
+        with self._cpu_profiled(key):
+            try:
+                yield
+            finally:
+                if self.profile.memory:
+                    self._record_allocations(key, before)
+                    _stop_tracing()
+
+    @contextlib.contextmanager
+    def _cpu_profiled(self, key: str):
+        """Run the enclosed code under *key*'s ``cProfile`` profiler, if any."""
+        if not self.profile.cpu:
+            yield
+            return
+        with _cpu_lock:
+            profiler = self._cpu.setdefault(key, cProfile.Profile())
+            try:
+                profiler.enable()
+            except ValueError as e:  # another profiler is active (3.12+)
+                self._skipped[key] = str(e)
+                yield
+                return
+            try:
+                yield
+            finally:
+                profiler.disable()
+
+    def _record_allocations(self, key: str, before):
+        peak = tracemalloc.get_traced_memory()[1]
+        self._peaks[key] = max(self._peaks.get(key, 0), peak)
+        sizes = self._sizes.setdefault(key, Counter())
+        counts = self._counts.setdefault(key, Counter())
+        for stat in _snapshot().compare_to(before, "lineno"):
+            frame = stat.traceback[0]
+            sizes[frame.filename, frame.lineno] += stat.size_diff
+            counts[frame.filename, frame.lineno] += stat.count_diff
+
+    def _filename(self, stem: str, key: str, ext: str) -> str:
+        name = stem if key == "stage" else f"{stem}-{key}"
+        return os.path.join(self.stage_path, name + ext)
+
+    def write(self):
+        """Save the ``.prof`` files and allocation summaries."""
+        os.makedirs(self.stage_path, exist_ok=True)
+        for key, profiler in self._cpu.items():
+            profiler.dump_stats(self._filename("profile", key, ".prof"))
+        for key, reason in self._skipped.items():
+            with open(self._filename("profile", key, ".json"), "w") as f:
+                json.dump({"skipped": reason}, f, indent=2)
+        for key, sizes in self._sizes.items():
+            top = [
+                {
+                    "file": filename,
+                    "line": lineno,
+                    "size": size,
+                    "count": self._counts[key][filename, lineno],
+                }
+                for (filename, lineno), size in sizes.most_common(self.profile.top)
+            ]
+            with open(self._filename("allocations", key, ".json"), "w") as f:
+                json.dump({"peak": self._peaks[key], "top": top}, f, indent=2)
@@ -0,0 +1,184 @@
+"""Process-wide, per-host rate limits (token buckets).
+
+Every lookup to a rate-limited host takes a token from that host's bucket
+first, whoever makes it: sync and async scorers, the asyncio engine's
+threads, and the legacy ``brand.base`` functions.  A bucket holds up to
+``burst`` tokens and refills at ``rate`` tokens per second, so a host sees at
+most ``burst`` requests at once and ``rate`` requests per second on average,
+however many threads, scorers or stages are hitting it.
+
+Hosts are network locations (``'github.com'``) or the pseudo-hosts
+``'dns'`` and ``'whois'``.  ``DFLT_RATE_LIMITS`` are conservative guesses at
+the public services' ceilings; adjust them with ``set_rate_limit`` or
+``use_rate_limits``, or, for other processes, with the ``BRAND_RATE_LIMITS``
+environment variable (JSON: ``{"github.com": [rate, burst], ...}``).
+
+>>> with use_rate_limits({'example.com': (100, 2)}):
+...     waits = [acquire('example.com') for _ in range(3)]
+>>> waits[:2], 0 < waits[2] <= 0.01
+([0.0, 0.0], True)
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+
+from brand import budget
+
+RATE_LIMITS_ENV_VAR = "BRAND_RATE_LIMITS"
+
+DFLT_RATE_LIMITS = {  # host: (requests per second, burst)
+    "github.com": (10, 20),
+    "pypi.org": (20, 40),
+    "www.npmjs.com": (10, 20),
+    "www.youtube.com": (5, 10),
+    "api.opencorporates.com": (1, 5),
+    "tsdr.uspto.gov": (1, 5),
+    "api.datamuse.com": (10, 20),
+    "api.anthropic.com": (1, 5),
+    "whois": (5, 10),
+}
+
+
+class TokenBucket:
+    """*rate* tokens per second, up to *burst* (default: one second's worth).
+
+    Tokens are reserved in arrival order: ``reserve`` returns how long the
+    caller must wait for its token, so waiting happens outside the lock.
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, not {rate!r}")
+        self.rate = rate
+        self.burst = burst or max(1, math.ceil(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.wait_time = 0.0
+
+    def reserve(self) -> float:
+        """Take a token; return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate)
+            self.requests += 1
+            self.wait_time += wait
+            return wait
+
+
+_limits: dict = {}
+_buckets: dict[str, TokenBucket] = {}
+_lock = threading.Lock()
+
+
+def _reset(limits: dict):
+    with _lock:
+        _limits.clear()
+        _limits.update(limits)
+        _buckets.clear()
+
+
+def set_rate_limit(host: str, rate: float | None, burst: int | None = None):
+    """Limit *host* to *rate* requests per second (``None``: no limit)."""
+    with _lock:
+        _buckets.pop(host, None)
+        if rate is None:
+            _limits[host] = None
+        else:
+            _limits[host] = (rate, burst)
+
+
+def get_rate_limits() -> dict:
+    """The current limits, ``{host: (rate, burst)}``."""
+    return {h: limit for h, limit in _limits.items() if limit is not None}
+
+
+@contextlib.contextmanager
+def use_rate_limits(limits: dict, *, replace: bool = False):
+    """Apply *limits* (``{host: (rate, burst) or None}``) in a ``with`` block.
+
+    With *replace*, hosts not in *limits* are unlimited meanwhile.
+    """
+    previous = dict(_limits)
+    if replace:
+        _reset({})
+    for host, limit in limits.items():
+        set_rate_limit(host, *(limit if limit is not None else (None,)))
+    try:
+        yield get_rate_limits()
+    finally:
+        _reset(previous)
+
+
+def bucket(host: str) -> TokenBucket | None:
+    """*host*'s bucket, or None if it isn't rate-limited."""
+    b = _buckets.get(host)
+    if b is None:
+        limit = _limits.get(host)
+        if limit is None:
+            return None
+        with _lock:
+            b = _buckets.get(host)
+            if b is None:
+                b = _buckets[host] = TokenBucket(*limit)
+    return b
+
+
+def acquire(host: str) -> float:
+    """Wait (blocking) for *host*'s next token; return the seconds waited.
+
+    The request is first charged to the run's budget, if any (see
+    ``brand.budget``), which raises ``BudgetExhausted`` if it's spent.
+    """
+    budget.charge(host)
+    b = bucket(host)
+    if b is None:
+        return 0.0
+    wait = b.reserve()
+    if wait:
+        time.sleep(wait)
+    return wait
+
+
+async def aacquire(host: str) -> float:
+    """Async ``acquire``."""
+    budget.charge(host)
+    b = bucket(host)
+    if b is None:
+        return 0.0
+    wait = b.reserve()
+    if wait:
+        await asyncio.sleep(wait)
+    return wait
+
+
+def stats() -> dict:
+    """Requests and total wait time per rate-limited host used so far."""
+    return {
+        host: {"requests": b.requests, "wait_time": b.wait_time}
+        for host, b in list(_buckets.items())
+    }
+
+
+def _from_env() -> dict:
+    value = os.environ.get(RATE_LIMITS_ENV_VAR)
+    if not value:
+        return {}
+    return {
+        host: tuple(limit) if limit is not None else None
+        for host, limit in json.loads(value).items()
+    }
+
+
+_reset({**DFLT_RATE_LIMITS, **_from_env()})
@@ -1,8 +1,12 @@
 """Discoverable, extensible component registries for brand."""
 
+import importlib
 from collections.abc import Mapping
 from dataclasses import dataclass, field
 
+_registries: dict[str, "Registry"] = {}
+"""All registries created so far, by name (used to resolve ``ComponentRef``)."""
+
 
 @dataclass
 class ComponentMeta:
@@ -16,6 +20,8 @@ class ComponentMeta:
     parallelizable: bool = True
     description: str = ""
     requires_extras: tuple = ()
+    afunc: object = None  # Optional async variant (see ``Registry.register_async``)
+    concurrency: tuple | None = None  # (min, max) calls in flight, adapted at runtime
 
     def __call__(self, *args, **kwargs):
         return self.func(*args, **kwargs)
@@ -30,6 +36,40 @@ class ComponentMeta:
         return f"<{self.name} ({tag_str})>"
 
 
+@dataclass(frozen=True)
+class ComponentRef:
+    """A picklable reference to a registered component.
+
+    Components built by factories (closures) or registered interactively can't
+    be pickled, so they can't be shipped to worker processes as-is.  A
+    ``ComponentRef`` travels as ``(registry, name, module)`` instead and is
+    looked up again on the other side.  ``module`` is the module that performs
+    the registration; it is imported on resolution if the name is unknown
+    there (e.g. in a freshly spawned process).
+
+    >>> ref = ComponentRef('scorers', 'name_length', 'brand._scorers.visual')
+    >>> import pickle
+    >>> pickle.loads(pickle.dumps(ref))('brand')
+    5
+    """
+
+    registry: str
+    name: str
+    module: str = ""
+
+    def resolve(self) -> ComponentMeta:
+        registry = _registries.get(self.registry)
+        if (registry is None or self.name not in registry) and self.module:
+            importlib.import_module(self.module)
+            registry = _registries.get(self.registry)
+        if registry is None:
+            raise KeyError(f"No registry named {self.registry!r}")
+        return registry[self.name]
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve().func(*args, **kwargs)
+
+
 class Registry(Mapping):
     """A discoverable, extensible registry of named components.
 
@@ -53,6 +93,7 @@ class Registry(Mapping):
     def __init__(self, name: str):
         self._name = name
         self._items: dict[str, ComponentMeta] = {}
+        _registries.setdefault(name, self)
 
     # -- Registration ---------------------------------------------------------
 
@@ -66,6 +107,7 @@ class Registry(Mapping):
         parallelizable=True,
         description="",
         requires_extras=(),
+        concurrency=None,
     ):
         """Register a function. Usable as decorator with or without arguments.
 
@@ -80,6 +122,14 @@ class Registry(Mapping):
         ... def bar_func(x): return x * 2
         >>> r['bar'].cost
         'expensive'
+
+        Network components can declare the range of calls they may have in
+        flight, which the engine adapts to within (see ``brand.concurrency``):
+
+        >>> @r.register('api', requires_network=True, concurrency=(2, 32))
+        ... def api(x): return x
+        >>> r['api'].concurrency
+        (2, 32)
         """
         meta_kwargs = dict(
             cost=cost,
@@ -88,6 +138,7 @@ class Registry(Mapping):
             parallelizable=parallelizable,
             description=description,
             requires_extras=requires_extras,
+            concurrency=tuple(concurrency) if concurrency else None,
         )
 
         def decorator(func):
@@ -104,6 +155,40 @@ class Registry(Mapping):
 
         return decorator
 
+    def register_async(self, name: str):
+        """Attach an async variant to the component registered as *name*.
+
+        The async variant must accept the same arguments as the sync one.
+        Engines that run on an event loop (see ``brand.aio``) use it instead
+        of the sync function.
+
+        >>> r = Registry('_async_demo')
+        >>> _ = r.register('upper')(str.upper)
+        >>> @r.register_async('upper')
+        ... async def aupper(name):
+        ...     return name.upper()
+        >>> r['upper'].afunc is aupper
+        True
+        """
+
+        def decorator(afunc):
+            self[name].afunc = afunc
+            return afunc
+
+        return decorator
+
+    def ref(self, key: str) -> ComponentRef:
+        """Return a picklable reference to the component registered as *key*.
+
+        >>> r = Registry('_ref_demo')
+        >>> _ = r.register('double')(lambda x: x * 2)
+        >>> r.ref('double')(4)
+        8
+        """
+        meta = self[key]
+        module = getattr(meta.func, "__module__", None) or ""
+        return ComponentRef(self._name, key, module)
+
     # -- Mapping interface ----------------------------------------------------
 
     def __getitem__(self, key: str) -> ComponentMeta:
@@ -0,0 +1,349 @@
+"""Retries, backoff and circuit breakers for network lookups.
+
+A lookup that fails transiently (connection error, timeout, HTTP 429 or 5xx,
+DNS ``EAI_AGAIN``, a WHOIS server's quota notice) is retried a bounded number
+of times with jittered exponential backoff, honoring ``Retry-After``.  If it
+still fails, or if its host's circuit breaker is open, the lookup raises
+``Indeterminate`` rather than guessing an answer.  Scorers let it propagate,
+so the pipeline records ``{'error': 'Indeterminate: ...'}``:
+
+* such results are never journaled or mistaken for answers, so re-running the
+  stage (e.g. with ``resume_from``) re-queues exactly those candidates,
+* ``Filter(..., keep_indeterminate=True)`` lets them through to a later stage
+  instead of dropping them,
+* ``metrics.json`` counts them under ``error_types['Indeterminate']``.
+
+Each host (network location, or ``'dns'``, ``'whois'``) has a process-wide
+``CircuitBreaker``: after ``failure_threshold`` consecutive failures it opens,
+failing lookups at once for ``reset_timeout`` seconds, then lets one trial
+lookup through.  A lookup the run's budget would refuse is refused before it
+takes the trial, and a trial cut short by the run (budget refusal,
+cancellation) gives it back; any other exception counts as a failure.
+Throttling (429, quota notices) is retried but counts as a
+sign of life for the breaker: the host is up, just busy.
+
+>>> attempts = []
+>>> def flaky():
+...     attempts.append(1)
+...     if len(attempts) < 3:
+...         raise Retryable('HTTP 503')
+...     return 'ok'
+>>> with use_retry_policy(RetryPolicy(attempts=3, base_delay=0)):
+...     call('flaky.test', flaky)
+'ok'
+>>> def down():
+...     raise Retryable('HTTP 503')
+>>> with use_retry_policy(RetryPolicy(attempts=2, base_delay=0)):
+...     call('down.test', down)
+Traceback (most recent call last):
+  ...
+brand.resilience.Indeterminate: down.test: HTTP 503 (after 2 attempts)
+"""
+
+import asyncio
+import contextlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from brand import budget
+from brand.budget import BudgetExhausted
+
+INDETERMINATE = "Indeterminate"
+
+
+class Indeterminate(Exception):
+    """The answer of a lookup couldn't be determined (retries exhausted,
+    circuit open, ambiguous response)."""
+
+
+class Retryable(Exception):
+    """A transient failure of one attempt (raised by the attempt functions
+    given to ``call`` and ``acall``).
+
+    *throttled* failures (the host asking us to slow down) are retried but
+    don't count against the host's circuit breaker.
+    """
+
+    def __init__(
+        self, reason: str, *, retry_after: float | None = None, throttled=False
+    ):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.throttled = throttled
+
+
+def is_indeterminate(result) -> bool:
+    """Whether a scorer result is an ``Indeterminate`` error result.
+
+    >>> is_indeterminate({'error': 'Indeterminate: github.com: HTTP 503'})
+    True
+    >>> is_indeterminate({'error': 'ValueError: bad'}), is_indeterminate(False)
+    (False, False)
+    """
+    return (
+        isinstance(result, dict)
+        and str(result.get("error", "")).startswith(INDETERMINATE + ":")
+    )
+
+
+# ---------------------------------------------------------------------------
+# Retry policy
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """At most *attempts* attempts, waiting a random time in
+    ``[0, min(max_delay, base_delay * 2**i)]`` after the *i*-th failure (at
+    least the server's ``Retry-After``, capped by *max_delay*)."""
+
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+
+    def delay(self, failures: int, retry_after: float | None = None) -> float:
+        cap = min(self.max_delay, self.base_delay * 2**failures)
+        backoff = random.uniform(0, cap)
+        if retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_delay))
+        return backoff
+
+
+DFLT_RETRY_POLICY = RetryPolicy()
+_policy = DFLT_RETRY_POLICY
+
+
+def set_retry_policy(policy: RetryPolicy):
+    """Use *policy* for all lookups of this process."""
+    global _policy
+    _policy = policy
+
+
+def get_retry_policy() -> RetryPolicy:
+    return _policy
+
+
+@contextlib.contextmanager
+def use_retry_policy(policy: RetryPolicy):
+    """Use *policy* for the duration of a ``with`` block."""
+    previous = _policy
+    set_retry_policy(policy)
+    try:
+        yield policy
+    finally:
+        set_retry_policy(previous)
+
+
+# ---------------------------------------------------------------------------
+# Circuit breakers
+# ---------------------------------------------------------------------------
+
+DFLT_FAILURE_THRESHOLD = 5
+DFLT_RESET_TIMEOUT = 30.0
+
+
+class CircuitBreaker:
+    """Closed, open (for *reset_timeout* seconds after *failure_threshold*
+    consecutive failures), then half-open (one trial call at a time).
+
+    >>> breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    >>> breaker.record_failure(); breaker.record_failure()
+    >>> breaker.state, breaker.allow()
+    ('open', False)
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DFLT_FAILURE_THRESHOLD,
+        reset_timeout: float = DFLT_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+        self.opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        """Whether a call may go out now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def release(self):
+        """Give back the trial call of a half-open breaker, which said nothing
+        about the host (the run refused or cancelled it)."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "opened": self.opened, "rejected": self.rejected}
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breaker_settings: dict = {}
+_breakers_lock = threading.Lock()
+
+
+def configure_breakers(**settings):
+    """Set ``CircuitBreaker`` arguments for breakers created from now on."""
+    _breaker_settings.update(settings)
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """The process-wide breaker of *host* (created on first use)."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(**_breaker_settings))
+    return breaker
+
+
+def reset_breakers():
+    """Close (forget) all circuit breakers."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def breaker_stats() -> dict:
+    """``CircuitBreaker.snapshot`` of every host used so far."""
+    return {host: b.snapshot() for host, b in list(_breakers.items())}
+
+
+# ---------------------------------------------------------------------------
+# Calling with retries
+# ---------------------------------------------------------------------------
+
+
+def _check(breaker: CircuitBreaker, host: str):
+    budget.check(host)  # a refused request mustn't take a half-open trial
+    if not breaker.allow():
+        raise Indeterminate(f"{host}: circuit open")
+
+
+def _aborted(breaker: CircuitBreaker, error: BaseException):
+    """Record an attempt that raised *error* (other than ``Retryable``)."""
+    if isinstance(error, BudgetExhausted) or not isinstance(error, Exception):
+        breaker.release()  # refused or cancelled (CancelledError, Ctrl-C)
+    else:
+        breaker.record_failure()
+
+
+def _failed(breaker, host, error, failures, policy) -> float:
+    """Record a failed attempt; return the delay before the next one, or raise
+    ``Indeterminate`` if it was the last."""
+    if error.throttled:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    if failures >= policy.attempts:
+        raise Indeterminate(f"{host}: {error} (after {failures} attempts)") from error
+    return policy.delay(failures - 1, error.retry_after)
+
+
+def call(host: str, attempt, *, policy: RetryPolicy | None = None):
+    """Return ``attempt()``, retrying it while it raises ``Retryable``."""
+    policy = policy or _policy
+    breaker = get_breaker(host)
+    for failures in range(1, policy.attempts + 1):
+        _check(breaker, host)
+        try:
+            result = attempt()
+        except Retryable as e:
+            time.sleep(_failed(breaker, host, e, failures, policy))
+        except BaseException as e:
+            _aborted(breaker, e)
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+async def acall(host: str, attempt, *, policy: RetryPolicy | None = None):
+    """Async ``call``: return ``await attempt()``, retrying on ``Retryable``."""
+    policy = policy or _policy
+    breaker = get_breaker(host)
+    for failures in range(1, policy.attempts + 1):
+        _check(breaker, host)
+        try:
+            result = await attempt()
+        except Retryable as e:
+            await asyncio.sleep(_failed(breaker, host, e, failures, policy))
+        except BaseException as e:
+            _aborted(breaker, e)
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+def check_status(status_code: int, headers=None):
+    """Raise ``Retryable`` for HTTP 429 (throttled) and 5xx responses."""
+    if status_code == 429:
+        retry_after = retry_after_seconds((headers or {}).get("Retry-After"))
+        raise Retryable("HTTP 429", retry_after=retry_after, throttled=True)
+    if status_code >= 500:
+        raise Retryable(f"HTTP {status_code}")
+
+
+def json_body(response, host: str):
+    """The JSON body of a 200 *response* from *host*, or raise ``Indeterminate``.
+
+    >>> from types import SimpleNamespace
+    >>> json_body(SimpleNamespace(status_code=403), 'api.example.com')
+    Traceback (most recent call last):
+      ...
+    brand.resilience.Indeterminate: api.example.com: HTTP 403
+    """
+    if response.status_code != 200:
+        raise Indeterminate(f"{host}: HTTP {response.status_code}")
+    try:
+        return response.json()
+    except ValueError as e:
+        raise Indeterminate(f"{host}: unreadable response ({e})") from e
+
+
+def retry_after_seconds(value) -> float | None:
+    """A ``Retry-After`` header value in seconds (None if absent or a date).
+
+    >>> retry_after_seconds('7'), retry_after_seconds(None)
+    (7.0, None)
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,223 @@
+"""A persistent, cross-project index of the names pipelines have seen.
+
+With ``record_seen=True``, every name that goes through ``run_pipeline`` (or
+``iter_pipeline``, ``arun_pipeline``) is recorded in the ``seen.sqlite`` index
+of the pipelines folder, with the last stage it reached, the project, and, if
+a Filter dropped it, why (the first rule it failed, e.g. ``'dns_com: False'``,
+or ``'top_n (50)'``).  Names that made it through every stage are recorded at
+stage ``len(stages)``, of type ``'final'``, with no ``dropped_by``.  A name
+seen again is recorded anew: the index keeps its latest run (Filter stages
+reused from the stage cache don't record their drops again).
+
+Generate stages can then skip or defer names in bulk, without loading old
+projects: ``Generate('cvcvcv', seen='skip')`` yields only names never seen,
+``seen='skip_dropped'`` also yields the names that survived before, and
+``seen='defer'`` yields unseen names first and the others last.
+
+>>> import os, tempfile
+>>> path = os.path.join(tempfile.mkdtemp(), SEEN_INDEX_FILENAME)
+>>> with SeenIndex(path) as index:
+...     index.record('lumex', project='p', stage=1, stage_type='filter',
+...                  dropped_by='dns_com: False')
+...     index.record('figiri', project='p', stage=2, stage_type='final')
+>>> with SeenIndex(path) as index:
+...     index['lumex']['dropped_by'], len(index)
+...     list(index.select(['vox', 'lumex', 'figiri'], 'skip_dropped'))
+('dns_com: False', 2)
+['vox', 'figiri']
+"""
+
+import contextlib
+import contextvars
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from brand.config import PIPELINES_DIR
+
+SEEN_INDEX_FILENAME = "seen.sqlite"
+SEEN_MODES = ("skip", "skip_dropped", "defer")
+DFLT_BATCH_SIZE = 10_000
+_LOOKUP_SIZE = 500  # names per ``IN (...)`` query
+
+_COLUMNS = ("name", "project", "stage", "stage_type", "dropped_by", "updated")
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    name TEXT PRIMARY KEY,
+    project TEXT,
+    stage INTEGER,
+    stage_type TEXT,
+    dropped_by TEXT,
+    updated TEXT
+) WITHOUT ROWID
+"""
+
+
+def index_path(pipeline_dir: str | None = None) -> str:
+    """The index of the pipelines folder *pipeline_dir* (default: ``PIPELINES_DIR``)."""
+    return os.path.join(pipeline_dir or PIPELINES_DIR, SEEN_INDEX_FILENAME)
+
+
+class SeenIndex:
+    """The ``seen.sqlite`` index at *path* (see the module docstring).
+
+    Records are buffered and written *batch_size* at a time (and on
+    ``flush``/``close``).  Safe to use from several threads.
+    """
+
+    def __init__(self, path: str, *, batch_size: int = DFLT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._updated = datetime.now().isoformat(timespec="seconds")
+
+    def record(
+        self,
+        name: str,
+        *,
+        project: str | None,
+        stage: int,
+        stage_type: str,
+        dropped_by: str | None = None,
+    ):
+        """Record that *name* reached *stage* (and was dropped there, if
+        *dropped_by* says why)."""
+        row = (name, project, stage, stage_type, dropped_by, self._updated)
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._write()
+
+    def _write(self):
+        if self._pending and self._db is not None:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO seen VALUES (?, ?, ?, ?, ?, ?)", self._pending
+            )
+            self._db.commit()
+            self._pending = []
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
+    def close(self):
+        with self._lock:
+            self._write()
+            if self._db is not None:
+                self._db.close()
+                self._db = None  # late records (from stopped threads) are dropped
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, names) -> dict:
+        """``{name: record}`` of those of *names* in the index."""
+        names = list(names)
+        found = {}
+        with self._lock:
+            self._write()
+            for k in range(0, len(names), _LOOKUP_SIZE):
+                chunk = names[k : k + _LOOKUP_SIZE]
+                rows = self._db.execute(
+                    f"SELECT * FROM seen WHERE name IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                found.update((row[0], dict(zip(_COLUMNS, row))) for row in rows)
+        return found
+
+    def __getitem__(self, name: str) -> dict:
+        found = self.lookup([name])
+        if name not in found:
+            raise KeyError(name)
+        return found[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self.lookup([name])
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._write()
+            return self._db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def select(self, names, mode: str):
+        """Yield *names* as *mode* (one of ``SEEN_MODES``) says, lazily."""
+        if mode not in SEEN_MODES:
+            raise ValueError(f"Unknown seen mode {mode!r}; use one of {SEEN_MODES}")
+        deferred = []
+        it = iter(names)
+        while chunk := [name for _, name in zip(range(_LOOKUP_SIZE), it)]:
+            found = self.lookup(chunk)
+            for name in chunk:
+                record = found.get(name)
+                if record is None:
+                    yield name
+                elif mode == "skip_dropped" and record["dropped_by"] is None:
+                    yield name
+                elif mode == "defer":
+                    deferred.append(name)
+        yield from deferred
+
+
+# ---------------------------------------------------------------------------
+# The index of the running pipeline
+# ---------------------------------------------------------------------------
+
+# ``(index, project, record)`` of the current run: a context variable, so that
+# concurrent runs (threads, coroutines) each record into their own index.
+_run: contextvars.ContextVar = contextvars.ContextVar("brand_seen_run", default=None)
+
+
+def current_index() -> SeenIndex | None:
+    """The index of the running pipeline, if any."""
+    run = _run.get()
+    return run[0] if run is not None else None
+
+
+def is_recording() -> bool:
+    run = _run.get()
+    return run is not None and run[2]
+
+
+@contextlib.contextmanager
+def use_index(path: str, *, project: str | None = None, record: bool = True):
+    """Open the index at *path* for a pipeline run (of *project*), recording
+    names into it unless *record* is false."""
+    index = SeenIndex(path)
+    token = _run.set((index, project, record))
+    try:
+        yield index
+    finally:
+        _run.reset(token)
+        index.close()
+
+
+def record(name: str, *, stage: int, stage_type: str, dropped_by: str | None = None):
+    """Record *name* in the running pipeline's index, if it records names."""
+    run = _run.get()
+    if run is not None and run[2]:
+        index, project, _ = run
+        index.record(
+            name,
+            project=project,
+            stage=stage,
+            stage_type=stage_type,
+            dropped_by=dropped_by,
+        )
+
+
+def select(names, mode: str):
+    """``SeenIndex.select`` on the running pipeline's index (or the default one)."""
+    if (index := current_index()) is not None:
+        yield from index.select(names, mode)
+        return
+    with SeenIndex(index_path()) as index:
+        yield from index.select(names, mode)
@@ -23,6 +23,10 @@ class Generate:
         Name of a registered generator (e.g. ``'cvcvcv'``, ``'ai_suggest'``).
     params : dict
         Keyword arguments forwarded to the generator function.
+    seen : str | None
+        What to do with names already seen by a pipeline (see ``brand.seen``):
+        ``'skip'`` them, ``'skip_dropped'`` (skip those a Filter dropped), or
+        ``'defer'`` them (yield unseen names first).
 
     Examples
     --------
@@ -33,16 +37,21 @@ class Generate:
 
     generator: str
     params: dict = field(default_factory=dict)
+    seen: str | None = None
 
     def to_dict(self):
         d = {"type": "generate", "generator": self.generator}
         if self.params:
             d["params"] = self.params
+        if self.seen is not None:
+            d["seen"] = self.seen
         return d
 
     @classmethod
     def from_dict(cls, d):
-        return cls(generator=d["generator"], params=d.get("params", {}))
+        return cls(
+            generator=d["generator"], params=d.get("params", {}), seen=d.get("seen")
+        )
 
 
 @dataclass
@@ -106,6 +115,10 @@ class Filter:
         Scorer name to rank by. Defaults to ``'aggregate'``.
     rules : dict | None
         ``{scorer_name: required_value}`` mapping.
+    keep_indeterminate : bool
+        Let candidates whose result for a rule's scorer is indeterminate (see
+        ``brand.resilience``) pass that rule, so a later stage can re-check
+        them, rather than dropping them.
 
     Examples
     --------
@@ -118,6 +131,7 @@ class Filter:
     top_pct: float | None = None
     by: str | None = None
     rules: dict | None = None
+    keep_indeterminate: bool = False
 
     def to_dict(self):
         d = {"type": "filter"}
@@ -129,6 +143,8 @@ class Filter:
             d["by"] = self.by
         if self.rules is not None:
             d["rules"] = self.rules
+        if self.keep_indeterminate:
+            d["keep_indeterminate"] = True
         return d
 
     @classmethod
@@ -138,9 +154,47 @@ class Filter:
             top_pct=d.get("top_pct"),
             by=d.get("by"),
             rules=d.get("rules"),
+            keep_indeterminate=d.get("keep_indeterminate", False),
         )
 
 
+@dataclass
+class Node:
+    """A named step of a pipeline DAG: a run of stages fed by node ``after``.
+
+    Parameters
+    ----------
+    stages : stage | list
+        The stage (or list of stages) this node runs, in order.
+    after : str | None
+        Name of the node whose output candidates feed this one.  Root nodes
+        (``None``) start from the run's ``names`` or from their own Generate.
+
+    Examples
+    --------
+    >>> n = Node(Filter(rules={'dns_com': True}), after='scored')
+    >>> n.to_dict()
+    {'stages': [{'type': 'filter', 'rules': {'dns_com': True}}], 'after': 'scored'}
+    """
+
+    stages: list = field(default_factory=list)
+    after: str | None = None
+
+    def __post_init__(self):
+        if not isinstance(self.stages, list):
+            self.stages = [self.stages]
+
+    def to_dict(self):
+        d = {"stages": stages_to_dicts(self.stages)}
+        if self.after is not None:
+            d["after"] = self.after
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(stages=stages_from_dicts(d.get("stages", [])), after=d.get("after"))
+
+
 # ---------------------------------------------------------------------------
 # Serialization helpers
 # ---------------------------------------------------------------------------
@@ -156,7 +210,7 @@ def stage_from_dict(d: dict):
     """Deserialize a stage dict into its dataclass.
 
     >>> stage_from_dict({'type': 'generate', 'generator': 'cvcvcv'})
-    Generate(generator='cvcvcv', params={})
+    Generate(generator='cvcvcv', params={}, seen=None)
     """
     stage_type = d.get("type")
     if stage_type not in _STAGE_TYPES:
@@ -0,0 +1,558 @@
+"""Local stand-ins for the services network scorers talk to.
+
+``StandIns`` runs, on localhost:
+
+* an HTTP server answering like GitHub, PyPI, npm, YouTube, OpenCorporates,
+  USPTO TSDR, Datamuse and the Anthropic Messages API (``POST /v1/messages``),
+* a DNS server (UDP, A queries),
+* a WHOIS server (the port-43 protocol: one query line, a text reply),
+
+each with a configurable ``Service`` behavior: latency distribution, share of
+taken names, injected 429s (throttling), 5xx errors and timeouts, and an
+optional server-side rate limit.  Used as a context manager, it also points
+the scorers at itself (see ``brand.endpoints``), so whole pipelines can be
+load-tested offline:
+
+>>> from brand.registry import scorers
+>>> with StandIns(default=Service(taken=0.0)) as standins:
+...     scorers['github_org']('lumex'), scorers['dns_com']('lumex')
+(True, True)
+>>> standins.stats['github.com']['requests']
+1
+
+Whether a name is taken is decided by a hash of the service and the name, so
+results are reproducible across runs (DNS and WHOIS agree with each other).
+
+To serve stand-ins for other processes (e.g. ``brand.distributed`` workers)::
+
+    python -m brand.standins --latency 0.05 --throttle-rate 0.01
+
+and export the ``BRAND_ENDPOINTS`` line it prints.
+"""
+
+import json
+import math
+import random
+import socketserver
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from brand import endpoints
+
+_LISTEN_BACKLOG = 1024
+_POLL_SECONDS = 0.05  # how quickly close() stops the servers
+_DOMAIN = "domain"  # shared key of the DNS and WHOIS stand-ins
+
+
+# ---------------------------------------------------------------------------
+# Behavior
+# ---------------------------------------------------------------------------
+
+
+def as_latency(spec):
+    """A ``rng -> seconds`` sampler from a latency *spec*.
+
+    *spec* is a number (constant seconds), a ``(low, high)`` pair (uniform),
+    a dict ``{'dist': 'lognormal', 'median': ..., 'sigma': ...}``,
+    ``{'dist': 'exponential', 'mean': ...}`` or
+    ``{'dist': 'uniform', 'low': ..., 'high': ...}``, or a callable taking a
+    ``random.Random``.
+
+    >>> rng = random.Random(0)
+    >>> as_latency(0.05)(rng)
+    0.05
+    >>> 0.01 <= as_latency((0.01, 0.02))(rng) <= 0.02
+    True
+    """
+    if callable(spec):
+        return spec
+    if spec is None or isinstance(spec, (int, float)):
+        seconds = float(spec or 0)
+        return lambda rng: seconds
+    if isinstance(spec, (tuple, list)):
+        low, high = spec
+        return lambda rng: rng.uniform(low, high)
+    if isinstance(spec, dict):
+        spec = dict(spec)
+        dist = spec.pop("dist")
+        if dist == "lognormal":
+            mu, sigma = math.log(spec["median"]), spec.get("sigma", 0.5)
+            return lambda rng: rng.lognormvariate(mu, sigma)
+        if dist == "exponential":
+            rate = 1 / spec["mean"]
+            return lambda rng: rng.expovariate(rate)
+        if dist == "uniform":
+            return as_latency((spec["low"], spec["high"]))
+        raise ValueError(f"Unknown latency distribution {dist!r}")
+    raise TypeError(f"Can't make a latency out of {spec!r}")
+
+
+@dataclass
+class Service:
+    """How a stand-in service behaves.
+
+    Parameters
+    ----------
+    latency
+        Response delay (see ``as_latency``).
+    taken : float
+        Share of names that exist on the service (registered domain, existing
+        GitHub org, matching company, ...).
+    throttle_rate : float
+        Share of requests refused as rate-limited: HTTP 429 (with
+        ``Retry-After``), DNS REFUSED, or a WHOIS limit notice.
+    error_rate : float
+        Share of requests failing: HTTP 503, DNS SERVFAIL, or a WHOIS
+        connection closed without a reply.
+    timeout_rate : float
+        Share of requests left unanswered for *hang* seconds.
+    rate_limit : float | None
+        Requests per second (token bucket of *burst* tokens) beyond which
+        requests are throttled.
+    """
+
+    latency: object = 0.0
+    taken: float = 0.5
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    timeout_rate: float = 0.0
+    rate_limit: float | None = None
+    burst: int | None = None
+    hang: float = 30.0
+    retry_after: int = 1
+
+    def __post_init__(self):
+        self._latency = as_latency(self.latency)
+
+
+class _Bucket:
+    """Token bucket: *rate* tokens per second, up to *burst*."""
+
+    def __init__(self, rate: float, burst: int | None):
+        self.rate = rate
+        self.capacity = burst or max(1, math.ceil(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def is_taken(service: str, name: str, share: float) -> bool:
+    """Whether *name* exists on *service*, for a *share* of taken names.
+
+    >>> is_taken('github.com', 'lumex', 0.0), is_taken('github.com', 'lumex', 1.0)
+    (False, True)
+    """
+    return zlib.crc32(f"{service}:{name.lower()}".encode()) % 10_000 < share * 10_000
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+def _last_segment(path: str) -> str:
+    return [s for s in path.split("/") if s][-1] if path.strip("/") else ""
+
+
+def _opencorporates(host, path, query, body, share):
+    q = query.get("q", "")
+    companies = (
+        [{"company": {"name": f"{q.upper()} INC", "jurisdiction_code": "us_de"}}]
+        if is_taken(host, q, share)
+        else []
+    )
+    return 200, {"results": {"companies": companies}}
+
+
+def _uspto(host, path, query, body, share):
+    mark = query.get("td", "")
+    if is_taken(host, mark, share):
+        return 200, {"trademarks": [{"mark": mark.upper(), "status": "LIVE"}]}
+    return 404, {}
+
+
+def _datamuse(host, path, query, body, share):
+    word = query.get("sl", "")
+    n = min(int(query.get("max", 10)), 3 if is_taken(host, word, share) else 1)
+    suffixes = ["", "s", "er"][:n]
+    return 200, [
+        {"word": word + suffix, "score": 100 - k} for k, suffix in enumerate(suffixes)
+    ]
+
+
+def _rating(name: str) -> dict:
+    scores = {
+        key: 1 + zlib.crc32(f"{key}:{name}".encode()) % 10
+        for key in (
+            "memorability",
+            "appeal",
+            "positive_connotation",
+            "global_safety",
+            "domain_fit",
+        )
+    }
+    return {
+        "name": name,
+        **scores,
+        "overall": round(sum(scores.values()) / len(scores), 1),
+        "rationale": "Stand-in rating.",
+    }
+
+
+def _anthropic(host, path, query, body, share):
+    request = json.loads(body or b"{}")
+    prompt = "".join(
+        m["content"] if isinstance(m["content"], str) else m["content"][0]["text"]
+        for m in request.get("messages", [])
+    )
+    _, _, names_list = prompt.rpartition("Names to rate:")
+    names = [line.strip().lstrip("- ") for line in names_list.splitlines()]
+    names = [n for n in names if n]
+    return 200, {
+        "id": "msg_standin",
+        "type": "message",
+        "role": "assistant",
+        "model": request.get("model", "stand-in"),
+        "content": [{"type": "text", "text": json.dumps([_rating(n) for n in names])}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": len(prompt) // 4, "output_tokens": 60 * len(names)},
+    }
+
+
+def _profile_page(host, path, query, body, share):
+    """GitHub, PyPI, npm, YouTube, ...: 200 if the name exists, else 404."""
+    name = _last_segment(path)
+    if is_taken(host, name, share):
+        return 200, f"<html><title>{name}</title></html>"
+    return 404, "<html><title>Not Found</title></html>"
+
+
+_RESPONDERS = {
+    "api.opencorporates.com": _opencorporates,
+    "tsdr.uspto.gov": _uspto,
+    "api.datamuse.com": _datamuse,
+    "api.anthropic.com": _anthropic,
+}
+
+
+class _HttpHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle(b"")
+
+    def do_POST(self):
+        self._handle(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+    def _handle(self, body: bytes):
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        standins = self.server.standins
+        outcome, service = standins._decide(host)
+        if outcome == "timeouts":
+            standins._hang(service)
+            self.close_connection = True
+            return
+        if outcome == "throttled":
+            retry_after = {"Retry-After": service.retry_after}
+            self._send(429, {"error": "rate limited"}, retry_after)
+        elif outcome == "errors":
+            self._send(503, {"error": "service unavailable"})
+        else:
+            responder = _RESPONDERS.get(host, _profile_page)
+            self._send(*responder(host, "/" + path, query, body, service.taken))
+
+    def _send(self, status: int, payload, headers=None):
+        if isinstance(payload, str):
+            data, content_type = payload.encode(), "text/html"
+        else:
+            data, content_type = json.dumps(payload).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _HttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = _LISTEN_BACKLOG
+
+
+# ---------------------------------------------------------------------------
+# DNS
+# ---------------------------------------------------------------------------
+
+_RCODES = {"ok": 0, "errors": 2, "throttled": 5}  # NOERROR, SERVFAIL, REFUSED
+
+
+def _question(data: bytes) -> tuple[str, int]:
+    """The queried name of a DNS query, and the offset just past its question."""
+    labels, offset = [], 12
+    while data[offset]:
+        length = data[offset]
+        labels.append(data[offset + 1 : offset + 1 + length].decode("idna"))
+        offset += 1 + length
+    return ".".join(labels), offset + 5
+
+
+class _DnsHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        name, end = _question(data)
+        standins = self.server.standins
+        outcome, service = standins._decide("dns", key=_DOMAIN)
+        if outcome == "timeouts":
+            return  # no reply; the client times out
+        rcode = _RCODES[outcome]
+        answer = b""
+        if outcome == "ok":
+            if is_taken(_DOMAIN, name, service.taken):
+                answer = struct.pack("!HHHIH4B", 0xC00C, 1, 1, 60, 4, 127, 0, 0, 1)
+            else:
+                rcode = 3  # NXDOMAIN
+        (query_id,) = struct.unpack("!H", data[:2])
+        header = struct.pack(
+            "!HHHHHH", query_id, 0x8180 | rcode, 1, 1 if answer else 0, 0, 0
+        )
+        sock.sendto(header + data[12:end] + answer, self.client_address)
+
+
+class _DnsServer(socketserver.ThreadingUDPServer):
+    daemon_threads = True
+
+
+# ---------------------------------------------------------------------------
+# WHOIS
+# ---------------------------------------------------------------------------
+
+
+class _WhoisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        domain = self.rfile.readline().decode("idna").strip()
+        standins = self.server.standins
+        outcome, service = standins._decide("whois", key=_DOMAIN)
+        if outcome == "timeouts":
+            standins._hang(service)
+            return
+        if outcome == "errors":
+            return  # connection closed without a reply
+        if outcome == "throttled":
+            reply = "WHOIS LIMIT EXCEEDED - SEE WWW.PIR.ORG/WHOIS FOR DETAILS\r\n"
+        elif is_taken(_DOMAIN, domain, service.taken):
+            reply = (
+                f"   Domain Name: {domain.upper()}\r\n"
+                "   Registrar: Stand-in Registrar\r\n"
+            )
+        else:
+            reply = f'{endpoints.WHOIS_NO_MATCH} "{domain.upper()}".\r\n'
+        self.wfile.write(reply.encode())
+
+
+class _WhoisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = _LISTEN_BACKLOG
+
+
+# ---------------------------------------------------------------------------
+# All together
+# ---------------------------------------------------------------------------
+
+
+class StandIns:
+    """HTTP, DNS and WHOIS stand-ins on *host*.
+
+    Parameters
+    ----------
+    services : dict | None
+        ``Service`` per host (``'github.com'``, ``'api.anthropic.com'``, ...)
+        or pseudo-host (``'dns'``, ``'whois'``).
+    default : Service | None
+        Behavior of the services not in *services*.
+    http_port, dns_port, whois_port : int
+        Ports to listen on (0 picks free ones; see ``.endpoints``).
+    seed : int | None
+        Seed of the latency and fault sampling.
+
+    ``stats`` counts, per service, the ``requests`` and their outcomes
+    (``ok``, ``throttled``, ``errors``, ``timeouts``).
+    """
+
+    def __init__(
+        self,
+        services: dict | None = None,
+        *,
+        default: Service | None = None,
+        host: str = "127.0.0.1",
+        http_port: int = 0,
+        dns_port: int = 0,
+        whois_port: int = 0,
+        seed: int | None = None,
+    ):
+        self.services = dict(services or {})
+        self.default = default or Service()
+        self.host = host
+        self._ports = {"http": http_port, "dns": dns_port, "whois": whois_port}
+        self._rng = random.Random(seed)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._servers = []
+        self._redirect = None
+        self.stats: dict[str, Counter] = {}
+
+    def service(self, name: str) -> Service:
+        return self.services.get(name, self.default)
+
+    def _decide(self, name: str, *, key: str | None = None) -> tuple[str, Service]:
+        """Sleep the service's latency; return the outcome of this request."""
+        service = self.service(name)
+        with self._lock:
+            draw, delay = self._rng.random(), service._latency(self._rng)
+            stats = self.stats.setdefault(name, Counter())
+            stats["requests"] += 1
+        if service.rate_limit is not None:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                bucket = self._buckets.setdefault(
+                    name, _Bucket(service.rate_limit, service.burst)
+                )
+            if not bucket.take():
+                draw = -1  # throttled
+        if delay > 0:
+            time.sleep(delay)
+        if draw < service.throttle_rate:
+            outcome = "throttled"
+        elif draw < service.throttle_rate + service.error_rate:
+            outcome = "errors"
+        elif draw < service.throttle_rate + service.error_rate + service.timeout_rate:
+            outcome = "timeouts"
+        else:
+            outcome = "ok"
+        with self._lock:
+            stats[outcome] += 1
+        return outcome, service
+
+    def _hang(self, service: Service):
+        self._stopping.wait(service.hang)
+
+    @property
+    def endpoints(self) -> dict:
+        """``brand.endpoints`` settings pointing at these stand-ins."""
+        http, dns, whois = (s.server_address for s in self._servers)
+        return {
+            "http": f"http://{http[0]}:{http[1]}",
+            "dns": f"{dns[0]}:{dns[1]}",
+            "whois": f"{whois[0]}:{whois[1]}",
+        }
+
+    def environ(self) -> dict:
+        """Environment variables pointing other processes at these stand-ins."""
+        return {endpoints.ENDPOINTS_ENV_VAR: json.dumps(self.endpoints)}
+
+    def start(self):
+        """Start serving (without redirecting the scorers; see ``__enter__``)."""
+        for server_cls, handler, port in (
+            (_HttpServer, _HttpHandler, self._ports["http"]),
+            (_DnsServer, _DnsHandler, self._ports["dns"]),
+            (_WhoisServer, _WhoisHandler, self._ports["whois"]),
+        ):
+            server = server_cls((self.host, port), handler)
+            server.standins = self
+            threading.Thread(
+                target=server.serve_forever, args=(_POLL_SECONDS,), daemon=True
+            ).start()
+            self._servers.append(server)
+        return self
+
+    def close(self):
+        self._stopping.set()
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def __enter__(self):
+        self.start()
+        self._redirect = endpoints.use_endpoints(**self.endpoints)
+        self._redirect.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._redirect.__exit__(*exc)
+        self.close()
+
+
+def serve(
+    *,
+    host: str = "127.0.0.1",
+    http_port: int = 8080,
+    dns_port: int = 5353,
+    whois_port: int = 4343,
+    latency: str = "0",
+    taken: float = 0.5,
+    throttle_rate: float = 0.0,
+    error_rate: float = 0.0,
+    timeout_rate: float = 0.0,
+    rate_limit: float | None = None,
+):
+    """Serve stand-ins (same behavior for every service) until interrupted.
+
+    *latency* is seconds, or a JSON latency spec (see ``as_latency``).
+    """
+    service = Service(
+        latency=json.loads(latency),
+        taken=float(taken),
+        throttle_rate=float(throttle_rate),
+        error_rate=float(error_rate),
+        timeout_rate=float(timeout_rate),
+        rate_limit=None if rate_limit is None else float(rate_limit),
+    )
+    standins = StandIns(
+        default=service,
+        host=host,
+        http_port=int(http_port),
+        dns_port=int(dns_port),
+        whois_port=int(whois_port),
+    ).start()
+    for key, value in standins.environ().items():
+        print(f"export {key}='{value}'", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standins.close()
+
+
+if __name__ == "__main__":
+    from argh import dispatch_command
+
+    dispatch_command(serve)
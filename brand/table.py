@@ -0,0 +1,537 @@
+"""Columnar candidate container.
+
+The default pipeline representation of a candidate is a dict
+``{'name': ..., 'scores': {...}}``, one per name.  For millions of names, that
+means gigabytes of small Python objects, and every Filter walks every dict.
+
+``CandidateTable`` stores the same information column by column:
+
+* a ``names`` column,
+* one typed NumPy column per scorer (``bool``, ``int64``, ``float64`` or
+  ``object``) with a presence mask,
+* scorers returning dicts (``sound_symbolism``, ``letter_balance``, ...) are
+  flattened into one sub-column per key (``'letter_balance.ascender_ratio'``).
+
+Values that don't fit a column's type (error dicts, ``None``, the odd int in a
+float column) are kept aside, per row, so nothing is lost.  Filter rules and
+rankings run as vectorized masks and stable argsorts on the typed columns,
+falling back to the exact dict-based logic only for those odd rows.
+
+A table is a sequence of read-only dict-like views, so code written for
+``results['candidates']`` keeps working:
+
+>>> t = CandidateTable(['figiri', 'lumex', 'vox'])
+>>> t.set_scores('name_length', [6, 5, 3])
+>>> t.set_scores('letter_balance', [{'has_descenders': True}, {'has_descenders': False}, {'has_descenders': False}])
+>>> t[0]['scores']['letter_balance']
+{'has_descenders': True}
+>>> [c['name'] for c in t.select(rules={'name_length': 4}, top_n=1, by='name_length')]
+['figiri']
+>>> t.to_dicts()[2]
+{'name': 'vox', 'scores': {'name_length': 3, 'letter_balance': {'has_descenders': False}}}
+
+Requires NumPy (``pip install brand[columnar]``).
+"""
+
+import math
+import operator
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+_MISSING = object()
+
+_NP_OPS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_DTYPES = {"bool": "bool", "int": "int64", "float": "float64", "object": "object"}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "CandidateTable requires numpy. Install with: pip install brand[columnar]"
+        )
+
+
+def _kind(value) -> str:
+    """Classify a value into the column kind that could hold it."""
+    if value is None:
+        return "none"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if -(2**63) <= value < 2**63 else "object"
+    if isinstance(value, float):
+        return "float"
+    return "object"
+
+
+def _is_error(value) -> bool:
+    return isinstance(value, dict) and set(value) == {"error"}
+
+
+@dataclass
+class _Column:
+    """One typed column: values, presence mask, and out-of-type rows."""
+
+    values: object  # np.ndarray
+    present: object  # np.ndarray[bool]
+    raw: dict = field(default_factory=dict)  # row -> value not fitting the dtype
+
+    @classmethod
+    def build(cls, n: int, rows, values: list) -> "_Column":
+        """Build a length-*n* column holding *values* at *rows*."""
+        counts = {}
+        for v in values:
+            k = _kind(v)
+            counts[k] = counts.get(k, 0) + 1
+        typed = {k: c for k, c in counts.items() if k != "none"}
+        kind = max(typed, key=typed.get) if typed else "object"
+        if kind == "int" and "float" in typed:
+            kind = "float" if typed["float"] >= typed["int"] else "int"
+
+        col = cls(
+            values=np.zeros(n, dtype=_DTYPES[kind])
+            if kind != "object"
+            else np.empty(n, dtype=object),
+            present=np.zeros(n, dtype=bool),
+        )
+        if counts.get(kind) == len(values) and kind != "object":
+            # Homogeneous values: fill the column in one vectorized assignment
+            col.values[rows] = np.array(values, dtype=_DTYPES[kind])
+            col.present[rows] = True
+            return col
+        for row, v in zip(rows, values):
+            k = _kind(v)
+            if k == kind or (kind == "object" and k != "none"):
+                col.values[row] = v
+                col.present[row] = True
+            else:
+                col.raw[row] = v
+        return col
+
+    @property
+    def vectorizable(self) -> bool:
+        return self.values.dtype != object
+
+    def value(self, row: int):
+        """The Python value at *row*, or ``_MISSING``."""
+        if row in self.raw:
+            return self.raw[row]
+        if self.present[row]:
+            v = self.values[row]
+            return v.item() if hasattr(v, "item") else v
+        return _MISSING
+
+    def pylist(self) -> list:
+        """All values as Python objects (``_MISSING`` where absent)."""
+        out = [
+            v if p else _MISSING
+            for v, p in zip(self.values.tolist(), self.present.tolist())
+        ]
+        for row, v in self.raw.items():
+            out[row] = v
+        return out
+
+    def take(self, idx) -> "_Column":
+        raw = {}
+        if self.raw:
+            raw = {
+                new: self.raw[old]
+                for new, old in enumerate(idx.tolist())
+                if old in self.raw
+            }
+        return _Column(self.values[idx], self.present[idx], raw)
+
+
+class CandidateTable(Sequence):
+    """Columnar, NumPy-backed collection of candidates.
+
+    Parameters
+    ----------
+    names : iterable of str
+        Candidate names (the ``names`` column).
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        _require_numpy()
+        self.names = np.asarray(list(names), dtype=object)
+        self._scored: dict[str, object] = {}  # scorer -> row-presence mask
+        self._subkeys: dict[str, list | None] = {}  # scorer -> sub-keys if flat
+        self._columns: dict[str, _Column] = {}  # flat column name -> column
+        self._raw: dict[str, dict] = {}  # dict-scorer -> row -> non-dict value
+
+    # -- Construction ---------------------------------------------------------
+
+    @classmethod
+    def from_dicts(cls, candidates: Iterable[Mapping]) -> "CandidateTable":
+        """Build a table from ``{'name': ..., 'scores': {...}}`` records."""
+        candidates = list(candidates)
+        table = cls(c["name"] for c in candidates)
+        scorer_names = {}
+        for c in candidates:
+            scorer_names.update(dict.fromkeys(c["scores"]))
+        for scorer in scorer_names:
+            rows = [i for i, c in enumerate(candidates) if scorer in c["scores"]]
+            table.set_scores(
+                scorer, [candidates[i]["scores"][scorer] for i in rows], rows=rows
+            )
+        return table
+
+    def set_scores(self, scorer: str, values: list, *, rows=None):
+        """Store *scorer*'s results, one per row in *rows* (default: all rows).
+
+        Re-scoring an existing scorer overwrites the given rows only.
+        """
+        n = len(self)
+        rows = np.arange(n) if rows is None else np.asarray(rows, dtype=int)
+        values = list(values)
+        if scorer in self._scored:
+            previous = self._scorer_pylist(scorer)
+            for row, v in zip(rows.tolist(), values):
+                previous[row] = v
+            keep = [i for i, v in enumerate(previous) if v is not _MISSING]
+            self._drop(scorer)
+            rows, values = np.asarray(keep, dtype=int), [previous[i] for i in keep]
+
+        scored = np.zeros(n, dtype=bool)
+        scored[rows] = True
+        self._scored[scorer] = scored
+
+        dicts = [v for v in values if isinstance(v, dict) and not _is_error(v)]
+        if dicts and len(dicts) * 2 >= len(values):
+            self._set_flattened(scorer, rows.tolist(), values)
+        else:
+            self._subkeys[scorer] = None
+            self._columns[scorer] = _Column.build(n, rows.tolist(), values)
+
+    def _set_flattened(self, scorer: str, rows: list, values: list):
+        subkeys = {}
+        for v in values:
+            if isinstance(v, dict) and not _is_error(v):
+                subkeys.update(dict.fromkeys(v))
+        self._subkeys[scorer] = list(subkeys)
+        self._raw[scorer] = {
+            row: v
+            for row, v in zip(rows, values)
+            if not isinstance(v, dict) or _is_error(v)
+        }
+        for sub in subkeys:
+            pairs = [
+                (row, v[sub])
+                for row, v in zip(rows, values)
+                if row not in self._raw[scorer] and sub in v
+            ]
+            self._columns[f"{scorer}.{sub}"] = _Column.build(
+                len(self), [r for r, _ in pairs], [v for _, v in pairs]
+            )
+
+    def _drop(self, scorer: str):
+        subkeys = self._subkeys.pop(scorer)
+        for key in [scorer] if subkeys is None else [f"{scorer}.{s}" for s in subkeys]:
+            del self._columns[key]
+        self._raw.pop(scorer, None)
+        del self._scored[scorer]
+
+    # -- Access ---------------------------------------------------------------
+
+    @property
+    def scorers(self) -> list[str]:
+        """Scorer names, in the order they were first set."""
+        return list(self._scored)
+
+    @property
+    def columns(self) -> dict:
+        """Flat column name -> NumPy values array (see ``present``)."""
+        return {k: c.values for k, c in self._columns.items()}
+
+    def present(self, column: str):
+        """Boolean mask of the rows where *column* has a typed value."""
+        return self._columns[column].present
+
+    def score(self, row: int, scorer: str):
+        """The value of *scorer* for *row* as the dict layout would hold it."""
+        if not self._scored[scorer][row]:
+            return _MISSING
+        subkeys = self._subkeys[scorer]
+        if subkeys is None:
+            return self._columns[scorer].value(row)
+        if row in self._raw[scorer]:
+            return self._raw[scorer][row]
+        out = {}
+        for sub in subkeys:
+            v = self._columns[f"{scorer}.{sub}"].value(row)
+            if v is not _MISSING:
+                out[sub] = v
+        return out
+
+    def _scorer_pylist(self, scorer: str) -> list:
+        """All values of *scorer* (``_MISSING`` where not scored)."""
+        scored = self._scored[scorer].tolist()
+        subkeys = self._subkeys[scorer]
+        if subkeys is None:
+            values = self._columns[scorer].pylist()
+        else:
+            subs = {s: self._columns[f"{scorer}.{s}"].pylist() for s in subkeys}
+            raw = self._raw[scorer]
+            values = [
+                raw[i]
+                if i in raw
+                else {s: col[i] for s, col in subs.items() if col[i] is not _MISSING}
+                for i in range(len(self))
+            ]
+        return [v if s else _MISSING for v, s in zip(values, scored)]
+
+    def to_dicts(self) -> list[dict]:
+        """Materialize the ``{'name': ..., 'scores': {...}}`` records."""
+        per_scorer = {s: self._scorer_pylist(s) for s in self._scored}
+        return [
+            {
+                "name": name,
+                "scores": {
+                    s: values[i]
+                    for s, values in per_scorer.items()
+                    if values[i] is not _MISSING
+                },
+            }
+            for i, name in enumerate(self.names.tolist())
+        ]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(np.arange(len(self))[i])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("CandidateTable index out of range")
+        return CandidateView(self, i)
+
+    def __repr__(self):
+        return f"CandidateTable(n={len(self)}, scorers={self.scorers})"
+
+    # -- Selection ------------------------------------------------------------
+
+    def take(self, idx) -> "CandidateTable":
+        """A new table with the rows at positions *idx*, in that order."""
+        idx = np.asarray(idx, dtype=int)
+        out = CandidateTable.__new__(CandidateTable)
+        out.names = self.names[idx]
+        out._scored = {s: m[idx] for s, m in self._scored.items()}
+        out._subkeys = dict(self._subkeys)
+        out._columns = {k: c.take(idx) for k, c in self._columns.items()}
+        pos = {old: new for new, old in enumerate(idx.tolist())}
+        out._raw = {
+            s: {pos[r]: v for r, v in raw.items() if r in pos}
+            for s, raw in self._raw.items()
+        }
+        return out
+
+    def mask_rules(self, rules: dict, *, keep_indeterminate: bool = False):
+        """Boolean mask of the rows passing every rule (see ``Filter``)."""
+        mask = np.ones(len(self), dtype=bool)
+        for scorer, expected in rules.items():
+            rule_mask = self._rule_mask(scorer, expected)
+            if keep_indeterminate and scorer in self._scored:
+                rule_mask |= self._indeterminate_mask(scorer)
+            mask &= rule_mask
+        return mask
+
+    def _indeterminate_mask(self, scorer: str):
+        """Rows whose *scorer* result is indeterminate (see ``brand.resilience``)."""
+        from brand.resilience import is_indeterminate
+
+        return np.fromiter(
+            (is_indeterminate(self.score(row, scorer)) for row in range(len(self))),
+            dtype=bool,
+            count=len(self),
+        )
+
+    def _rule_mask(self, scorer: str, expected):
+        from brand.pipeline import _passes_rules
+
+        n = len(self)
+        if scorer not in self._scored:
+            return np.zeros(n, dtype=bool)
+
+        def exact(row):
+            actual = self.score(row, scorer)
+            if actual is _MISSING:
+                return False
+            return _passes_rules({"scores": {scorer: actual}}, {scorer: expected})
+
+        col = self._columns.get(scorer) if self._subkeys[scorer] is None else None
+        if isinstance(expected, dict):
+            op, val = expected.get("op", ">="), expected.get("value", 0)
+            vectorizable = isinstance(val, (int, float))
+        else:
+            vectorizable = True
+        if col is None or not col.vectorizable or not vectorizable:
+            return np.fromiter((exact(r) for r in range(n)), dtype=bool, count=n)
+
+        if isinstance(expected, bool):
+            ok = col.values == expected
+        elif isinstance(expected, (int, float)):
+            ok = col.values >= expected
+        elif isinstance(expected, dict):
+            ok = _NP_OPS.get(op, operator.ge)(col.values, val)
+        else:
+            ok = np.ones(n, dtype=bool)
+        mask = col.present & ok
+        for row in col.raw:
+            mask[row] = exact(row)
+        return mask
+
+    def sort_values(self, by: str = "aggregate"):
+        """Float ranking value per row, as ``Filter(by=...)`` computes it."""
+        if by == "aggregate":
+            return self._aggregate()
+        from brand.pipeline import _sort_value
+
+        n = len(self)
+        out = np.zeros(n, dtype=float)
+        if by not in self._scored:
+            return out
+        col = self._columns.get(by) if self._subkeys[by] is None else None
+        if col is not None and col.vectorizable:
+            out[col.present] = col.values[col.present].astype(float)
+            rows = col.raw
+        else:
+            rows = range(n)
+        for row in rows:
+            v = self.score(row, by)
+            if v is not _MISSING:
+                out[row] = _sort_value({"scores": {by: v}}, by)
+        return out
+
+    def _aggregate(self):
+        """Vectorized ``_compute_aggregate`` over every row."""
+        n = len(self)
+        total = np.zeros(n, dtype=float)
+        count = np.zeros(n, dtype=int)
+        for scorer in self._scored:
+            col = self._columns.get(scorer) if self._subkeys[scorer] is None else None
+            if col is not None and col.vectorizable:
+                total[col.present] += col.values[col.present].astype(float)
+                count[col.present] += 1
+                rows = col.raw
+            elif col is not None:
+                rows = np.flatnonzero(col.present).tolist() + list(col.raw)
+            else:
+                rows = self._raw[scorer]
+            for row in rows:
+                v = self.score(row, scorer)
+                if isinstance(v, (bool, int, float)) and v is not _MISSING:
+                    total[row] += float(v)
+                    count[row] += 1
+        out = np.zeros(n, dtype=float)
+        np.divide(total, count, out=out, where=count > 0)
+        return out
+
+    def select(
+        self,
+        *,
+        rules: dict | None = None,
+        top_n: int | None = None,
+        top_pct: float | None = None,
+        by: str | None = None,
+        keep_indeterminate: bool = False,
+    ) -> "CandidateTable":
+        """Apply Filter semantics: rules first, then ``top_n``/``top_pct``."""
+        return self.take(
+            self.select_indices(
+                rules=rules,
+                top_n=top_n,
+                top_pct=top_pct,
+                by=by,
+                keep_indeterminate=keep_indeterminate,
+            )
+        )
+
+    def select_indices(
+        self,
+        *,
+        rules: dict | None = None,
+        top_n: int | None = None,
+        top_pct: float | None = None,
+        by: str | None = None,
+        keep_indeterminate: bool = False,
+    ):
+        """Row indices selected by ``select``, in output order."""
+        idx = np.arange(len(self))
+        if rules:
+            idx = idx[self.mask_rules(rules, keep_indeterminate=keep_indeterminate)]
+        if top_n is not None or top_pct is not None:
+            values = self.sort_values(by or "aggregate")[idx]
+            order = np.argsort(-values, kind="stable")
+            if top_n is not None:
+                k = top_n
+            else:
+                k = max(1, math.ceil(len(idx) * top_pct / 100.0))
+            idx = idx[order[:k]]
+        return idx
+
+
+class _ScoresView(Mapping):
+    """Read-only ``scores`` dict of one table row."""
+
+    def __init__(self, table: CandidateTable, row: int):
+        self._table, self._row = table, row
+
+    def __getitem__(self, scorer):
+        if scorer not in self._table._scored:
+            raise KeyError(scorer)
+        v = self._table.score(self._row, scorer)
+        if v is _MISSING:
+            raise KeyError(scorer)
+        return v
+
+    def __iter__(self):
+        for scorer, scored in self._table._scored.items():
+            if scored[self._row]:
+                yield scorer
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class CandidateView(Mapping):
+    """Read-only ``{'name': ..., 'scores': {...}}`` view of one table row."""
+
+    def __init__(self, table: CandidateTable, row: int):
+        self._table, self._row = table, row
+
+    def __getitem__(self, key):
+        if key == "name":
+            return self._table.names[self._row]
+        if key == "scores":
+            return _ScoresView(self._table, self._row)
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from ("name", "scores")
+
+    def __len__(self):
+        return 2
+
+    def to_dict(self) -> dict:
+        return {"name": self["name"], "scores": dict(self["scores"])}
+
+    def __repr__(self):
+        return repr(self.to_dict())
@@ -0,0 +1,268 @@
+"""Lightweight tracing: spans around stages, scorers and outbound lookups.
+
+Spans nest as pipeline → stage → scorer → call (one candidate) → lookup
+(``http``, ``dns``, ``whois``, ``llm``, ``blocking``), and record their start
+and end times, attributes (stage index, scorer, candidate name, host, HTTP
+status, bytes, ...) and any error.  Tracing is off unless a ``Tracer`` is active, and
+costs a context-variable lookup per span when off.
+
+Activate a tracer around a run; exporters receive the finished spans:
+
+>>> from brand.stages import Score
+>>> from brand.pipeline import run_pipeline
+>>> spans = InMemoryExporter()
+>>> with Tracer(spans):
+...     _ = run_pipeline([Score(['name_length'])], names=['vox', 'lumex'])
+>>> [s.name for s in spans.spans if s.parent_id is None]
+['pipeline']
+>>> sorted(s.attributes['candidate'] for s in spans.spans if s.name == 'call')
+['lumex', 'vox']
+
+Built-in exporters: ``InMemoryExporter``, ``JsonlExporter`` (one JSON span per
+line) and ``OpenTelemetryExporter`` (needs ``opentelemetry-api``).  Write your
+own by subclassing ``SpanExporter``.
+
+Lookups made inside ``processes=`` workers or on remote workers
+(``brand.distributed``) aren't traced; their scorer spans still are.
+"""
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar(
+    "brand_tracer", default=None
+)
+_current_span: contextvars.ContextVar = contextvars.ContextVar(
+    "brand_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """One timed operation.  ``start`` and ``end`` are epoch seconds."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    start: float = 0.0
+    end: float | None = None
+    attributes: dict = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attributes):
+        """Add attributes (e.g. the HTTP status once the response is in)."""
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.end is None else self.end - self.start
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """What ``span`` yields when tracing is off.  Falsy, so callers can skip
+    computing costly attributes: ``if s: s.set(bytes=len(body))``."""
+
+    def set(self, **attributes):
+        pass
+
+    def __bool__(self):
+        return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def _new_id(n_bytes: int) -> str:
+    return os.urandom(n_bytes).hex()
+
+
+class SpanExporter:
+    """Receives spans.  ``on_start`` is called when a span opens, ``export``
+    when it closes (children close before their parents)."""
+
+    def on_start(self, span: Span):
+        pass
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Keep finished spans in ``.spans`` (in the order they finished)."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+
+class JsonlExporter(SpanExporter):
+    """Append each finished span to a JSONL file, as ``Span.to_dict()``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._f = open(path, "a")
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            self._f.write(line)
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """Mirror spans as OpenTelemetry spans (configure the SDK as usual).
+
+    Parameters
+    ----------
+    tracer : opentelemetry.trace.Tracer | None
+        Defaults to ``trace.get_tracer('brand')`` from the global provider.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetryExporter requires 'opentelemetry-api'. "
+                "Install with: pip install brand[otel]"
+            )
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("brand")
+        self._open = {}  # span_id -> OTel span
+
+    def on_start(self, span: Span):
+        parent = self._open.get(span.parent_id)
+        context = self._trace.set_span_in_context(parent) if parent else None
+        self._open[span.span_id] = self._tracer.start_span(
+            span.name, context=context, start_time=int(span.start * 1e9)
+        )
+
+    def export(self, span: Span):
+        otel_span = self._open.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes(
+            {
+                k: v if isinstance(v, (bool, int, float, str)) else str(v)
+                for k, v in span.attributes.items()
+            }
+        )
+        if span.error is not None:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+            otel_span.set_attribute("error", span.error)
+        otel_span.end(end_time=int(span.end * 1e9))
+
+
+class Tracer:
+    """Record spans to *exporters* while active (``with tracer: ...``).
+
+    Closing the tracer (or leaving its outermost ``with``) closes the
+    exporters.
+    """
+
+    def __init__(self, *exporters: SpanExporter):
+        self.exporters = list(exporters)
+        self._tokens = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        parent = _current_span.get()
+        span = Span(
+            name,
+            trace_id=parent.trace_id if parent else _new_id(16),
+            span_id=_new_id(8),
+            parent_id=parent.span_id if parent else None,
+            start=time.time(),
+            attributes=attributes,
+        )
+        for exporter in self.exporters:
+            exporter.on_start(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end = time.time()
+            try:
+                _current_span.reset(token)
+            except ValueError:  # a generator closed from another context
+                pass
+            for exporter in self.exporters:
+                exporter.export(span)
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+    def __enter__(self):
+        self._tokens.append(_current_tracer.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        _current_tracer.reset(self._tokens.pop())
+        if not self._tokens:
+            self.close()
+
+
+def span(name: str, **attributes):
+    """A span of the active tracer, or a no-op if tracing is off.
+
+    >>> with span('dns', host='example.com') as s:
+    ...     s.set(status='ok')
+    >>> bool(s)
+    False
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        return _NOOP
+    return tracer.span(name, **attributes)
+
+
+def current_span() -> Span | None:
+    """The innermost open span in this context, if any."""
+    return _current_span.get()
+
+
+def set_response(span, response):
+    """Record an HTTP *response*'s status and size on *span* (if tracing)."""
+    if span:
+        body = getattr(response, "content", None)
+        if body is None:
+            body = response.text.encode()
+        span.set(status=response.status_code, bytes=len(body))
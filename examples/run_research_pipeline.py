@@ -230,8 +230,15 @@ def run_stage_4(
     t0 = time.time()
     names = [c['name'] for c in candidates]
 
-    # Batch call to Claude (25 names/batch to fit in output token limit)
-    ratings = llm_brand_rating_batch(names, context=context, batch_size=25)
+    # Batch call to Claude (25 names/batch to fit in output token limit),
+    # journaled so that an interrupted run doesn't pay for the same batches twice
+    sdir = _stage_dir(proj_dir, 6, 'score')
+    ratings = llm_brand_rating_batch(
+        names,
+        context=context,
+        batch_size=25,
+        journal=os.path.join(sdir, 'llm_journal.jsonl'),
+    )
 
     # Merge ratings into candidates
     for cand in candidates:
@@ -247,7 +254,6 @@ def run_stage_4(
     elapsed = time.time() - t0
     _progress(f'  LLM rating complete in {elapsed:.1f}s')
 
-    sdir = _stage_dir(proj_dir, 6, 'score')
     _write_json(os.path.join(sdir, 'results.json'), candidates)
 
     # Sort by LLM overall score and take top 100
@@ -3,6 +3,7 @@
 import os
 import json
 import shutil
+import sys
 import tempfile
 
 import pytest
@@ -284,3 +285,1777 @@ class TestPipeline:
         scores2 = set(r2['candidates'][0]['scores'].keys())
         assert scores1 != scores2
         assert len(r1['candidates']) != len(r2['candidates'])
+
+
+# ---------------------------------------------------------------------------
+# Streaming execution tests
+# ---------------------------------------------------------------------------
+
+
+class TestStreaming:
+    stages = [
+        Generate(
+            'pattern', params={'pattern': 'CVCV', 'consonants': 'bdk', 'vowels': 'ai'}
+        ),
+        Score(['name_length', 'keyboard_distance']),
+        Filter(rules={'keyboard_distance': {'op': '>', 'value': 2.0}}),
+        Filter(top_n=5, by='keyboard_distance'),
+    ]
+
+    def test_stream_matches_eager(self, tmp_path):
+        eager = brand.run_pipeline(self.stages, pipeline_dir=str(tmp_path))
+        streamed = brand.run_pipeline(
+            self.stages, pipeline_dir=str(tmp_path), stream=True, chunk_size=3
+        )
+        assert streamed['candidates'] == eager['candidates']
+
+    def test_iter_pipeline_is_lazy(self, tmp_path):
+        pulled = []
+
+        def names():
+            for n in ['alpha', 'beta', 'gamma', 'delta', 'epsilon']:
+                pulled.append(n)
+                yield n
+
+        it = brand.iter_pipeline(
+            [Score(['name_length'])],
+            names=names(),
+            chunk_size=2,
+            pipeline_dir=str(tmp_path),
+        )
+        first = next(it)
+        assert first['name'] == 'alpha'
+        assert pulled == ['alpha', 'beta']
+        assert [c['name'] for c in it] == ['beta', 'gamma', 'delta', 'epsilon']
+
+    def test_stream_artifacts_and_resume(self, tmp_path):
+        completed = []
+        results = brand.run_pipeline(
+            self.stages,
+            pipeline_dir=str(tmp_path),
+            project_name='streamed',
+            stream=True,
+            on_stage_complete=lambda i, t, n: completed.append((i, t, n)),
+        )
+        proj_dir = results['project_dir']
+        assert completed[0] == (0, 'generate', 36)
+        with open(os.path.join(proj_dir, 'stage_02_filter', 'summary.json')) as f:
+            summary = json.load(f)
+        assert summary['before'] == 36
+
+        resumed = brand.run_pipeline(
+            self.stages,
+            pipeline_dir=str(tmp_path),
+            project_name='streamed',
+            resume_from=3,
+        )
+        assert resumed['candidates'] == results['candidates']
+
+
+# ---------------------------------------------------------------------------
+# Process-pool backend tests
+# ---------------------------------------------------------------------------
+
+
+class TestProcessPool:
+    def test_closure_scorer_ref_is_picklable(self):
+        import pickle
+
+        with pytest.raises(Exception):
+            pickle.dumps(brand.scorers['dns_com'].func)
+        ref = pickle.loads(pickle.dumps(brand.scorers.ref('dns_com')))
+        assert ref.resolve() is brand.scorers['dns_com']
+
+    def test_processes_match_in_process_scores(self, tmp_path):
+        stages = [
+            Generate(
+                'pattern',
+                params={'pattern': 'CVCV', 'consonants': 'bdklmn', 'vowels': 'aeio'},
+            ),
+            Score(['brandability', 'pronunciation_entropy', 'sound_symbolism']),
+            Filter(top_n=10, by='brandability'),
+        ]
+        serial = brand.run_pipeline(stages, pipeline_dir=str(tmp_path))
+        pooled = brand.run_pipeline(stages, pipeline_dir=str(tmp_path), processes=2)
+        assert pooled['candidates'] == serial['candidates']
+
+
+# ---------------------------------------------------------------------------
+# asyncio engine tests
+# ---------------------------------------------------------------------------
+
+
+class TestAsyncEngine:
+    @staticmethod
+    def _register_slow_scorer(name, host, stats):
+        import asyncio
+        from brand import aio
+
+        @brand.scorers.register(name, requires_network=True)
+        def slow(n):
+            return len(n)
+
+        @brand.scorers.register_async(name)
+        async def aslow(n):
+            async with aio.current_engine().slot(host):
+                stats['in_flight'] += 1
+                stats['peak'] = max(stats['peak'], stats['in_flight'])
+                await asyncio.sleep(0.01)
+                stats['in_flight'] -= 1
+            return len(n)
+
+    def test_arun_pipeline_keeps_many_lookups_in_flight(self, tmp_path):
+        import asyncio
+
+        stats = {'in_flight': 0, 'peak': 0}
+        self._register_slow_scorer('_test_async_many', 'many.example', stats)
+        names = [f'name{i}' for i in range(200)]
+        results = asyncio.run(
+            brand.arun_pipeline(
+                [Score(['_test_async_many'])],
+                names=names,
+                pipeline_dir=str(tmp_path),
+                max_in_flight=500,
+                per_host=100,
+            )
+        )
+        assert stats['peak'] == 100
+        assert results['candidates'][3]['scores']['_test_async_many'] == 5
+
+    def test_host_limits_and_sync_entry_point(self, tmp_path):
+        stats = {'in_flight': 0, 'peak': 0}
+        self._register_slow_scorer('_test_async_host', 'slow.example', stats)
+        results = brand.run_pipeline(
+            [Score(['_test_async_host'])],
+            names=[f'n{i}' for i in range(50)],
+            pipeline_dir=str(tmp_path),
+        )
+        assert len(results['candidates']) == 50
+        assert 1 < stats['peak'] <= 32  # DFLT_PER_HOST
+
+
+# ---------------------------------------------------------------------------
+# Cost-aware ordering and rule pushdown tests
+# ---------------------------------------------------------------------------
+
+
+class TestRulePushdown:
+    def test_expensive_scorer_skips_candidates_failing_cheap_rules(self, tmp_path):
+        calls = []
+
+        @brand.scorers.register('_test_paid_check', cost='expensive', latency='slow')
+        def paid_check(name):
+            calls.append(name)
+            return True
+
+        names = ['a', 'ab', 'abc', 'abcd', 'abcde']
+        results = brand.run_pipeline(
+            [
+                Score(['_test_paid_check', 'name_length']),
+                Filter(rules={'name_length': {'op': '>=', 'value': 4}}),
+            ],
+            names=names,
+            pipeline_dir=str(tmp_path),
+        )
+        assert calls == ['abcd', 'abcde']
+        assert [c['name'] for c in results['candidates']] == ['abcd', 'abcde']
+        assert all(c['scores']['_test_paid_check'] for c in results['candidates'])
+
+    def test_streaming_pushdown(self, tmp_path):
+        calls = []
+
+        @brand.scorers.register('_test_paid_check_2', cost='expensive')
+        def paid_check(name):
+            calls.append(name)
+            return len(name)
+
+        results = brand.run_pipeline(
+            [
+                Score(['_test_paid_check_2', 'name_length']),
+                Filter(rules={'name_length': 3}),
+            ],
+            names=['ab', 'abc', 'x', 'wxyz'],
+            pipeline_dir=str(tmp_path),
+            stream=True,
+            chunk_size=2,
+        )
+        assert calls == ['abc', 'wxyz']
+        assert len(results['candidates']) == 2
+
+
+# ---------------------------------------------------------------------------
+# Top-N selection tests
+# ---------------------------------------------------------------------------
+
+
+class TestTopSelection:
+    @staticmethod
+    def _cands(values):
+        return [{'name': f'n{i}', 'scores': {'x': v}} for i, v in enumerate(values)]
+
+    def test_heap_selection_matches_stable_sort(self):
+        from brand.pipeline import _select_top
+
+        values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, True, 'n/a']
+        cands = self._cands(values)
+        expected = sorted(
+            cands,
+            key=lambda c: brand.pipeline._sort_value(c, 'x'),
+            reverse=True,
+        )
+        for n in (1, 3, 5, 20):
+            got = _select_top(Filter(top_n=n, by='x'), iter(cands))
+            assert got == expected[:n]
+
+    def test_top_pct_exact_on_streams_and_lists(self):
+        from brand.pipeline import _select_top
+
+        cands = self._cands(range(10))
+        stage = Filter(top_pct=25, by='x')
+        from_list = _select_top(stage, cands)
+        from_stream = _select_top(stage, (c for c in cands))
+        assert [c['name'] for c in from_list] == ['n9', 'n8', 'n7']
+        assert from_stream == from_list
+
+    def test_top_n_over_large_stream(self):
+        from brand.pipeline import _iter_filter
+
+        def stream():
+            for i in range(100_000):
+                yield {'name': str(i), 'scores': {'x': i % 1000}}
+
+        kept = list(_iter_filter(Filter(top_n=2, by='x'), stream()))
+        assert [c['name'] for c in kept] == ['999', '1999']
+
+
+# ---------------------------------------------------------------------------
+# Columnar candidate table tests
+# ---------------------------------------------------------------------------
+
+
+class TestCandidateTable:
+    records = [
+        {'name': 'a', 'scores': {'x': 1.5, 'ok': True, 'd': {'p': 'z', 'q': 0.1}}},
+        {'name': 'b', 'scores': {'x': 2, 'ok': False, 'd': {'error': 'boom'}}},
+        {'name': 'c', 'scores': {'x': {'error': 'E'}, 'ok': None, 'd': {'p': 'y'}}},
+        {'name': 'd', 'scores': {'x': 0.5, 'd': {'p': 'w', 'q': 0.9}}},
+    ]
+
+    def test_roundtrip_preserves_records(self):
+        np = pytest.importorskip('numpy')
+        from brand.table import CandidateTable
+
+        table = CandidateTable.from_dicts(self.records)
+        assert table.to_dicts() == self.records
+        assert list(table) == self.records
+        assert table.columns['d.q'].dtype == np.float64
+        assert table[1]['scores']['d'] == {'error': 'boom'}
+
+    def test_select_matches_dict_filter(self):
+        pytest.importorskip('numpy')
+        from brand.pipeline import _run_filter
+        from brand.table import CandidateTable
+
+        filters = [
+            Filter(rules={'x': 1}),
+            Filter(rules={'ok': True}),
+            Filter(rules={'ok': {'op': '==', 'value': 1}}),
+            Filter(top_n=2, by='x'),
+            Filter(top_n=3),
+            Filter(top_pct=50, by='ok'),
+            Filter(rules={'d': True}),
+        ]
+        for f in filters:
+            expected = _run_filter(f, [dict(r) for r in self.records])
+            table = CandidateTable.from_dicts(self.records)
+            assert _run_filter(f, table).to_dicts() == expected, f
+
+    def test_columnar_pipeline_matches_eager(self, tmp_path):
+        pytest.importorskip('numpy')
+        stages = [
+            Generate(
+                'pattern', params={'pattern': 'CVCV', 'consonants': 'bdkl', 'vowels': 'aio'}
+            ),
+            Score(['name_length', 'sound_symbolism', 'letter_balance', 'novelty']),
+            Filter(rules={'novelty': 0.5}, top_n=20, by='novelty'),
+            Filter(top_n=5),
+        ]
+        eager = brand.run_pipeline(stages, pipeline_dir=str(tmp_path))
+        columnar = brand.run_pipeline(stages, pipeline_dir=str(tmp_path), columnar=True)
+        assert columnar['candidates'].to_dicts() == eager['candidates']
+        with open(os.path.join(columnar['project_dir'], 'final', 'results.json')) as f:
+            assert json.load(f) == eager['candidates']
+
+
+# ---------------------------------------------------------------------------
+# Artifact format tests
+# ---------------------------------------------------------------------------
+
+
+class TestArtifactFormats:
+    records = TestCandidateTable.records + [
+        {'name': 'e', 'scores': {'x': 3, 's': 'txt'}},
+    ]
+
+    def test_incomplete_formats_cant_be_instantiated(self):
+        from brand.artifacts import ArtifactFormat, NpzFormat, _PartsFormat
+
+        class NoRead(ArtifactFormat):
+            name = 'noread'
+
+            def writer(self, stage_path):
+                pass
+
+            def exists(self, stage_path):
+                return False
+
+            def remove(self, stage_path):
+                pass
+
+        class NoParts(_PartsFormat):
+            name = 'noparts'
+
+        for incomplete in (NoRead, NoParts):
+            with pytest.raises(TypeError, match='abstract'):
+                incomplete()
+        NpzFormat()
+
+    def test_formats_roundtrip_in_parts(self, tmp_path):
+        pytest.importorskip('numpy')
+        from brand.artifacts import NpzFormat, get_format, read_candidates
+
+        for fmt in [get_format('json'), get_format('jsonl'), NpzFormat(rows_per_part=2)]:
+            path = str(tmp_path / fmt.name)
+            os.makedirs(path)
+            with fmt.writer(path) as w:
+                w.write_many(self.records)
+            assert list(read_candidates(path)) == self.records, fmt.name
+            assert list(read_candidates(path, columns=['s'])) == [
+                {'name': r['name'], 'scores': {k: v for k, v in r['scores'].items() if k == 's'}}
+                for r in self.records
+            ]
+        assert len(os.listdir(tmp_path / 'npz' / 'results-npz')) == 3
+
+    def test_pipeline_artifact_format_and_resume(self, tmp_path):
+        pytest.importorskip('numpy')
+        stages = [
+            Generate('from_list', params={'names': ['figiri', 'lumex', 'vox', 'zanpo']}),
+            Score(['name_length', 'sound_symbolism']),
+            Filter(rules={'name_length': 4}),
+        ]
+        eager = brand.run_pipeline(stages, pipeline_dir=str(tmp_path), project_name='p')
+        npz = brand.run_pipeline(
+            stages, pipeline_dir=str(tmp_path), project_name='p', artifact_format='npz'
+        )
+        assert npz['candidates'] == eager['candidates']
+        score_dir = os.path.join(npz['project_dir'], 'stage_01_score')
+        assert 'results-npz' in os.listdir(score_dir)
+        assert 'results.json' not in os.listdir(score_dir)
+
+        resumed = brand.run_pipeline(
+            stages, pipeline_dir=str(tmp_path), project_name='p', resume_from=2
+        )
+        assert resumed['candidates'] == eager['candidates']
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match='Unknown artifact format'):
+            brand.run_pipeline([], artifact_format='xml')
+
+
+# ---------------------------------------------------------------------------
+# Delta artifact tests
+# ---------------------------------------------------------------------------
+
+
+class TestDeltaArtifacts:
+    stages = [
+        Generate('pattern', params={'pattern': 'CVCV', 'consonants': 'bdkl', 'vowels': 'aio'}),
+        Score(['name_length', 'syllables']),
+        Filter(rules={'syllables': 2}),
+        Score(['novelty']),
+        Filter(top_n=10, by='novelty'),
+    ]
+
+    def test_delta_stages_rebuild_full_candidates(self, tmp_path):
+        from brand.pipeline import _find_stage_dir, _iter_stage_candidates
+
+        full = brand.run_pipeline(self.stages, pipeline_dir=str(tmp_path), project_name='f')
+        delta = brand.run_pipeline(
+            self.stages, pipeline_dir=str(tmp_path), project_name='d', delta=True
+        )
+        assert delta['candidates'] == full['candidates']
+        for i in range(len(self.stages)):
+            rebuilt = _iter_stage_candidates(_find_stage_dir(delta['project_dir'], i))
+            expected = _iter_stage_candidates(_find_stage_dir(full['project_dir'], i))
+            assert list(rebuilt) == list(expected), i
+
+        score_dir = _find_stage_dir(delta['project_dir'], 3)
+        with open(os.path.join(score_dir, 'results.json')) as f:
+            assert set(json.load(f)[0]['scores']) == {'novelty'}
+        filter_dir = _find_stage_dir(delta['project_dir'], 4)
+        assert not any(f.startswith('results') for f in os.listdir(filter_dir))
+
+    def test_resume_from_delta(self, tmp_path):
+        full = brand.run_pipeline(self.stages, pipeline_dir=str(tmp_path), project_name='f')
+        brand.run_pipeline(self.stages, pipeline_dir=str(tmp_path), project_name='d', delta=True)
+        resumed = brand.run_pipeline(
+            self.stages,
+            pipeline_dir=str(tmp_path),
+            project_name='d',
+            resume_from=3,
+            delta=True,
+        )
+        assert resumed['candidates'] == full['candidates']
+
+    def test_delta_is_eager_only(self):
+        with pytest.raises(ValueError, match='eager'):
+            brand.run_pipeline(self.stages, stream=True, delta=True)
+
+
+# ---------------------------------------------------------------------------
+# Scoring journal tests
+# ---------------------------------------------------------------------------
+
+
+class _Crash(BaseException):
+    pass
+
+
+class TestScoreJournal:
+    def test_resume_skips_journaled_results(self, tmp_path):
+        calls = []
+        crash_at = {'abcd'}
+
+        @brand.scorers.register(
+            '_test_flaky_net', requires_network=True, parallelizable=False
+        )
+        def flaky(n):
+            if n in crash_at:
+                raise _Crash
+            calls.append(n)
+            return len(n)
+
+        stages = [Score(['name_length', '_test_flaky_net'])]
+        names = ['ab', 'abc', 'abcd', 'abcde']
+        with pytest.raises(_Crash):
+            brand.run_pipeline(
+                stages, names=names, pipeline_dir=str(tmp_path), project_name='p'
+            )
+        journal_path = os.path.join(tmp_path, 'p', 'stage_00_score', 'journal.jsonl')
+        with open(journal_path) as f:
+            assert len(f.readlines()) == 3  # header + 2 results
+
+        calls.clear()
+        crash_at.clear()
+        results = brand.run_pipeline(
+            stages, names=names, pipeline_dir=str(tmp_path), project_name='p'
+        )
+        assert calls == ['abcd', 'abcde']
+        scores = [c['scores']['_test_flaky_net'] for c in results['candidates']]
+        assert scores == [2, 3, 4, 5]
+        assert not os.path.exists(journal_path)
+
+    def test_stopped_stream_keeps_journal(self, tmp_path):
+        calls = []
+
+        @brand.scorers.register(
+            '_test_journal_stream', requires_network=True, parallelizable=False
+        )
+        def counted(n):
+            calls.append(n)
+            return len(n)
+
+        stages = [Score(['_test_journal_stream'])]
+        names = [f'name{i}' for i in range(10)]
+
+        def run():
+            return brand.iter_pipeline(
+                stages,
+                names=names,
+                pipeline_dir=str(tmp_path),
+                project_name='p',
+                chunk_size=4,
+            )
+
+        for k, _ in enumerate(run()):
+            if k == 4:
+                break  # mid-Score: the second chunk is scored, not all yielded
+        journal_path = os.path.join(tmp_path, 'p', 'stage_00_score', 'journal.jsonl')
+        assert os.path.exists(journal_path)
+        scored = list(calls)
+        assert len(scored) == 8
+
+        calls.clear()
+        assert [c['name'] for c in run()] == names
+        assert calls == [n for n in names if n not in scored]
+        assert not os.path.exists(journal_path)
+
+    def test_changed_stage_discards_journal(self, tmp_path):
+        from brand.journal import open_stage_journal
+
+        with open_stage_journal(str(tmp_path), Score(['dns_com'])) as journal:
+            journal.record('figiri', 'dns_com', True)
+            journal.record('lumex', 'dns_com', {'error': 'Timeout'})
+        with open_stage_journal(str(tmp_path), Score(['dns_com'])) as journal:
+            assert len(journal) == 1
+        with open_stage_journal(str(tmp_path), Score(['dns_org'])) as journal:
+            assert len(journal) == 0
+
+
+# ---------------------------------------------------------------------------
+# Stage cache tests
+# ---------------------------------------------------------------------------
+
+
+class TestStageCache:
+    def test_unchanged_stages_are_reused(self, tmp_path):
+        calls = []
+
+        @brand.scorers.register('_test_costly_net', requires_network=True)
+        def costly(n):
+            calls.append(n)
+            return len(n) % 3
+
+        def run(stages, **kwargs):
+            return brand.run_pipeline(
+                stages, pipeline_dir=str(tmp_path), project_name='p', **kwargs
+            )
+
+        names = ['figiri', 'lumex', 'vox', 'zanpo', 'kalo']
+        stages = [Score(['_test_costly_net']), Filter(top_n=3, by='_test_costly_net')]
+        first = run(stages, names=names)
+        assert len(calls) == 5
+
+        again = run(stages, names=names)
+        assert len(calls) == 5
+        assert again['candidates'] == first['candidates']
+
+        tweaked = run(stages[:1] + [Filter(top_n=2, by='_test_costly_net')], names=names)
+        assert len(calls) == 5
+        assert tweaked['candidates'] == first['candidates'][:2]
+
+        run(stages, names=names + ['novo'])
+        assert len(calls) == 11
+        run(stages, names=names, cache=False)
+        assert len(calls) == 16
+
+    def test_changed_downstream_filter_invalidates_pruned_score(self, tmp_path):
+        @brand.scorers.register('_test_exp_even', requires_network=True)
+        def exp_even(n):
+            return len(n) % 2 == 0
+
+        names = ['ab', 'abc', 'abcdef']
+        score = Score(['name_length', '_test_exp_even'])
+
+        def run(rules, project_name='p'):
+            results = brand.run_pipeline(
+                [score, Filter(rules=rules)],
+                names=names,
+                pipeline_dir=str(tmp_path),
+                project_name=project_name,
+            )
+            return [c['name'] for c in results['candidates']]
+
+        assert run({'name_length': 5, '_test_exp_even': True}) == ['abcdef']
+        fresh = run({'_test_exp_even': True}, project_name='fresh')
+        assert fresh == ['ab', 'abcdef']
+        assert run({'_test_exp_even': True}) == fresh
+
+
+# ---------------------------------------------------------------------------
+# DAG pipeline tests
+# ---------------------------------------------------------------------------
+
+
+class TestDag:
+    def test_shared_node_runs_once_and_branches_overlap(self, tmp_path):
+        import threading
+
+        calls = []
+        both_running = threading.Barrier(2, timeout=5)
+
+        @brand.scorers.register('_test_dag_shared', requires_network=True)
+        def shared(n):
+            calls.append(n)
+            return n.endswith('x')
+
+        waited = set()
+
+        @brand.scorers.register('_test_dag_branch', parallelizable=False)
+        def branch(n):
+            if threading.get_ident() not in waited:
+                waited.add(threading.get_ident())
+                both_running.wait()  # breaks unless both branches run concurrently
+            return len(n)
+
+        from brand.stages import Node
+
+        dag = {
+            'scored': Score(['_test_dag_shared']),
+            'x': Node(Filter(rules={'_test_dag_shared': True}), after='scored'),
+            'not_x': Node(Filter(rules={'_test_dag_shared': False}), after='scored'),
+            'x_len': Node(Score(['_test_dag_branch']), after='x'),
+            'not_x_len': Node(Score(['_test_dag_branch']), after='not_x'),
+        }
+        names = ['lumex', 'vox', 'figiri']
+        results = brand.run_dag(
+            dag, names=names, pipeline_dir=str(tmp_path), project_name='p'
+        )
+        assert sorted(calls) == sorted(names)
+        assert [c['name'] for c in results['candidates']['x_len']] == ['lumex', 'vox']
+        assert [c['name'] for c in results['candidates']['not_x_len']] == ['figiri']
+        assert results['candidates']['not_x_len'][0]['scores'] == {
+            '_test_dag_shared': False,
+            '_test_dag_branch': 6,
+        }
+        assert results['candidates']['x_len'][1]['scores']['_test_dag_branch'] == 3
+        assert os.path.isdir(os.path.join(results['project_dir'], 'x', 'stage_00_filter'))
+
+        # A new branch on the same project only computes the new node
+        dag['all'] = Node(Filter(top_n=1, by='_test_dag_shared'), after='scored')
+        del dag['x_len'], dag['not_x_len']
+        done = []
+        brand.run_dag(
+            dag,
+            names=names,
+            pipeline_dir=str(tmp_path),
+            project_name='p',
+            on_node_complete=lambda name, n: done.append(name),
+        )
+        assert len(calls) == 3
+        assert sorted(done) == ['all', 'not_x', 'scored', 'x']
+
+    def test_nodes_run_under_the_callers_budget(self, tmp_path):
+        from brand.budget import charge, use_budget
+
+        @brand.scorers.register('_test_dag_charged', parallelizable=False)
+        def charged(n):
+            charge('dag.test')
+            return len(n)
+
+        with use_budget({'requests': {'dag.test': 2}}) as tracker:
+            results = brand.run_dag(
+                {'scored': Score(['_test_dag_charged'])},
+                names=['lumex', 'vox', 'figiri'],
+                pipeline_dir=str(tmp_path),
+                project_name='p',
+            )
+        scored = results['candidates']['scored']
+        scores = [c['scores']['_test_dag_charged'] for c in scored]
+        assert scores[:2] == [5, 3]
+        assert scores[2] == {'error': 'BudgetExhausted: dag.test requests (2)'}
+        assert tracker.requests['dag.test'] == 2
+
+    def test_invalid_dags(self):
+        from brand.stages import Node
+
+        with pytest.raises(ValueError, match='unknown node'):
+            brand.run_dag({'a': Node(Filter(top_n=1), after='nope')})
+        with pytest.raises(ValueError, match='cycle'):
+            brand.run_dag({'a': Node([], after='b'), 'b': Node([], after='a')})
+
+
+# ---------------------------------------------------------------------------
+# Distributed execution
+# ---------------------------------------------------------------------------
+
+
+class TestDistributed:
+    def test_sharded_scores_match_local_run(self, tmp_path):
+        from brand.distributed import run_distributed
+
+        names = [f'name{i}{"x" * (i % 7)}' for i in range(23)]
+        stages = [
+            Score(['name_length', 'syllables']),
+            Filter(top_n=10, by='name_length'),
+            Score(['keyboard_distance']),
+        ]
+        local = brand.run_pipeline(
+            stages, names=names, pipeline_dir=str(tmp_path), project_name='local'
+        )
+        results = run_distributed(
+            stages,
+            names=names,
+            pipeline_dir=str(tmp_path),
+            project_name='sharded',
+            local_workers=3,
+            shard_size=4,
+        )
+        assert results['candidates'] == local['candidates']
+        final = os.path.join(results['project_dir'], 'final', 'results.json')
+        assert os.path.isfile(final)
+
+    def test_metrics_count_every_shard(self, tmp_path):
+        from brand.distributed import run_distributed
+
+        results = run_distributed(
+            [Score(['name_length', 'syllables'])],
+            names=[f'name{i}' for i in range(10)],
+            pipeline_dir=str(tmp_path),
+            local_workers=2,
+            shard_size=4,
+        )
+        proj = results['project_dir']
+        for path in (f'{proj}/stage_00_score', f'{proj}/final'):
+            with open(f'{path}/metrics.json') as f:
+                scorers = json.load(f)['scorers']
+            assert {name: m['calls'] for name, m in scorers.items()} == {
+                'name_length': 10,
+                'syllables': 10,
+            }
+            assert scorers['name_length']['latency']['max'] is not None
+
+    def test_accept_errors_back_off(self, monkeypatch, caplog):
+        import time
+        from brand import distributed
+
+        calls = []
+
+        class BrokenListener:
+            address = ('127.0.0.1', 0)
+
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def accept(self):
+                calls.append(time.monotonic())
+                raise OSError('too many open files')
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr(distributed, 'Listener', BrokenListener)
+        with caplog.at_level('WARNING', logger='brand.distributed'):
+            coordinator = distributed.Coordinator()
+            time.sleep(0.5)
+            coordinator.close()
+        coordinator._accepter.join(timeout=5)
+        assert not coordinator._accepter.is_alive()
+        assert 2 <= len(calls) <= 6  # 0.05s, 0.1s, 0.2s, ... apart
+        assert 'too many open files' in caplog.text
+
+    def test_worker_errors_surface(self, tmp_path):
+        from brand.distributed import run_distributed
+
+        with pytest.raises(RuntimeError, match='failed on a worker'):
+            run_distributed(
+                [Score(['_test_distributed_unknown'])],
+                names=['a', 'b'],
+                pipeline_dir=str(tmp_path),
+                local_workers=1,
+            )
+
+
+# ---------------------------------------------------------------------------
+# Pipelined execution
+# ---------------------------------------------------------------------------
+
+
+class TestPipelined:
+    def test_downstream_starts_before_upstream_finishes(self, tmp_path):
+        import threading
+
+        reached = threading.Event()
+        waited = []
+
+        @brand.scorers.register('_test_pipe_first', parallelizable=False)
+        def first(n):
+            if n == 'zzz':  # the last name: only proceeds once stage 2 has run
+                waited.append(reached.wait(timeout=5))
+            return True
+
+        @brand.scorers.register('_test_pipe_second', parallelizable=False)
+        def second(n):
+            reached.set()
+            return len(n)
+
+        results = brand.run_pipeline(
+            [
+                Score(['_test_pipe_first']),
+                Filter(rules={'_test_pipe_first': True}),
+                Score(['_test_pipe_second']),
+            ],
+            names=['abc', 'de', 'zzz'],
+            pipeline_dir=str(tmp_path),
+            pipelined=True,
+            chunk_size=1,
+        )
+        assert waited == [True]
+        assert [c['scores']['_test_pipe_second'] for c in results['candidates']] == [
+            3,
+            2,
+            3,
+        ]
+        from brand.artifacts import read_candidates
+
+        stage_dir = os.path.join(results['project_dir'], 'stage_02_score')
+        assert len(list(read_candidates(stage_dir))) == 3
+
+    def test_backpressure_bounds_read_ahead(self, tmp_path):
+        import time
+
+        drawn = []
+
+        def names():
+            for i in range(1000):
+                drawn.append(i)
+                yield f'n{i}'
+
+        it = brand.iter_pipeline(
+            [
+                Score(['name_length']),
+                Filter(rules={'name_length': {'op': '<=', 'value': 2}}),
+            ],
+            names=names(),
+            pipeline_dir=str(tmp_path),
+            pipelined=True,
+            chunk_size=1,
+            queue_size=1,
+        )
+        assert next(it)['name'] == 'n0'
+        time.sleep(0.2)
+        assert len(drawn) < 20
+        assert len(list(it)) == 9
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+class TestMetrics:
+    def _read(self, *parts):
+        import json
+
+        with open(os.path.join(*parts, 'metrics.json')) as f:
+            return json.load(f)
+
+    def test_latencies_take_constant_memory(self):
+        import random
+        from brand.metrics import ScorerMetrics
+
+        rng = random.Random(0)
+        latencies = [rng.lognormvariate(-3, 1) for _ in range(50_000)]
+        halves = ScorerMetrics(), ScorerMetrics()
+        for k, seconds in enumerate(latencies):
+            halves[k % 2].observe(seconds, True)
+        merged = ScorerMetrics()
+        for half in halves:
+            merged.merge(half)
+        assert len(merged.latencies.buckets) < 500
+        latency = merged.to_dict()['latency']
+        ordered = sorted(latencies)
+        assert latency['max'] == ordered[-1]
+        for q in (50, 95, 99):
+            exact = ordered[len(ordered) * q // 100 - 1]
+            assert latency[f'p{q}'] == pytest.approx(exact, rel=0.03)
+
+    def test_stage_and_final_metrics(self, tmp_path):
+        @brand.scorers.register('_test_metrics_flaky')
+        def flaky(n):
+            if n.startswith('x'):
+                raise ConnectionError('refused')
+            return len(n)
+
+        stages = [
+            Score(['_test_metrics_flaky', 'name_length']),
+            Filter(rules={'name_length': 3}),
+            Score(['_test_metrics_flaky']),
+        ]
+        names = ['abc', 'xyz', 'de', 'fghi']
+        results = brand.run_pipeline(
+            stages, names=names, pipeline_dir=str(tmp_path), project_name='p'
+        )
+        proj = results['project_dir']
+
+        score = self._read(proj, 'stage_00_score')
+        assert (score['candidates_in'], score['candidates_out']) == (4, 4)
+        flaky_metrics = score['scorers']['_test_metrics_flaky']
+        assert flaky_metrics['calls'] == 4
+        assert flaky_metrics['errors'] == 1
+        assert flaky_metrics['error_types'] == {'ConnectionError': 1}
+        assert set(flaky_metrics['latency']) == {'mean', 'p50', 'p95', 'p99', 'max'}
+        assert flaky_metrics['latency']['p50'] <= flaky_metrics['latency']['max']
+        assert score['wall_time'] >= flaky_metrics['wall_time'] > 0
+
+        filt = self._read(proj, 'stage_01_filter')
+        assert (filt['candidates_in'], filt['candidates_out']) == (4, 3)
+
+        final = self._read(proj, 'final')
+        assert [s['stage'] for s in final['stages']] == [0, 1, 2]
+        assert final['scorers']['_test_metrics_flaky']['calls'] == 7
+        assert final['scorers']['_test_metrics_flaky']['errors'] == 2
+
+        # A rerun reuses every stage: listed as such, nothing scored
+        again = brand.run_pipeline(
+            stages, names=names, pipeline_dir=str(tmp_path), project_name='p'
+        )
+        final = self._read(again['project_dir'], 'final')
+        assert all(s['reused'] for s in final['stages'])
+        assert final['scorers'] == {}
+
+    def test_streaming_metrics(self, tmp_path):
+        results = brand.run_pipeline(
+            [Score(['name_length']), Filter(rules={'name_length': 3})],
+            names=['abc', 'de', 'fghi'],
+            pipeline_dir=str(tmp_path),
+            stream=True,
+            chunk_size=2,
+        )
+        proj = results['project_dir']
+        assert self._read(proj, 'stage_00_score')['scorers']['name_length']['calls'] == 3
+        filt = self._read(proj, 'stage_01_filter')
+        assert (filt['candidates_in'], filt['candidates_out']) == (3, 2)
+        assert len(self._read(proj, 'final')['stages']) == 2
+
+
+# ---------------------------------------------------------------------------
+# Profiling
+# ---------------------------------------------------------------------------
+
+
+class TestProfiling:
+    def test_cpu_profile_per_stage(self, tmp_path):
+        import pstats
+
+        results = brand.run_pipeline(
+            [Score(['syllables']), Filter(rules={'syllables': 2})],
+            names=['banana', 'vox', 'lumex'],
+            pipeline_dir=str(tmp_path),
+            profile=True,
+        )
+        proj = results['project_dir']
+        for stage_dir in ['stage_00_score', 'stage_01_filter']:
+            assert os.path.isfile(os.path.join(proj, stage_dir, 'profile.prof'))
+        stats = pstats.Stats(os.path.join(proj, 'stage_00_score', 'profile.prof'))
+        assert any(func == 'syllable_count' for _, _, func in stats.stats)
+
+    def test_sampled_memory_profile_per_scorer(self, tmp_path):
+        import json
+
+        sampled = []
+
+        @brand.scorers.register('_test_profile_alloc')
+        def alloc(n):
+            sampled.append(n)
+            return len([n] * 1000)
+
+        names = [f'n{i}' for i in range(10)]
+        results = brand.run_pipeline(
+            [Score(['_test_profile_alloc', 'name_length'])],
+            names=names,
+            pipeline_dir=str(tmp_path),
+            profile={'cpu': False, 'memory': True, 'per': 'scorer', 'sample': 0.5},
+        )
+        assert all(
+            c['scores']['_test_profile_alloc'] == 1000 for c in results['candidates']
+        )
+        # The sampled half is scored first, under the profiler
+        assert sampled[:5] == names[::2]
+        stage_dir = os.path.join(results['project_dir'], 'stage_00_score')
+        with open(os.path.join(stage_dir, 'allocations-_test_profile_alloc.json')) as f:
+            allocations = json.load(f)
+        assert allocations['peak'] > 0
+        assert {'file', 'line', 'size', 'count'} <= set(allocations['top'][0])
+        assert os.path.isfile(os.path.join(stage_dir, 'allocations-name_length.json'))
+        assert not os.path.exists(os.path.join(stage_dir, 'profile.prof'))
+
+    def test_pipelined_stages_take_turns_profiling(self, tmp_path):
+        results = brand.run_pipeline(
+            [Score(['syllables']), Score(['name_length']), Score(['letter_balance'])],
+            names=[f'name{i}' for i in range(200)],
+            pipeline_dir=str(tmp_path),
+            pipelined=True,
+            chunk_size=10,
+            profile={'per': 'scorer'},
+        )
+        assert len(results['candidates']) == 200
+        for i, scorer in enumerate(['syllables', 'name_length', 'letter_balance']):
+            stage_dir = os.path.join(results['project_dir'], f'stage_0{i}_score')
+            assert os.path.isfile(os.path.join(stage_dir, f'profile-{scorer}.prof'))
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 12), reason='one profiler per process from 3.12'
+    )
+    def test_inside_outer_profiler_session(self, tmp_path):
+        import cProfile
+
+        outer = cProfile.Profile()
+        with outer:
+            results = brand.run_pipeline(
+                [Score(['syllables'])],
+                names=['banana', 'vox'],
+                pipeline_dir=str(tmp_path),
+                profile=True,
+            )
+        assert len(results['candidates']) == 2
+        stage_dir = os.path.join(results['project_dir'], 'stage_00_score')
+        with open(os.path.join(stage_dir, 'profile.json')) as f:
+            assert 'skipped' in json.load(f)
+
+    def test_invalid_profile(self):
+        with pytest.raises(ValueError, match='per must be'):
+            brand.run_pipeline(
+                [Score(['name_length'])], names=['a'], profile={'per': 'x'}
+            )
+
+
+# ---------------------------------------------------------------------------
+# Tracing
+# ---------------------------------------------------------------------------
+
+
+class TestTracing:
+    def test_spans_nest_down_to_lookups(self, tmp_path):
+        from brand import aio, tracing
+
+        @brand.scorers.register('_test_trace_threads', requires_network=True)
+        def threaded(n):
+            with tracing.span('dns', host=f'{n}.com'):
+                return True
+
+        @brand.scorers.register('_test_trace_async', requires_network=True)
+        def sync_twin(n):
+            return 1
+
+        @brand.scorers.register_async('_test_trace_async')
+        async def atraced(n):
+            return await aio.run_blocking(len, n, host='whois')
+
+        exporter = tracing.InMemoryExporter()
+        with tracing.Tracer(exporter):
+            brand.run_pipeline(
+                [Score(['_test_trace_threads', '_test_trace_async'])],
+                names=['vox', 'lumex'],
+                pipeline_dir=str(tmp_path),
+            )
+        spans = {s.span_id: s for s in exporter.spans}
+
+        def path(span):
+            names = [span.name]
+            while span.parent_id is not None:
+                span = spans[span.parent_id]
+                names.append(span.name)
+            return names[::-1]
+
+        lookups = [s for s in exporter.spans if s.name in ('dns', 'blocking')]
+        assert sorted(s.attributes['host'] for s in lookups) == [
+            'lumex.com',
+            'vox.com',
+            'whois',
+            'whois',
+        ]
+        for span in lookups:
+            assert path(span)[:4] == ['pipeline', 'stage', 'scorer', 'call']
+        assert len({s.trace_id for s in exporter.spans}) == 1
+        calls = [s for s in exporter.spans if s.name == 'call']
+        assert all(s.end >= s.start for s in calls)
+
+    def test_jsonl_exporter_and_errors(self, tmp_path):
+        import json
+        from brand import tracing
+
+        path = str(tmp_path / 'spans.jsonl')
+        with tracing.Tracer(tracing.JsonlExporter(path)):
+            with pytest.raises(KeyError):
+                with tracing.span('outer', stage=1):
+                    with tracing.span('inner') as span:
+                        span.set(status=200)
+                    raise KeyError('boom')
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+        assert [r['name'] for r in records] == ['inner', 'outer']
+        assert records[0]['attributes'] == {'status': 200}
+        assert records[0]['parent_id'] == records[1]['span_id']
+        assert records[1]['error'] == "KeyError: 'boom'"
+
+    def test_no_tracer_no_spans(self):
+        from brand import tracing
+
+        with tracing.span('anything') as span:
+            span.set(bytes=1)
+        assert not span
+        assert tracing.current_span() is None
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+class TestBenchmarks:
+    def test_run_and_compare(self, tmp_path):
+        import json
+        from brand import benchmarks
+
+        output = str(tmp_path / 'bench.json')
+        results = benchmarks.run_benchmarks(
+            scorers=['name_length', 'dns_com'],
+            generators=['from_list', 'ai_suggest'],
+            templates=['quick_screen', 'research_company'],
+            sizes=[200],
+            scorer_size=50,
+            output=output,
+        )
+        with open(output) as f:
+            assert json.load(f) == json.loads(json.dumps(results))
+
+        scorer = results['scorers']['name_length']
+        assert scorer['n'] == 50 and scorer['errors'] == 0
+        assert scorer['throughput'] > 0 and scorer['peak_memory'] > 0
+        assert results['scorers']['dns_com'] == {'skipped': 'requires network'}
+        assert results['generators']['from_list']['n'] == 200
+        assert 'skipped' in results['generators']['ai_suggest']
+        pipeline = results['pipelines']['quick_screen/200']
+        assert pipeline['survivors'] == 100
+        assert [s['type'] for s in pipeline['stages']] == ['score', 'filter']
+        assert 'skipped' in results['pipelines']['research_company/200']
+
+        slower = json.loads(json.dumps(results))
+        slower['scorers']['name_length']['throughput'] /= 2
+        (regression,) = benchmarks.compare_results(results, slower)
+        assert regression['name'] == 'name_length'
+        assert regression['metric'] == 'throughput'
+        assert benchmarks.compare_results(results, slower, threshold=0.6) == []
+
+
+# ---------------------------------------------------------------------------
+# Stand-in services
+# ---------------------------------------------------------------------------
+
+
+class TestStandIns:
+    def test_scorers_hit_standins(self, tmp_path):
+        from brand.standins import StandIns, Service, is_taken
+
+        names = ['lumex', 'vox', 'figiri', 'corvana', 'talimo', 'brenzo']
+        network = ['github_org', 'dns_com', 'company_name_us', 'trademark_us']
+        with StandIns(default=Service(taken=0.5)) as standins:
+            results = brand.run_pipeline(
+                [Score(network)], names=names, pipeline_dir=str(tmp_path)
+            )
+            direct = {n: brand.scorers['whois_com'](n) for n in names}
+
+        for cand in results['candidates']:
+            name, scores = cand['name'], cand['scores']
+            assert scores['github_org'] == (not is_taken('github.com', name, 0.5))
+            assert scores['dns_com'] == (not is_taken('domain', f'{name}.com', 0.5))
+            assert scores['dns_com'] == direct[name]
+            assert scores['company_name_us'] == (
+                not is_taken('api.opencorporates.com', name, 0.5)
+            )
+            assert scores['trademark_us'] == (not is_taken('tsdr.uspto.gov', name, 0.5))
+        assert standins.stats['github.com']['requests'] == len(names)
+        assert standins.stats['dns']['ok'] == len(names)
+        # the scorers talk to the real services again
+        from brand import endpoints
+
+        assert endpoints.get_endpoints() == {}
+
+    def test_fault_injection(self):
+        import socket
+        import requests
+        from brand import endpoints
+        from brand.standins import StandIns, Service
+
+        services = {
+            'throttled.test': Service(throttle_rate=1.0, retry_after=7),
+            'broken.test': Service(error_rate=1.0),
+            'slow.test': Service(timeout_rate=1.0, hang=2),
+            'limited.test': Service(rate_limit=0.01, burst=2),
+            'dns': Service(timeout_rate=1.0),
+        }
+        with StandIns(services) as standins:
+            get = lambda url, **kw: requests.get(endpoints.http_url(url), **kw)
+            r = get('https://throttled.test/x')
+            assert (r.status_code, r.headers['Retry-After']) == (429, '7')
+            assert get('https://broken.test/x').status_code == 503
+            with pytest.raises(requests.Timeout):
+                get('https://slow.test/x', timeout=0.2)
+            codes = [get('https://limited.test/x').status_code for _ in range(3)]
+            assert codes[2] == 429 and 429 not in codes[:2]
+            with pytest.raises(socket.timeout):
+                endpoints.gethostbyname('lumex.com', timeout=0.2)
+        assert standins.stats['limited.test']['throttled'] == 1
+        assert standins.stats['slow.test']['timeouts'] == 1
+
+    def test_llm_endpoint_and_environ(self, monkeypatch):
+        import json
+        import requests
+        from brand import endpoints
+        from brand._scorers.llm import _RATING_PROMPT, _parse_ratings
+        from brand.standins import StandIns
+
+        with StandIns() as standins:
+            kwargs = endpoints.anthropic_client_kwargs()
+            prompt = _RATING_PROMPT.format(context='x', names_list='- lumex\n- vox')
+            r = requests.post(
+                kwargs['base_url'] + '/v1/messages',
+                json={
+                    'model': 'm',
+                    'max_tokens': 10,
+                    'messages': [{'role': 'user', 'content': prompt}],
+                },
+            )
+            environ = standins.environ()
+        message = r.json()
+        ratings = _parse_ratings(message['content'][0]['text'])
+        assert [x['name'] for x in ratings] == ['lumex', 'vox']
+        assert 1 <= ratings[0]['overall'] <= 10
+        assert message['usage']['output_tokens'] > 0
+
+        monkeypatch.setenv(endpoints.ENDPOINTS_ENV_VAR, environ['BRAND_ENDPOINTS'])
+        with endpoints.use_endpoints():
+            endpoints._from_env()
+            assert endpoints.get_endpoints()['http'] == json.loads(
+                environ['BRAND_ENDPOINTS']
+            )['http']
+        assert endpoints.get_endpoints() == {}
+
+
+# ---------------------------------------------------------------------------
+# Adaptive concurrency
+# ---------------------------------------------------------------------------
+
+
+class TestAdaptiveConcurrency:
+    def test_limiter_signals(self):
+        from brand.concurrency import AIMDLimiter, call_feedback, note_status
+
+        limiter = AIMDLimiter(2, 40)
+        for _ in range(30):
+            limiter.record(0.01, True)
+        assert limiter.limit == 32  # slow start: +1 per success
+        with call_feedback() as feedback:
+            note_status(404)
+            assert not feedback.overloaded
+            note_status(429)
+        limiter.record(0.01, False, overloaded=feedback.overloaded)
+        assert limiter.limit == 16
+        limiter.record(0.01, {'error': 'Timeout: read timed out'})
+        assert limiter.limit == 16  # at most one back-off per round
+        for _ in range(17):
+            limiter.record(0.01, True)
+        assert limiter.limit == 17  # congestion avoidance: about +1 per round
+        for _ in range(20):
+            limiter.record(1.0, True)  # latency jumps
+        assert limiter.limit < 17 and limiter.decreases >= 2
+
+    def test_only_overload_errors_back_off(self):
+        from brand.concurrency import AIMDLimiter
+
+        limiter = AIMDLimiter(1, 40)
+        for _ in range(7):
+            limiter.record(0.01, True)
+        for error in [
+            'BudgetExhausted: max_cost reached',
+            'ValueError: name too long',
+            'Indeterminate: ambiguous HTTP status 404',
+        ]:
+            limiter.record(0.01, {'error': error})
+        assert limiter.limit == 8 and limiter.decreases == 0
+        limiter.record(0.01, {'error': 'ConnectionError: connection refused'})
+        assert limiter.limit == 4 and limiter.decreases == 1
+
+    def test_backs_off_under_rate_limit(self, tmp_path):
+        import json
+        from brand import net
+        from brand.standins import StandIns, Service
+
+        @brand.scorers.register(
+            '_test_aimd', requires_network=True, concurrency=(2, 64)
+        )
+        def aimd_scorer(name):
+            return net.http_get(f'https://api.test/{name}').status_code == 404
+
+        services = {'api.test': Service(latency=0.02, rate_limit=300, burst=5)}
+        with StandIns(services) as standins:
+            results = brand.run_pipeline(
+                [Score(['_test_aimd'])],
+                names=[f'n{i}' for i in range(300)],
+                pipeline_dir=str(tmp_path),
+            )
+        assert standins.stats['api.test']['throttled'] > 0
+        with open(f"{results['project_dir']}/stage_00_score/metrics.json") as f:
+            limits = json.load(f)['scorers']['_test_aimd']['concurrency']
+        assert limits['peak'] > 2 and limits['decreases'] > 0
+        assert limits['limit'] < limits['peak']
+
+
+# ---------------------------------------------------------------------------
+# Per-host rate limits
+# ---------------------------------------------------------------------------
+
+
+class TestRateLimits:
+    def test_bucket_is_shared_and_paces(self):
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from types import SimpleNamespace
+        from brand import ratelimit
+        from brand.base import url_says_it_is_available
+
+        defaults = ratelimit.get_rate_limits()
+        with ratelimit.use_rate_limits({'paced.test': (100, 5)}, replace=True):
+            assert ratelimit.get_rate_limits() == {'paced.test': (100, 5)}
+            start = time.perf_counter()
+            with ThreadPoolExecutor(5) as executor:
+                list(executor.map(ratelimit.acquire, ['paced.test'] * 20))
+            # the legacy functions take their tokens from the same bucket
+            for name in ['lumex', 'vox', 'figiri', 'corvana', 'talimo']:
+                assert url_says_it_is_available(
+                    name,
+                    'https://paced.test/{}'.format,
+                    request_func=lambda url: SimpleNamespace(status_code=404),
+                )
+            elapsed = time.perf_counter() - start
+            assert ratelimit.stats()['paced.test']['requests'] == 25
+        assert elapsed >= 0.19  # 5 at once, then 100 per second
+        assert ratelimit.get_rate_limits() == defaults
+
+    def test_stays_under_service_limit(self, tmp_path):
+        from brand import ratelimit
+        from brand.standins import StandIns, Service
+
+        names = [f'n{i}' for i in range(20)]
+        services = {'github.com': Service(rate_limit=40, burst=10)}
+        with StandIns(services) as standins:
+            with ratelimit.use_rate_limits({'github.com': None}):
+                brand.run_pipeline(
+                    [Score(['github_org'])], names=names, pipeline_dir=str(tmp_path)
+                )
+            unlimited = standins.stats['github.com']['throttled']
+        with StandIns(services) as standins:
+            with ratelimit.use_rate_limits({'github.com': (20, 4)}):
+                brand.run_pipeline(
+                    [Score(['github_org'])],
+                    names=names,
+                    pipeline_dir=str(tmp_path / 'limited'),
+                )
+        assert unlimited > 0
+        assert standins.stats['github.com']['throttled'] == 0
+        assert standins.stats['github.com']['requests'] == len(names)
+
+
+# ---------------------------------------------------------------------------
+# Retries, circuit breakers and indeterminate results
+# ---------------------------------------------------------------------------
+
+
+class TestResilience:
+    def test_indeterminate_results(self, tmp_path):
+        from brand import net, resilience
+        from brand.resilience import Indeterminate, RetryPolicy, is_indeterminate
+        from brand.standins import StandIns, Service
+
+        services = {
+            'github.com': Service(error_rate=1.0),
+            'whois': Service(throttle_rate=1.0),
+            'dns': Service(taken=0.0),
+        }
+        names = ['lumex', 'vox', 'figiri']
+        policy = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+        try:
+            with StandIns(services) as standins, resilience.use_retry_policy(policy):
+                with pytest.raises(Indeterminate, match='after 3 attempts'):
+                    net.http_get('https://github.com/lumex')
+                with pytest.raises(Indeterminate):
+                    brand.scorers['whois_com']('lumex')
+                results = brand.run_pipeline(
+                    [
+                        Score(['github_org']),
+                        Filter(rules={'github_org': True}, keep_indeterminate=True),
+                    ],
+                    names=names,
+                    pipeline_dir=str(tmp_path),
+                )
+        finally:
+            resilience.reset_breakers()
+        assert standins.stats['github.com']['requests'] >= 3 + len(names)
+        assert standins.stats['whois']['throttled'] == 3
+        kept = results['candidates']
+        assert sorted(c['name'] for c in kept) == sorted(names)
+        assert all(is_indeterminate(c['scores']['github_org']) for c in kept)
+        with open(f"{results['project_dir']}/stage_00_score/metrics.json") as f:
+            errors = json.load(f)['scorers']['github_org']['error_types']
+        assert errors == {'Indeterminate': len(names)}
+        dropped = brand.pipeline._run_filter(
+            Filter(rules={'github_org': True}), kept
+        )
+        assert dropped == []
+
+    def test_circuit_breaker(self):
+        from brand import net, resilience
+        from brand.resilience import Indeterminate, RetryPolicy
+        from brand.standins import StandIns, Service
+
+        policy = RetryPolicy(attempts=1)
+        try:
+            with StandIns({'down.test': Service(error_rate=1.0)}) as standins:
+                with resilience.use_retry_policy(policy):
+                    for _ in range(8):
+                        with pytest.raises(Indeterminate):
+                            net.http_get('https://down.test/x')
+            stats = resilience.breaker_stats()['down.test']
+        finally:
+            resilience.reset_breakers()
+        assert standins.stats['down.test']['requests'] == 5
+        assert stats == {'state': 'open', 'opened': 1, 'rejected': 3}
+
+    def test_half_open_trial_is_released_or_failed(self):
+        import asyncio
+        from brand import resilience
+        from brand.budget import BudgetExhausted, charge, use_budget
+        from brand.resilience import CircuitBreaker, RetryPolicy
+
+        def half_open(host):
+            breaker = resilience._breakers[host] = CircuitBreaker(
+                failure_threshold=1, reset_timeout=0
+            )
+            breaker.record_failure()
+            assert breaker.state == 'half-open'
+            return breaker
+
+        def refused():
+            charge('h')  # as ratelimit.acquire does, racing another request
+
+        def broken():
+            raise KeyError('unexpected')
+
+        async def cancelled():
+            raise asyncio.CancelledError
+
+        policy = RetryPolicy(attempts=1)
+        try:
+            with resilience.use_retry_policy(policy):
+                breaker = half_open('h')
+                with use_budget({'requests': {'h': 0}}):
+                    with pytest.raises(BudgetExhausted):
+                        resilience.call('h', lambda: 'ok')  # refused up front
+                    assert not breaker._trial
+                with use_budget({'requests': {'h': 1}}) as tracker:
+                    tracker.requests['h'] = 1  # spent while the trial started
+                    tracker.check = lambda host: None
+                    with pytest.raises(BudgetExhausted):
+                        resilience.call('h', refused)
+                assert not breaker._trial
+                assert resilience.call('h', lambda: 'ok') == 'ok'
+
+                breaker = half_open('h')
+                with pytest.raises(asyncio.CancelledError):
+                    asyncio.run(resilience.acall('h', cancelled))
+                assert not breaker._trial and breaker.state == 'half-open'
+
+                with pytest.raises(KeyError):
+                    resilience.call('h', broken)
+                assert breaker.opened == 2  # the failed trial reopened it
+        finally:
+            resilience.reset_breakers()
+
+
+# ---------------------------------------------------------------------------
+# Budgets
+# ---------------------------------------------------------------------------
+
+
+class TestBudgets:
+    def test_request_budget_spent_on_best_candidates(self, tmp_path):
+        from brand.standins import StandIns
+
+        names = ['ab', 'abcdef', 'abc', 'abcdefgh', 'abcd', 'abcdefg', 'a', 'abcde']
+        stages = [Score(['name_length', 'github_org'])]
+        kwargs = dict(names=names, pipeline_dir=str(tmp_path), project_name='p')
+        with StandIns():
+            results = brand.run_pipeline(
+                stages, budget={'requests': {'github.com': 3}}, **kwargs
+            )
+            scores = {
+                c['name']: c['scores']['github_org'] for c in results['candidates']
+            }
+            scored = {n for n, v in scores.items() if isinstance(v, bool)}
+            assert scored == {'abcdefgh', 'abcdefg', 'abcdef'}  # longest first
+            assert scores['a'] == {'error': 'BudgetExhausted: github.com requests (3)'}
+            with open(f"{results['project_dir']}/final/metrics.json") as f:
+                usage = json.load(f)['budget']
+            assert usage['requests'] == {'github.com': {'limit': 3, 'used': 3}}
+            assert usage['exhausted'] == ['github.com requests (3)']
+
+            # the stage cut short isn't reused: rerunning finishes the job
+            results = brand.run_pipeline(stages, **kwargs)
+        assert all(
+            isinstance(c['scores']['github_org'], bool) for c in results['candidates']
+        )
+
+    def test_concurrent_runs_have_their_own_budget(self):
+        import threading
+        from brand.budget import charge, current_tracker, use_budget
+
+        both_in = threading.Barrier(2, timeout=5)
+        used = {}
+
+        def run(key):
+            with use_budget({'requests': {'h': 1}}) as tracker:
+                both_in.wait()
+                charge('h')
+                both_in.wait()
+                used[key] = tracker.requests['h']
+
+        threads = [threading.Thread(target=run, args=(k,)) for k in 'ab']
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert used == {'a': 1, 'b': 1}
+        assert current_tracker() is None
+
+    def test_time_budget(self, tmp_path):
+        results = brand.run_pipeline(
+            [Score(['name_length'])],
+            names=['lumex', 'vox'],
+            pipeline_dir=str(tmp_path),
+            budget=brand.Budget(seconds=0),
+        )
+        assert [c['scores'] for c in results['candidates']] == [
+            {'name_length': {'error': 'BudgetExhausted: time'}}
+        ] * 2
+
+
+# ---------------------------------------------------------------------------
+# Target count
+# ---------------------------------------------------------------------------
+
+
+class TestTargetCount:
+    stages = [
+        Generate('pattern', params={'pattern': 'CVCVCV'}),
+        Score(['name_length']),
+        Filter(rules={'name_length': 6}),
+    ]
+
+    def test_stops_once_target_reached(self, tmp_path):
+        results = brand.run_pipeline(
+            self.stages, pipeline_dir=str(tmp_path), target=5, chunk_size=20
+        )
+        assert len(results['candidates']) == 5
+        proj = results['project_dir']
+        with open(f'{proj}/stage_00_generate/summary.json') as f:
+            assert json.load(f) == {'stopped': True, 'count': 20}  # one chunk
+        with open(f'{proj}/final/metrics.json') as f:
+            metrics = json.load(f)
+        assert metrics['target'] == {'count': 5, 'reached': True}
+        assert 'budget' not in metrics  # none was asked for
+
+        results = brand.run_pipeline(
+            self.stages,
+            pipeline_dir=str(tmp_path),
+            target=5,
+            chunk_size=20,
+            budget={'seconds': 600},
+        )
+        with open(f"{results['project_dir']}/final/metrics.json") as f:
+            budget = json.load(f)['budget']
+        assert budget['exhausted'] == ['target reached (5)']
+
+    def test_shuffle_and_unreachable_target(self, tmp_path):
+        def run():
+            return brand.run_pipeline(
+                self.stages, pipeline_dir=str(tmp_path), target=3, shuffle=7
+            )
+
+        names = [c['name'] for c in run()['candidates']]
+        assert names == [c['name'] for c in run()['candidates']]  # seeded
+        assert not all(n.startswith('ba') for n in names)
+
+        results = brand.run_pipeline(
+            [Score(['name_length']), Filter(rules={'name_length': 5})],
+            names=['vox', 'lumex', 'zap'],
+            pipeline_dir=str(tmp_path),
+            target=5,
+        )
+        assert [c['name'] for c in results['candidates']] == ['lumex']
+        with open(f"{results['project_dir']}/final/metrics.json") as f:
+            assert json.load(f)['target'] == {'count': 5, 'reached': False}
+
+    def test_ranked_and_streamed(self, tmp_path):
+        names = ['ab', 'abcdef', 'abc', 'abcdefgh', 'abcd']
+        stages = [
+            Generate('from_list', params={'names': names}),
+            Score(['name_length']),
+            Filter(rules={'name_length': 3}),
+        ]
+        results = brand.run_pipeline(
+            stages, pipeline_dir=str(tmp_path), target=2, rank_by='name_length'
+        )
+        assert [c['name'] for c in results['candidates']] == ['abcdefgh', 'abcdef']
+
+        it = brand.iter_pipeline(
+            stages, pipeline_dir=str(tmp_path), project_name='it', target=2
+        )
+        assert [c['name'] for c in it] == ['abcdef', 'abc']
+        with open(f'{tmp_path}/it/final/metrics.json') as f:
+            metrics = json.load(f)
+        assert metrics['target'] == {'count': 2, 'reached': True}
+        assert 'budget' not in metrics
+
+        from brand.budget import current_tracker
+
+        trackers = []
+
+        @brand.scorers.register('_test_target_tracker')
+        def tracked(n):
+            trackers.append(current_tracker())
+            return len(n)
+
+        it = brand.iter_pipeline(
+            stages + [Score(['_test_target_tracker'])],
+            pipeline_dir=str(tmp_path),
+            project_name='it2',
+            target=2,
+        )
+        assert len(list(it)) == 2
+        assert trackers[0] is not None and trackers[0].stopped == 'target reached (2)'
+
+    def test_rejects_top_n(self, tmp_path):
+        with pytest.raises(ValueError, match='top_n'):
+            brand.run_pipeline(
+                self.stages + [Filter(top_n=3)], pipeline_dir=str(tmp_path), target=3
+            )
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+
+
+class TestPlanning:
+    def test_projects_requests_and_suggests_cheaper_order(self):
+        from brand.benchmarks import synthetic_names
+        from brand.standins import StandIns
+
+        stages = [
+            Score(['github_org']),
+            Filter(rules={'github_org': True}),
+            Score(['name_length']),
+            Filter(rules={'name_length': 7}),
+        ]
+        with StandIns():
+            plan = brand.plan_pipeline(stages, synthetic_names(5000), sample=50)
+        assert (plan['candidates'], plan['sample']) == (5000, 50)
+        assert plan['requests'] == {'github.com': 5000}
+        filtered = plan['stages'][1]
+        assert filtered['candidates_out'] == round(5000 * filtered['pass_rate'])
+        # the cheap, selective length check should run before the lookups
+        assert plan['suggested_order'] == [2, 3, 0, 1]
+
+    def test_generate_stage_is_counted(self):
+        plan = brand.plan_pipeline(
+            [
+                Generate('pattern', params={'pattern': 'CVC', 'vowels': 'ae'}),
+                Score(['name_length']),
+            ],
+            sample=3,
+        )
+        assert plan['candidates'] == plan['stages'][0]['candidates_out']
+        total = plan['candidates']
+        assert plan['sample'] == 3 and total > 3
+        assert plan['stages'][1]['scorers']['name_length']['calls'] == total
+
+
+# ---------------------------------------------------------------------------
+# Seen names
+# ---------------------------------------------------------------------------
+
+
+class TestSeenIndex:
+    stages = [
+        Score(['name_length']),
+        Filter(rules={'name_length': 4}),
+        Filter(top_n=1, by='name_length'),
+    ]
+
+    @pytest.mark.parametrize('stream', [False, True])
+    def test_records_last_stage_and_drop_reason(self, tmp_path, stream):
+        from brand.seen import SeenIndex, index_path
+
+        brand.run_pipeline(
+            self.stages,
+            names=['vox', 'lumex', 'figiri'],
+            pipeline_dir=str(tmp_path),
+            project_name='first',
+            stream=stream,
+            record_seen=True,
+        )
+        with SeenIndex(index_path(str(tmp_path))) as index:
+            records = index.lookup(['vox', 'lumex', 'figiri', 'zap'])
+        assert {n: (r['stage'], r['dropped_by']) for n, r in records.items()} == {
+            'vox': (1, 'name_length: 3'),
+            'lumex': (2, 'top_n (1)'),
+            'figiri': (3, None),
+        }
+        assert records['figiri']['project'] == 'first'
+
+    def test_recording_is_opt_in(self, tmp_path):
+        from brand.seen import SEEN_INDEX_FILENAME
+
+        brand.run_pipeline(self.stages, names=['vox'], pipeline_dir=str(tmp_path))
+        for _ in brand.iter_pipeline(
+            self.stages, names=['vox'], pipeline_dir=str(tmp_path)
+        ):
+            pass
+        assert not os.path.exists(tmp_path / SEEN_INDEX_FILENAME)
+
+    def test_concurrent_runs_record_into_their_own_index(self, tmp_path):
+        import threading
+        from brand.seen import SeenIndex, index_path
+
+        both_running = threading.Barrier(2, timeout=5)
+        waited = set()
+
+        @brand.scorers.register('_test_seen_overlap', parallelizable=False)
+        def overlap(n):
+            if threading.get_ident() not in waited:
+                waited.add(threading.get_ident())
+                both_running.wait()
+            return len(n)
+
+        def run(key):
+            brand.run_pipeline(
+                [
+                    Score(['_test_seen_overlap']),
+                    Filter(rules={'_test_seen_overlap': 4}),
+                ],
+                names=[f'{key}x', f'{key}xxxx'],
+                pipeline_dir=str(tmp_path / key),
+                project_name=key,
+                record_seen=True,
+            )
+
+        threads = [threading.Thread(target=run, args=(k,)) for k in 'ab']
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for key in 'ab':
+            with SeenIndex(index_path(str(tmp_path / key))) as index:
+                records = index.lookup([f'{k}{x}' for k in 'ab' for x in ('x', 'xxxx')])
+            assert {n: r['project'] for n, r in records.items()} == {
+                f'{key}x': key,
+                f'{key}xxxx': key,
+            }
+
+    def test_generate_skips_or_defers_seen_names(self, tmp_path):
+        names = ['vox', 'lumex', 'figiri', 'quartz']
+        kwargs = dict(pipeline_dir=str(tmp_path))
+        brand.run_pipeline(self.stages, names=names[:3], record_seen=True, **kwargs)
+
+        def generated(seen):
+            stages = [
+                Generate('from_list', params={'names': names}, seen=seen),
+                Score(['name_length']),
+            ]
+            results = brand.run_pipeline(stages, **kwargs)
+            return [c['name'] for c in results['candidates']]
+
+        assert generated('skip') == ['quartz']
+        assert generated('skip_dropped') == ['figiri', 'quartz']
+        assert generated('defer') == ['quartz', 'vox', 'lumex', 'figiri']